@@ -0,0 +1,125 @@
+import time
+
+from django.db import router
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.cache import get_cache
+from api.conf import get_settings
+from reviews.models import User
+
+STATE_KEY = 'jwt-principal:user:{}'
+GENERATION_KEY = 'jwt-principal:generation'
+ROLE_CLAIMS = ('role', 'is_staff', 'is_superuser')
+PRINCIPAL_FIELDS = ('username', 'is_active') + ROLE_CLAIMS
+
+
+PRINCIPAL_DEFAULTS = {
+    'STATE_TTL': 30,
+}
+
+
+class RoleAccessToken(AccessToken):
+    """Токен доступа с ролью и флагами администратора в claims."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in ROLE_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+
+def get_generation():
+    return get_cache().get_or_set(GENERATION_KEY, time.time_ns, None)
+
+
+def get_user_state(user_id):
+    """
+    Возвращает активность и права пользователя.
+    Состояние кэшируется на STATE_TTL секунд, поэтому
+    база данных опрашивается не чаще раза за этот срок.
+    Кэш — общий для процессов кэш ответов API (api.cache.get_cache):
+    forget_user_state() сбрасывает состояние во всех процессах.
+    """
+    cache = get_cache()
+    key = STATE_KEY.format(user_id)
+    generation = get_generation()
+    state = cache.get(key, version=generation)
+    if state is None:
+        state = User.objects.filter(pk=user_id).values(
+            *PRINCIPAL_FIELDS
+        ).first() or {}
+        config = get_settings('JWT_PRINCIPAL', PRINCIPAL_DEFAULTS)
+        cache.set(key, state, config['STATE_TTL'], version=generation)
+    return state
+
+
+def forget_user_state(user_id):
+    get_cache().delete(STATE_KEY.format(user_id), version=get_generation())
+
+
+def forget_all_user_states():
+    """Сбрасывает состояние всех пользователей, например после flush."""
+    get_cache().set(GENERATION_KEY, time.time_ns(), None)
+
+
+def load_user(user):
+    """
+    Дозагружает отложенные поля пользователя одним запросом.
+    Нужна там, где требуется полный профиль, например в users/me/.
+    """
+    deferred = user.get_deferred_fields()
+    if deferred:
+        user.refresh_from_db(fields=deferred)
+    return user
+
+
+class PrincipalJWTAuthentication(JWTAuthentication):
+    """
+    Аутентификация по JWT без запроса пользователя к базе данных.
+
+    request.user — экземпляр User, в котором загружены только id,
+    username, is_active, роль и флаги администратора; остальные поля
+    отложены и загружаются при первом обращении (см. load_user).
+    Состояние пользователя сверяется с кэшем (get_user_state):
+    заблокированный или удалённый пользователь теряет доступ,
+    а токен, выданный до смены роли, перестаёт приниматься.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Токен не содержит идентификатора пользователя.'
+            )
+
+        state = get_user_state(user_id)
+        if not state.get('is_active'):
+            raise AuthenticationFailed(
+                'Пользователь не найден или заблокирован.',
+                code='user_not_found'
+            )
+        if any(
+            claim in validated_token and validated_token[claim] != state[claim]
+            for claim in ROLE_CLAIMS
+        ):
+            raise AuthenticationFailed(
+                'Права пользователя изменились, получите новый токен.',
+                code='role_changed'
+            )
+        # from_db ожидает значения в порядке полей модели.
+        values = {'id': user_id, **state}
+        field_names = [
+            field.attname for field in User._meta.concrete_fields
+            if field.attname in values
+        ]
+        return User.from_db(
+            router.db_for_read(User),
+            field_names,
+            [values[name] for name in field_names]
+        )
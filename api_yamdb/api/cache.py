@@ -0,0 +1,213 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from api.conf import get_settings
+
+VERSION_KEY = 'api-cache:version:{}'
+RESPONSE_KEY = 'api-cache:response:{}'
+DATA_KEY = 'api-cache:data:{}:{}'
+CHANGES_KEY = 'api-cache:changes:{}:{}'
+HITS_KEY = 'api-cache:hits'
+MISSES_KEY = 'api-cache:misses'
+
+
+CACHE_DEFAULTS = {
+    'ENABLED': True,
+    'ALIAS': 'default',
+    'TIMEOUT': 60,
+    'SINGLE_PROCESS': False,
+}
+
+
+def get_cache():
+    return caches[get_settings('API_RESPONSE_CACHE', CACHE_DEFAULTS)['ALIAS']]
+
+
+def check_shared_cache():
+    """
+    Версии моделей и журнал изменений должны быть общими для всех
+    процессов сервера: иначе запись сбрасывает кэш только процесса,
+    который её выполнил. Кэш в памяти процесса (LocMemCache)
+    допустим, только если SINGLE_PROCESS подтверждает, что процесс один.
+    """
+    config = get_settings('API_RESPONSE_CACHE', CACHE_DEFAULTS)
+    if config['SINGLE_PROCESS'] or not isinstance(get_cache(), LocMemCache):
+        return
+    raise ImproperlyConfigured(
+        f"Кэш '{config['ALIAS']}' хранится в памяти процесса. Задайте "
+        'общий бэкенд (memcached) или, если сервер работает в одном '
+        "процессе, API_RESPONSE_CACHE['SINGLE_PROCESS'] = True."
+    )
+
+
+def get_model_version(model):
+    """Возвращает текущую версию данных модели."""
+    return get_cache().get_or_set(
+        VERSION_KEY.format(model._meta.label_lower), time.time_ns, None
+    )
+
+
+def bump_model_version(model, ids=None):
+    """
+    Увеличивает версию данных модели, делая устаревшими
+    все закэшированные ответы, которые от неё зависят.
+    ids — id затронутых строк (для произведений, отзывов и связей
+    жанров — id произведений), записываемые в журнал изменений
+    новой версии для get_changed_ids().
+
+    Внутри транзакции версия увеличивается ещё раз после фиксации:
+    читатель, пришедший между первым увеличением и фиксацией,
+    строит ключ с новой версией по снимку данных до записи,
+    и без второго увеличения такой ответ остался бы в кэше.
+    """
+    ids = None if ids is None else sorted(set(ids) - {None})
+    increment_model_version(model, ids)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: increment_model_version(model, ids))
+
+
+def increment_model_version(model, ids=None):
+    """
+    Если счётчик был вытеснен из кэша, он начинается
+    с текущего времени, чтобы не совпасть со старыми версиями.
+    """
+    cache = get_cache()
+    label = model._meta.label_lower
+    try:
+        version = cache.incr(VERSION_KEY.format(label))
+    except ValueError:
+        cache.set(VERSION_KEY.format(label), time.time_ns(), None)
+        return
+    if ids is not None:
+        cache.set(
+            CHANGES_KEY.format(label, version), ids,
+            get_settings('API_RESPONSE_CACHE', CACHE_DEFAULTS)['TIMEOUT']
+        )
+
+
+def get_changed_ids(model, since, version, limit=1000):
+    """
+    Возвращает множество id, изменённых между версиями since
+    и version модели, или None, если журнал неполон: версия
+    увеличена без ids (массовые операции), запись вытеснена
+    или изменений больше limit.
+    """
+    if since is None or not 0 <= version - since <= limit:
+        return None
+    label = model._meta.label_lower
+    keys = [
+        CHANGES_KEY.format(label, number)
+        for number in range(since + 1, version + 1)
+    ]
+    changes = get_cache().get_many(keys)
+    if len(changes) != len(keys):
+        return None
+    return set().union(*changes.values())
+
+
+def get_versioned_data(name, models, build):
+    """
+    Возвращает результат build() из кэша, пока не изменилась
+    версия ни одной из моделей models. При выключенном кэше
+    ответов build() вызывается каждый раз.
+    """
+    config = get_settings('API_RESPONSE_CACHE', CACHE_DEFAULTS)
+    if not config['ENABLED']:
+        return build()
+    cache = get_cache()
+    versions = ':'.join(str(get_model_version(model)) for model in models)
+    key = DATA_KEY.format(name, versions)
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, config['TIMEOUT'])
+    return data
+
+
+def count_event(key):
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        cache.incr(key)
+
+
+def get_cache_stats():
+    """Возвращает счётчики попаданий и промахов кэша ответов."""
+    cache = get_cache()
+    return {
+        'hits': cache.get(HITS_KEY, 0),
+        'misses': cache.get(MISSES_KEY, 0),
+    }
+
+
+def normalize_query(query_params):
+    """
+    Приводит параметры запроса к каноническому виду:
+    пустые значения отбрасываются, ключи и значения сортируются.
+    """
+    return urlencode(sorted(
+        (key, value)
+        for key in query_params
+        for value in query_params.getlist(key)
+        if value != ''
+    ))
+
+
+class CachedResponseMixin:
+    """
+    Кэширование ответов на чтение с инвалидацией по версиям моделей.
+
+    Ключ кэша строится из имени вьюсета, действия, версий моделей
+    из cache_models и нормализованной строки запроса.
+    Любое изменение одной из моделей увеличивает её версию,
+    после чего старые записи больше не используются и вытесняются
+    настройками бэкенда кэша.
+    """
+
+    cache_models = ()
+
+    def get_cache_key(self, request):
+        versions = ':'.join(
+            str(get_model_version(model)) for model in self.cache_models
+        )
+        raw_key = '|'.join((
+            self.basename, self.action, versions,
+            request.build_absolute_uri(request.path),
+            normalize_query(request.query_params),
+        ))
+        return RESPONSE_KEY.format(
+            hashlib.md5(raw_key.encode()).hexdigest()
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        """Возвращает ответ из кэша или вызывает handler и кэширует ответ."""
+        config = get_settings('API_RESPONSE_CACHE', CACHE_DEFAULTS)
+        if not config['ENABLED']:
+            return handler(request, *args, **kwargs)
+        cache = get_cache()
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            count_event(HITS_KEY)
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+        count_event(MISSES_KEY)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, config['TIMEOUT'])
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
@@ -0,0 +1,10 @@
+from django.conf import settings
+
+
+def get_settings(name, defaults):
+    """
+    Словарь настройки name из settings.py поверх значений
+    по умолчанию defaults: ключи, которых нет в settings.py,
+    берутся из defaults.
+    """
+    return {**defaults, **getattr(settings, name, {})}
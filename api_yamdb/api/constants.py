@@ -5,3 +5,5 @@ NAME_LENGTH = 256
 REVIEW_SCORE_MAX = 10
 REVIEW_SCORE_MIN = 1
 NOT_ALLOWED_USERNAME = ('me',)
+TITLES_BULK_LIMIT = 100
+FEED_ORDERING = ('-pub_date', '-id')
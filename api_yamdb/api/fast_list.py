@@ -0,0 +1,126 @@
+from itertools import chain
+from operator import itemgetter
+
+from rest_framework.response import Response
+
+from api.conf import get_settings
+from api.timing import phase
+
+
+FAST_LIST_DEFAULTS = {
+    'ENABLED': True,
+}
+
+
+class ValuesSerializer:
+    """
+    Сериализатор списков по строкам values() без создания
+    экземпляров моделей и полей DRF.
+
+    Подкласс задаёт field_columns — поля ответа в порядке
+    соответствующего ModelSerializer и колонки values() для каждого.
+    Значение поля с одной колонкой берётся из неё как есть,
+    для остальных подкласс определяет метод get_<поле>(row).
+    Связанные списки загружаются одним запросом на страницу в prepare().
+
+    fields ограничивает ответ и список колонок частью полей,
+    required — колонки, нужные всегда (id, поля курсора).
+    """
+
+    field_columns = {}
+
+    def __init__(self, fields=None, required=('id',)):
+        self.fields = [
+            name for name in self.field_columns
+            if fields is None or name in fields
+        ]
+        self.required = required
+        self.getters = [
+            (name, getattr(self, f'get_{name}', None)
+             or itemgetter(self.field_columns[name][0]))
+            for name in self.fields
+        ]
+
+    @property
+    def columns(self):
+        return tuple(dict.fromkeys(chain(
+            self.required,
+            *(self.field_columns[name] for name in self.fields)
+        )))
+
+    def get_rows(self, queryset):
+        # Дополнительные колонки extra() (например, ранг поиска)
+        # нужны для сортировки.
+        return queryset.prefetch_related(None).values(
+            *self.columns, *queryset.query.extra_select
+        )
+
+    def prepare(self, rows):
+        """Загружает данные связанных моделей для строк страницы."""
+
+    def get_included(self):
+        """Связанные объекты, вынесенные из строк в ключ included ответа."""
+        return None
+
+    def to_representation(self, row):
+        return {name: getter(row) for name, getter in self.getters}
+
+    def serialize(self, rows):
+        with phase('serialize'):
+            rows = list(rows)
+            self.prepare(rows)
+            return [self.to_representation(row) for row in rows]
+
+
+class FastListMixin:
+    """
+    Действие list через ValuesSerializer из values_serializer_class:
+    фильтрация, пагинация и ответ остаются прежними, меняется только
+    получение и преобразование строк. Отключается настройкой
+    FAST_LIST = {'ENABLED': False}.
+    """
+
+    values_serializer_class = None
+
+    def get_values_serializer(self):
+        if (
+            self.values_serializer_class is None
+            or not get_settings('FAST_LIST', FAST_LIST_DEFAULTS)['ENABLED']
+        ):
+            return None
+        return self.values_serializer_class(
+            **self.get_values_serializer_kwargs()
+        )
+
+    def get_values_serializer_kwargs(self):
+        return {}
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_values_serializer()
+        if serializer is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = serializer.get_rows(queryset)
+        page = self.paginate_queryset(rows, count_queryset=queryset)
+        if page is not None:
+            return self.get_values_response(serializer, page)
+        return Response(serializer.serialize(rows))
+
+    def paginate_queryset(self, queryset, count_queryset=None):
+        """
+        Пагинатор по номеру страницы считает строки values()
+        по исходному queryset count_queryset: COUNT(*) без JOIN,
+        добавленных колонками связанных моделей.
+        """
+        if self.paginator is None or count_queryset is None:
+            return super().paginate_queryset(queryset)
+        return self.paginator.paginate_queryset(
+            queryset, self.request, view=self, count_queryset=count_queryset
+        )
+
+    def get_values_response(self, serializer, page):
+        response = self.get_paginated_response(serializer.serialize(page))
+        included = serializer.get_included()
+        if included is not None:
+            response.data['included'] = included
+        return response
@@ -1,19 +1,79 @@
 import django_filters
+from rest_framework.filters import SearchFilter
 
-from reviews.models import Title
+from reviews.fields import normalize_search
+from reviews.fulltext import title_fulltext
+from reviews.models import Review, Title
+
+
+class SearchCharFilter(django_filters.CharFilter):
+    """
+    Фильтр по теневой колонке SearchField: значение нормализуется
+    так же, как колонка, и сравнивается по индексу без LIKE.
+    """
+
+    def filter(self, qs, value):
+        return super().filter(qs, normalize_search(value) if value else value)
+
+
+class CasefoldSearchFilter(SearchFilter):
+    """
+    SearchFilter для теневых колонок SearchField в search_fields.
+
+    Термы нормализуются так же, как колонки, поэтому поиск
+    регистронезависим и для кириллицы. Префикс ^ ищет по началу
+    строки с использованием индекса, = — точное совпадение.
+    """
+
+    lookup_prefixes = {
+        '^': 'prefix',
+        '=': 'exact',
+        '@': 'search',
+        '$': 'regex',
+    }
+
+    def get_search_terms(self, request):
+        return [normalize_search(term)
+                for term in super().get_search_terms(request)]
+
+    def construct_search(self, field_name):
+        lookup = self.lookup_prefixes.get(field_name[0])
+        if lookup:
+            return f'{field_name[1:]}__{lookup}'
+        return f'{field_name}__contains'
 
 
 class TitleFilter(django_filters.FilterSet):
     """
     Фильтр для модели Title, позволяющий осуществлять фильтрацию
     по жанру, категории, названию и году выпуска.
+    Жанр, категория и название сравниваются без учёта регистра.
+    Параметр q — полнотекстовый поиск по названию и описанию
+    с сортировкой по релевантности.
     """
 
-    genre = django_filters.CharFilter(
-        field_name='genres__slug', lookup_expr='iexact')
-    category = django_filters.CharFilter(
-        field_name='category__slug', lookup_expr='iexact')
+    genre = SearchCharFilter(field_name='genres__slug_search')
+    category = SearchCharFilter(field_name='category__slug_search')
+    name = SearchCharFilter(field_name='name_search')
+    q = django_filters.CharFilter(method='filter_fulltext')
 
     class Meta:
         model = Title
         fields = ['genre', 'category', 'name', 'year']
+
+    def filter_fulltext(self, queryset, name, value):
+        return title_fulltext.search(queryset, value)
+
+
+class ReviewFeedFilter(django_filters.FilterSet):
+    """
+    Фильтр ленты отзывов по автору (username), категории
+    произведения (слаг без учёта регистра) и оценке.
+    """
+
+    author = django_filters.CharFilter(field_name='author__username')
+    category = SearchCharFilter(field_name='title__category__slug_search')
+
+    class Meta:
+        model = Review
+        fields = ['author', 'category', 'score']
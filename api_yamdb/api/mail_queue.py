@@ -0,0 +1,212 @@
+import atexit
+import logging
+import queue
+import random
+import threading
+import time
+from collections import deque
+
+from django.core.mail import get_connection
+
+from api.conf import get_settings
+
+logger = logging.getLogger('api.mail')
+
+
+MAIL_QUEUE_DEFAULTS = {
+    'ENABLED': True,
+    'WORKERS': 2,
+    'MAX_SIZE': 10000,
+    'BATCH_SIZE': 50,
+    'BATCH_WAIT': 0.05,
+    'IDLE_TIMEOUT': 5,
+    'MAX_ATTEMPTS': 5,
+    'BASE_DELAY': 1.0,
+    'MAX_DELAY': 60.0,
+}
+
+
+class MailQueue:
+    """
+    Очередь фоновой отправки писем.
+
+    Запрос только ставит письмо в очередь, а пул рабочих потоков
+    отправляет письма пачками через одно открытое соединение
+    с почтовым бэкендом, каждое письмо — отдельным вызовом.
+    Соединение закрывается, когда очередь простаивает дольше
+    IDLE_TIMEOUT. Неудачная отправка письма повторяется
+    с экспоненциальной задержкой, после MAX_ATTEMPTS попыток письмо
+    отбрасывается с записью в лог api.mail.
+    """
+
+    LATENCY_SAMPLES = 1000
+
+    def __init__(self, **config):
+        self.overrides = config
+        self.queue = None
+        self.workers = []
+        self.lock = threading.Lock()
+        self.idle = threading.Condition(self.lock)
+        self.pending = 0
+        self.counters = {'enqueued': 0, 'sent': 0, 'retried': 0,
+                         'failed': 0, 'batches': 0}
+        self.latencies = deque(maxlen=self.LATENCY_SAMPLES)
+
+    @property
+    def config(self):
+        return {
+            **get_settings('EMAIL_QUEUE', MAIL_QUEUE_DEFAULTS),
+            **self.overrides
+        }
+
+    def start(self):
+        """Запускает рабочие потоки, если они ещё не запущены."""
+        with self.lock:
+            if self.workers:
+                return
+            config = self.config
+            self.queue = queue.Queue(config['MAX_SIZE'])
+            self.workers = [
+                threading.Thread(
+                    target=self.work, name=f'mail-queue-{number}',
+                    daemon=True
+                )
+                for number in range(config['WORKERS'])
+            ]
+            for worker in self.workers:
+                worker.start()
+
+    def enqueue(self, message):
+        """
+        Ставит письмо в очередь. Если очередь выключена
+        или переполнена, письмо отправляется сразу.
+        """
+        if not self.config['ENABLED']:
+            message.send()
+            return
+        self.start()
+        with self.lock:
+            self.pending += 1
+            self.counters['enqueued'] += 1
+        try:
+            self.queue.put_nowait((message, time.monotonic(), 1))
+        except queue.Full:
+            logger.warning('Очередь писем переполнена, отправка без очереди')
+            with self.lock:
+                self.pending -= 1
+            message.send()
+
+    def work(self):
+        connection = None
+        while True:
+            try:
+                item = self.queue.get(timeout=self.config['IDLE_TIMEOUT'])
+            except queue.Empty:
+                if connection is not None:
+                    connection.close()
+                    connection = None
+                continue
+            batch = self.collect_batch(item)
+            try:
+                connection = self.send_batch(connection, batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def send_batch(self, connection, batch):
+        """
+        Отправляет письма пачки по одному через общее соединение.
+        Повторяются только письма, отправка которых не удалась,
+        поэтому уже получившие письмо адресаты не получат его снова.
+        Возвращает соединение для следующей пачки.
+        """
+        sent = []
+        for entry in batch:
+            try:
+                if connection is None:
+                    connection = get_connection()
+                connection.open()
+                connection.send_messages([entry[0]])
+            except Exception:
+                logger.exception('Не удалось отправить письмо для %s',
+                                 ', '.join(entry[0].to))
+                if connection is not None:
+                    connection.close()
+                connection = None
+                self.retry(*entry)
+            else:
+                sent.append(entry)
+        if sent:
+            self.delivered(sent)
+        return connection
+
+    def collect_batch(self, item):
+        """Добирает письма в пачку, ожидая не дольше BATCH_WAIT."""
+        config = self.config
+        batch = [item]
+        deadline = time.monotonic() + config['BATCH_WAIT']
+        while len(batch) < config['BATCH_SIZE']:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def delivered(self, batch):
+        now = time.monotonic()
+        with self.lock:
+            self.counters['sent'] += len(batch)
+            self.counters['batches'] += 1
+            self.latencies.extend(now - enqueued for _, enqueued, _ in batch)
+            self.finish(len(batch))
+
+    def retry(self, message, enqueued, attempt):
+        config = self.config
+        if attempt >= config['MAX_ATTEMPTS']:
+            logger.error('Письмо для %s не отправлено после %s попыток',
+                         ', '.join(message.to), attempt)
+            with self.lock:
+                self.counters['failed'] += 1
+                self.finish(1)
+            return
+        with self.lock:
+            self.counters['retried'] += 1
+        delay = min(config['MAX_DELAY'], config['BASE_DELAY'] * 2 ** attempt)
+        timer = threading.Timer(
+            delay * random.uniform(0.5, 1),
+            self.queue.put, args=((message, enqueued, attempt + 1),)
+        )
+        timer.daemon = True
+        timer.start()
+
+    def finish(self, count):
+        self.pending -= count
+        if not self.pending:
+            self.idle.notify_all()
+
+    def flush(self, timeout=None):
+        """
+        Ждёт, пока все письма в очереди (включая повторы)
+        будут отправлены или отброшены. Возвращает False по таймауту.
+        """
+        with self.idle:
+            return self.idle.wait_for(lambda: not self.pending, timeout)
+
+    def get_stats(self):
+        """Глубина очереди, счётчики и задержка доставки в миллисекундах."""
+        with self.lock:
+            latencies = sorted(self.latencies)
+            stats = {**self.counters, 'depth': self.pending}
+        for name, value in (('p50', 50), ('p95', 95)):
+            index = max(0, round(value / 100 * len(latencies)) - 1)
+            stats[f'latency_{name}_ms'] = (
+                round(latencies[index] * 1000, 2) if latencies else None
+            )
+        return stats
+
+
+mail_queue = MailQueue()
+atexit.register(mail_queue.flush, timeout=10)
@@ -0,0 +1,133 @@
+import json
+import logging
+import time
+from contextlib import ExitStack
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from api.conf import get_settings
+from api.timing import RequestTiming
+
+logger = logging.getLogger('api.timing')
+
+PHASES = ('db', 'permissions', 'view', 'serialize', 'render')
+
+
+TIMING_DEFAULTS = {
+    'ENABLED': False,
+    'SLOW_QUERY_MS': 100,
+    'SLOW_QUERY_LIMIT': 3,
+}
+
+
+def explain(sql, params, alias):
+    """
+    Возвращает план выполнения запроса на соединении alias
+    или None, если он недоступен.
+    """
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return None
+    connection = connections[alias]
+    prefix = (
+        'EXPLAIN QUERY PLAN' if connection.vendor == 'sqlite' else 'EXPLAIN'
+    )
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f'{prefix} {sql}', params)
+            return [' '.join(map(str, row)) for row in cursor.fetchall()]
+    except Exception:
+        return None
+
+
+class ServerTimingMiddleware:
+    """
+    Замеряет обработку запроса по фазам: SQL (db), аутентификация
+    и права (permissions), вьюха (view), сериализация (serialize)
+    и рендеринг ответа (render).
+
+    Результат добавляется в заголовок Server-Timing и пишется
+    в лог api.timing одной JSON-строкой. Запросы к базе данных
+    дольше SLOW_QUERY_MS логируются вместе с планом выполнения.
+    Фаза db пересекается с остальными: SQL выполняется внутри них.
+
+    Заголовок раскрывает клиентам устройство запросов, поэтому
+    middleware выключен по умолчанию и включается настройкой
+    SERVER_TIMING = {'ENABLED': True} для профилирования.
+    """
+
+    def __init__(self, get_response):
+        self.config = get_settings('SERVER_TIMING', TIMING_DEFAULTS)
+        if not self.config['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timing = RequestTiming()
+        request.timing = timing
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            stack.enter_context(timing.activate())
+            for alias in connections:
+                stack.enter_context(
+                    connections[alias].execute_wrapper(timing)
+                )
+            response = self.get_response(request)
+        end = time.perf_counter()
+        if hasattr(request, 'view_started'):
+            view_end = getattr(request, 'render_started', end)
+            timing.phases['view'] = view_end - request.view_started
+        if hasattr(request, 'render_started'):
+            timing.phases['render'] = end - request.render_started
+        timing.phases['total'] = end - start
+
+        response['Server-Timing'] = self.server_timing_header(timing)
+        self.log(request, response, timing)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        request.render_started = time.perf_counter()
+        return response
+
+    def server_timing_header(self, timing):
+        entries = []
+        for name in PHASES + ('total',):
+            if name not in timing.phases:
+                continue
+            entry = f'{name};dur={timing.phases[name] * 1000:.2f}'
+            if name == 'db':
+                entry += f';desc="{len(timing.queries)} queries"'
+            entries.append(entry)
+        return ', '.join(entries)
+
+    def log(self, request, response, timing):
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': len(timing.queries),
+            **{
+                f'{name}_ms': round(duration * 1000, 2)
+                for name, duration in timing.phases.items()
+            },
+        }
+        logger.info(json.dumps(record, ensure_ascii=False))
+
+        threshold = self.config['SLOW_QUERY_MS'] / 1000
+        slow_queries = sorted(
+            (query for query in timing.queries
+             if query[0] >= threshold and not query[3]),
+            key=lambda query: query[0],
+            reverse=True
+        )[:self.config['SLOW_QUERY_LIMIT']]
+        for duration, sql, params, _, alias in slow_queries:
+            logger.warning(json.dumps({
+                'method': request.method,
+                'path': request.path,
+                'slow_query_ms': round(duration * 1000, 2),
+                'sql': sql,
+                'plan': explain(sql, params, alias),
+            }, ensure_ascii=False, default=str))
@@ -0,0 +1,58 @@
+from rest_framework.serializers import ValidationError
+
+
+class OrderingMixin:
+    """
+    Параметр ?ordering=a,-b списка сортирует по открытым именам
+    из ordering_fields (имя -> колонка модели).
+
+    К порядку добавляется id в направлении последнего поля:
+    порядок однозначен и читается по индексу (колонка, id)
+    прямым или обратным проходом. Он же становится порядком
+    курсорной пагинации вместо cursor_ordering: курсор хранит
+    значения всех полей, включая id, поэтому произведения
+    с одинаковым рейтингом не пропускаются через OFFSET.
+    """
+
+    ordering_query_param = 'ordering'
+    ordering_fields = {}
+
+    def get_ordering(self):
+        """Возвращает кортеж полей order_by() или None."""
+        if not hasattr(self, '_ordering'):
+            self._ordering = self.parse_ordering()
+        return self._ordering
+
+    def parse_ordering(self):
+        value = self.request.query_params.get(self.ordering_query_param)
+        if self.action != 'list' or not value:
+            return None
+        names = list(dict.fromkeys(
+            name.strip() for name in value.split(',') if name.strip()
+        ))
+        unknown = [name for name in names
+                   if name.lstrip('-') not in self.ordering_fields]
+        if unknown:
+            raise ValidationError({
+                self.ordering_query_param:
+                    f'Неизвестные поля сортировки: {", ".join(unknown)}.'
+            })
+        if not names:
+            return None
+        ordering = [
+            '-' * name.startswith('-') + self.ordering_fields[name.lstrip('-')]
+            for name in names
+        ]
+        if 'id' not in {field.lstrip('-') for field in ordering}:
+            ordering.append('-id' if ordering[-1][0] == '-' else 'id')
+        return tuple(ordering)
+
+    def get_cursor_ordering(self):
+        return self.get_ordering() or getattr(self, 'cursor_ordering', None)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        ordering = self.get_ordering()
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return queryset
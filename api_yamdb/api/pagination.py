@@ -0,0 +1,219 @@
+import json
+from datetime import date
+from functools import partial, reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    Cursor,
+    CursorPagination,
+    PageNumberPagination
+)
+
+
+def get_cursor_ordering(view):
+    """
+    Порядок курсорной пагинации вьюсета: get_cursor_ordering(),
+    если порядок зависит от запроса, иначе атрибут cursor_ordering.
+    """
+    getter = getattr(view, 'get_cursor_ordering', None)
+    if getter is not None:
+        return getter()
+    return getattr(view, 'cursor_ordering', None)
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Курсорная пагинация по всем полям порядка.
+
+    Курсор хранит значения всех полей ordering у крайней строки
+    страницы. Следующая страница выбирается сравнением строк
+    (a > x OR a = x AND b > y ...) с нестрогой границей по первому
+    полю для поиска по индексу, поэтому строки с одинаковыми первыми
+    полями не пропускаются через OFFSET. Последним полем порядка
+    должен быть уникальный столбец (id), поля порядка — не NULL.
+    count_queryset принимается наравне с CursorOrPageNumberPagination:
+    курсорные страницы строки не считают.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None,
+                          count_queryset=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        cursor = self.decode_cursor(request)
+        reverse = cursor is not None and cursor.reverse
+        position = None if cursor is None else self.decode_position(
+            cursor.position, queryset.model
+        )
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(
+                field[1:] if field.startswith('-') else f'-{field}'
+                for field in ordering
+            )
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(
+                self.get_position_filter(ordering, position)
+            )
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_following = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = position is not None
+        return self.page
+
+    def get_position_filter(self, ordering, position):
+        """Условие «строка после position» для порядка ordering."""
+        names = [field.lstrip('-') for field in ordering]
+        lookups = ['lt' if field.startswith('-') else 'gt'
+                   for field in ordering]
+        after = reduce(or_, (
+            Q(**dict(zip(names[:index], position[:index])), **{
+                f'{names[index]}__{lookups[index]}': position[index]
+            })
+            for index in range(len(ordering))
+        ))
+        return Q(**{
+            f'{names[0]}__{lookups[0]}e': position[0]
+        }) & after
+
+    def get_position(self, row):
+        return [
+            row[name] if isinstance(row, dict) else getattr(row, name)
+            for name in (field.lstrip('-') for field in self.ordering)
+        ]
+
+    def encode_position(self, row):
+        return json.dumps([
+            value.isoformat() if isinstance(value, date) else value
+            for value in self.get_position(row)
+        ])
+
+    def decode_position(self, value, model):
+        if value is None:
+            return None
+        try:
+            values = json.loads(value)
+            if (
+                not isinstance(values, list)
+                or len(values) != len(self.ordering)
+            ):
+                raise ValueError
+            return [
+                model._meta.get_field(field.lstrip('-')).to_python(item)
+                for field, item in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(Cursor(
+            offset=0, reverse=False,
+            position=self.encode_position(self.page[-1])
+        ))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(Cursor(
+            offset=0, reverse=True,
+            position=self.encode_position(self.page[0])
+        ))
+
+
+class CountPaginator(Paginator):
+    """
+    Пагинатор, который считает строки object_list запросом
+    count_queryset, если он задан: например, строки values() считаются
+    по исходному queryset — COUNT(*) без JOIN колонок связанных моделей.
+    """
+
+    def __init__(self, object_list, per_page, count_queryset=None,
+                 **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_queryset = count_queryset
+
+    @cached_property
+    def count(self):
+        if self.count_queryset is None:
+            return super().count
+        return self.count_queryset.count()
+
+
+class CursorOrPageNumberPagination(PageNumberPagination):
+    """
+    Пагинация по номеру страницы с переключением на курсорную (keyset).
+
+    Курсорный режим доступен вьюсетам с атрибутом cursor_ordering
+    и включается параметром ?pagination=cursor или наличием
+    параметра cursor в запросе. В этом режиме не выполняется COUNT(*),
+    а страница выбирается по индексу без OFFSET-сканирования.
+    """
+
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+
+    def __init__(self):
+        self.cursor_paginator = None
+
+    def get_cursor_paginator(self, request, view):
+        """Возвращает курсорный пагинатор, если клиент его запросил."""
+        ordering = get_cursor_ordering(view)
+        params = request.query_params
+        if ordering is None or (
+            params.get(self.mode_query_param) != self.cursor_mode
+            and CursorPagination.cursor_query_param not in params
+        ):
+            return None
+        paginator = KeysetCursorPagination()
+        paginator.ordering = ordering
+        paginator.page_size = self.get_page_size(request)
+        return paginator
+
+    def paginate_queryset(self, queryset, request, view=None,
+                          count_queryset=None):
+        self.cursor_paginator = self.get_cursor_paginator(request, view)
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        self.django_paginator_class = partial(
+            CountPaginator, count_queryset=count_queryset
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_html_context(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_html_context()
+        return super().get_html_context()
+
+
+class KeysetPagination(KeysetCursorPagination):
+    """
+    Только курсорная пагинация в порядке cursor_ordering вьюсета —
+    для лент, где номер страницы смещается с каждой новой записью.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None,
+                          count_queryset=None):
+        self.ordering = get_cursor_ordering(view)
+        return super().paginate_queryset(queryset, request, view)
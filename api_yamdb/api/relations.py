@@ -0,0 +1,127 @@
+from collections import defaultdict
+
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS, ManyRelatedField
+
+
+class SlugResolver:
+    """
+    Разрешает слаги в объекты пачками и запоминает результат.
+
+    Хранится в контексте сериализатора, поэтому все поля
+    одного запроса, включая элементы списка при массовом создании,
+    получают объекты одной модели одним запросом.
+    """
+
+    context_key = 'slug_resolver'
+
+    def __init__(self):
+        self.found = defaultdict(dict)
+        self.missing = defaultdict(set)
+
+    @classmethod
+    def from_context(cls, context):
+        return context.setdefault(cls.context_key, cls())
+
+    def resolve(self, queryset, slug_field, slugs):
+        """Возвращает словарь slug -> объект для найденных слагов."""
+        key = (queryset.model, slug_field)
+        found, missing = self.found[key], self.missing[key]
+        unknown = {slug for slug in slugs
+                   if slug not in found and slug not in missing}
+        if unknown:
+            for obj in queryset.filter(**{f'{slug_field}__in': unknown}):
+                found[getattr(obj, slug_field)] = obj
+            missing.update(unknown - set(found))
+        return found
+
+
+class BatchSlugRelatedField(serializers.SlugRelatedField):
+    """
+    SlugRelatedField, который получает объекты через SlugResolver:
+    с many=True все слаги списка разрешаются одним запросом,
+    а ошибка перечисляет все ненайденные слаги.
+    """
+
+    default_error_messages = {
+        'does_not_exist': 'Не найдены объекты с {slug_name}: {value}.',
+    }
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BatchManyRelatedField(**list_kwargs)
+
+    def to_slug(self, data):
+        if not isinstance(data, (str, int)) or isinstance(data, bool):
+            self.fail('invalid')
+        return str(data)
+
+    def resolve(self, data):
+        """Возвращает объекты для списка значений в том же порядке."""
+        slugs = list(dict.fromkeys(self.to_slug(item) for item in data))
+        found = SlugResolver.from_context(self.context).resolve(
+            self.get_queryset(), self.slug_field, slugs
+        )
+        unknown = [slug for slug in slugs if slug not in found]
+        if unknown:
+            self.fail(
+                'does_not_exist', slug_name=self.slug_field,
+                value=', '.join(unknown)
+            )
+        return [found[slug] for slug in slugs]
+
+    def to_internal_value(self, data):
+        return self.resolve([data])[0]
+
+
+class BatchManyRelatedField(ManyRelatedField):
+    """Список BatchSlugRelatedField, разрешаемый одним запросом."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        return self.child_relation.resolve(data)
+
+
+class BatchSlugListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer для массового создания: перед проверкой элементов
+    собирает слаги всех BatchSlugRelatedField из всего списка,
+    чтобы каждая связанная модель загружалась одним запросом.
+    """
+
+    def prefetch_slugs(self, data):
+        for name, field in self.child.fields.items():
+            many = isinstance(field, BatchManyRelatedField)
+            relation = field.child_relation if many else field
+            if field.read_only or not isinstance(
+                relation, BatchSlugRelatedField
+            ):
+                continue
+            slugs = set()
+            for item in data:
+                if not isinstance(item, dict) or name not in item:
+                    continue
+                values = item[name] if many else [item[name]]
+                if isinstance(values, (list, tuple)):
+                    slugs.update(
+                        str(value) for value in values
+                        if isinstance(value, (str, int))
+                    )
+            SlugResolver.from_context(self.context).resolve(
+                relation.get_queryset(), relation.slug_field, slugs
+            )
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            self.prefetch_slugs(data)
+        return super().to_internal_value(data)
+
+    def create(self, validated_data):
+        return self.child.create_many(validated_data)
@@ -1,20 +1,49 @@
+from collections import defaultdict
+from operator import itemgetter
+
 from django.contrib.auth.tokens import default_token_generator
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from rest_framework import serializers
 
+from api.cache import bump_model_version, get_versioned_data
 from api.constants import LIMIT_EMAIL, LIMIT_USERNAME
+from api.fast_list import ValuesSerializer
+from api.relations import BatchSlugListSerializer, BatchSlugRelatedField
+from api.sparse_fields import SparseFieldsSerializerMixin
+from api.timing import TimedSerializerMixin
 from api.validators import title_year_validator, user_validator
 from reviews.models import (
+    SCORE_COUNT_FIELDS,
+    SCORE_RANGE,
     Category,
     Comment,
     Genre,
+    GenreTitle,
     Review,
     Title,
-    User
+    User,
+    score_count_field
 )
 
 
-class GenreSerializer(serializers.ModelSerializer):
+def get_slug_dictionary(model):
+    """
+    Словарь id -> {'name', 'slug'} всех объектов справочника
+    (жанров или категорий), кэшируется до изменения модели.
+    """
+    return get_versioned_data(
+        f'{model._meta.label_lower}-dictionary', (model,),
+        lambda: {
+            pk: {'name': name, 'slug': slug}
+            for pk, name, slug in model.objects.values_list(
+                'id', 'name', 'slug'
+            )
+        }
+    )
+
+
+class GenreSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для модели жанр произведения."""
 
     class Meta:
@@ -22,7 +51,7 @@ class GenreSerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для модели категории произведения."""
 
     class Meta:
@@ -30,7 +59,8 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(TimedSerializerMixin, SparseFieldsSerializerMixin,
+                       serializers.ModelSerializer):
     """Сериализатор для модели отзывов."""
 
     author = serializers.ReadOnlyField(source='author.username')
@@ -43,21 +73,69 @@ class ReviewSerializer(serializers.ModelSerializer):
     def validate(self, data):
         """Проверка: один отзыв на одно произведение от одного пользователя."""
         request = self.context.get('request')
-        title_id = self.context.get('view').kwargs.get('title_id')
 
         if request and request.method == 'POST':
-            author = request.user
-            if Review.objects.filter(
-                title_id=title_id,
-                author=author
-            ).exists():
+            title = self.context.get('title')
+            already_reviewed = getattr(title, 'author_has_review', None)
+            if already_reviewed is None:
+                already_reviewed = Review.objects.filter(
+                    title_id=self.context.get('view').kwargs.get('title_id'),
+                    author=request.user
+                ).exists()
+            if already_reviewed:
                 raise serializers.ValidationError(
                     'Вы уже оставляли отзыв на это произведение.'
                 )
         return data
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class ReviewValuesSerializer(ValuesSerializer):
+    """Быстрая сериализация списка отзывов, как ReviewSerializer."""
+
+    field_columns = {
+        'id': ('id',),
+        'text': ('text',),
+        'author': ('author__username',),
+        'score': ('score',),
+        'pub_date': ('pub_date',),
+    }
+
+
+class ReviewSearchSerializer(ReviewSerializer):
+    """Сериализатор результатов поиска отзывов с id произведения."""
+
+    title = serializers.ReadOnlyField(source='title_id')
+
+    class Meta(ReviewSerializer.Meta):
+        fields = ('id', 'title', 'text', 'author', 'score', 'pub_date')
+
+
+class ReviewFeedSerializer(ReviewSearchSerializer):
+    """Сериализатор ленты отзывов с id и названием произведения."""
+
+    title_name = serializers.ReadOnlyField(source='title.name')
+
+    class Meta(ReviewSerializer.Meta):
+        fields = ('id', 'title', 'title_name', 'text', 'author', 'score',
+                  'pub_date')
+
+
+class ReviewFeedValuesSerializer(ValuesSerializer):
+    """Быстрая сериализация ленты отзывов, как ReviewFeedSerializer."""
+
+    field_columns = {
+        'id': ('id',),
+        'title': ('title_id',),
+        'title_name': ('title__name',),
+        'text': ('text',),
+        'author': ('author__username',),
+        'score': ('score',),
+        'pub_date': ('pub_date',),
+    }
+
+
+class CommentSerializer(TimedSerializerMixin, SparseFieldsSerializerMixin,
+                        serializers.ModelSerializer):
     """Сериализатор для модели комментариев."""
 
     author = serializers.ReadOnlyField(source='author.username')
@@ -68,7 +146,45 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'author', 'pub_date')
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
+class CommentValuesSerializer(ValuesSerializer):
+    """Быстрая сериализация списка комментариев, как CommentSerializer."""
+
+    field_columns = {
+        'id': ('id',),
+        'text': ('text',),
+        'author': ('author__username',),
+        'pub_date': ('pub_date',),
+    }
+
+
+class CommentFeedSerializer(CommentSerializer):
+    """Сериализатор комментариев пользователя с отзывом и произведением."""
+
+    review = serializers.ReadOnlyField(source='review_id')
+    title = serializers.ReadOnlyField(source='review.title_id')
+    title_name = serializers.ReadOnlyField(source='review.title.name')
+
+    class Meta(CommentSerializer.Meta):
+        fields = ('id', 'review', 'title', 'title_name', 'text', 'author',
+                  'pub_date')
+
+
+class CommentFeedValuesSerializer(ValuesSerializer):
+    """Быстрая сериализация комментариев, как CommentFeedSerializer."""
+
+    field_columns = {
+        'id': ('id',),
+        'review': ('review_id',),
+        'title': ('review__title_id',),
+        'title_name': ('review__title__name',),
+        'text': ('text',),
+        'author': ('author__username',),
+        'pub_date': ('pub_date',),
+    }
+
+
+class TitleReadSerializer(TimedSerializerMixin, SparseFieldsSerializerMixin,
+                          serializers.ModelSerializer):
     """Сериализатор для чтения модели произведения."""
 
     category = CategorySerializer(read_only=True)
@@ -85,12 +201,126 @@ class TitleReadSerializer(serializers.ModelSerializer):
         model = Title
 
 
-class TitleWriteSerializer(serializers.ModelSerializer):
-    """Сериализатор для записи в модель произведения."""
+class TitleRatingsSerializer(SparseFieldsSerializerMixin,
+                             serializers.ModelSerializer):
+    """
+    Распределение оценок произведения по счётчикам гистограммы:
+    число оценок для каждого значения от REVIEW_SCORE_MIN
+    до REVIEW_SCORE_MAX, включая нулевые.
+    """
+
+    columns = ('id', 'rating', 'score_count', *SCORE_COUNT_FIELDS)
+
+    count = serializers.IntegerField(source='score_count', read_only=True)
+    scores = serializers.SerializerMethodField()
+
+    class Meta:
+        fields = ('id', 'rating', 'count', 'scores')
+        model = Title
 
-    category = serializers.SlugRelatedField(
+    def get_scores(self, title):
+        return [
+            {'score': score, 'count': getattr(title, score_count_field(score))}
+            for score in SCORE_RANGE
+        ]
+
+
+class TitleReadValuesSerializer(ValuesSerializer):
+    """
+    Быстрая сериализация списка произведений, как TitleReadSerializer.
+    Категория берётся JOIN-ом, жанры страницы — одним запросом
+    в том же порядке, что и prefetch_related('genres').
+
+    Связи из include ('category', 'genre') выводятся слагами,
+    а сами объекты — один раз на страницу в included. Их данные
+    берутся из кэшируемых справочников, поэтому запросы страницы
+    обходятся без JOIN с категориями и жанрами.
+    """
+
+    field_columns = {
+        'id': ('id',),
+        'name': ('name',),
+        'year': ('year',),
+        'description': ('description',),
+        'category': ('category__name', 'category__slug'),
+        'genre': (),
+        'rating': ('rating',),
+    }
+    side_load_columns = {'category': ('category_id',), 'genre': ()}
+    side_load_keys = {'category': 'categories', 'genre': 'genres'}
+
+    def __init__(self, fields=None, required=('id',), include=()):
+        self.include = include
+        if include:
+            self.field_columns = {
+                **self.field_columns,
+                **{name: self.side_load_columns[name] for name in include},
+            }
+        self.included = {self.side_load_keys[name]: {} for name in include}
+        super().__init__(fields, required)
+
+    def prepare(self, rows):
+        self.genres = defaultdict(list)
+        if 'category' in self.include:
+            self.categories = get_slug_dictionary(Category)
+        if 'genre' not in self.fields:
+            return
+        title_ids = [row['id'] for row in rows]
+        if 'genre' in self.include:
+            genres = get_slug_dictionary(Genre)
+            for title_id, genre_id in GenreTitle.objects.filter(
+                title_id__in=title_ids, genre__isnull=False
+            ).values_list('title_id', 'genre_id'):
+                if genre_id in genres:
+                    self.genres[title_id].append(genres[genre_id])
+            # Порядок жанров совпадает с Genre.Meta.ordering.
+            for title_genres in self.genres.values():
+                title_genres.sort(key=itemgetter('name'))
+            return
+        links = GenreTitle.objects.filter(
+            title_id__in=title_ids, genre__isnull=False
+        ).order_by(*(
+            f'genre__{field}' for field in Genre._meta.ordering
+        )).values_list('title_id', 'genre__name', 'genre__slug')
+        for title_id, name, slug in links:
+            self.genres[title_id].append({'name': name, 'slug': slug})
+
+    def get_category(self, row):
+        if 'category' in self.include:
+            category = self.categories.get(row['category_id'])
+            if category is None:
+                return None
+            self.included['categories'][category['slug']] = category
+            return category['slug']
+        if row['category__slug'] is None:
+            return None
+        return {'name': row['category__name'], 'slug': row['category__slug']}
+
+    def get_genre(self, row):
+        genres = self.genres.get(row['id'], [])
+        if 'genre' not in self.include:
+            return genres
+        for genre in genres:
+            self.included['genres'][genre['slug']] = genre
+        return [genre['slug'] for genre in genres]
+
+    def get_included(self):
+        return self.included if self.include else None
+
+
+class TitleWriteSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """
+    Сериализатор для записи в модель произведения.
+
+    Категория и все жанры разрешаются по слагам одним запросом
+    на модель, в том числе для списка произведений при массовом
+    создании. Связи с жанрами записываются по разнице с текущими:
+    один DELETE лишних и один INSERT недостающих.
+    """
+
+    category = BatchSlugRelatedField(
         slug_field='slug', queryset=Category.objects.all())
-    genre = serializers.SlugRelatedField(
+    genre = BatchSlugRelatedField(
         slug_field='slug', queryset=Genre.objects.all(),
         many=True, source='genres')
     year = serializers.IntegerField(
@@ -99,9 +329,71 @@ class TitleWriteSerializer(serializers.ModelSerializer):
     class Meta:
         model = Title
         fields = ('id', 'name', 'year', 'description', 'category', 'genre')
+        list_serializer_class = BatchSlugListSerializer
+
+    def create(self, validated_data):
+        return self.create_many([validated_data])[0]
+
+    def create_many(self, items):
+        """
+        Создаёт произведения и связи всех их жанров одним INSERT.
+        Сами произведения сохраняются по одному: SQLite в Django 3.2
+        не возвращает id из bulk_create.
+        """
+        title_genres = []
+        for attrs in items:
+            genres = attrs.pop('genres', [])
+            title = Title(**attrs)
+            title.save()
+            title_genres.append((title, genres))
+        self.save_genres(title_genres, created=True)
+        return [title for title, _ in title_genres]
+
+    def update(self, instance, validated_data):
+        genres = validated_data.pop('genres', None)
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save()
+        if genres is not None:
+            self.save_genres([(instance, genres)])
+        return instance
+
+    @staticmethod
+    def save_genres(title_genres, created=False):
+        """
+        Приводит жанры произведений к заданным спискам.
+
+        Текущие жанры новых произведений не запрашиваются,
+        у существующих берутся из prefetch_related('genres'),
+        если он был выполнен.
+        """
+        stale, fresh = Q(), []
+        for title, genres in title_genres:
+            current = set() if created else {
+                genre.pk for genre in title.genres.all()
+            }
+            wanted = {genre.pk for genre in genres}
+            if current - wanted:
+                stale |= Q(title=title, genre_id__in=current - wanted)
+            fresh.extend(
+                GenreTitle(title=title, genre=genre)
+                for genre in genres if genre.pk not in current
+            )
+            # Ответ сериализуется без повторного запроса жанров.
+            cached = title.genres.all()
+            cached._result_cache, cached._prefetch_done = list(genres), True
+            title._prefetched_objects_cache = {'genres': cached}
+        if stale:
+            GenreTitle.objects.filter(stale).delete()
+        if fresh:
+            GenreTitle.objects.bulk_create(fresh)
+            # bulk_create не отправляет post_save.
+            bump_model_version(
+                GenreTitle, {link.title_id for link in fresh}
+            )
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для записи в модель пользователя."""
     class Meta:
         model = User
@@ -166,4 +458,5 @@ class TokenObtainSerializer(UsernameField):
             raise serializers.ValidationError(
                 "Код подтверждения невалиден."
             )
+        data['user'] = user
         return data
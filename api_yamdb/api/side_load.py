@@ -0,0 +1,58 @@
+from rest_framework.serializers import ValidationError
+
+
+class SideLoadMixin:
+    """
+    Параметр ?include=a,b списка: связи из side_load_fields выводятся
+    в строках ссылками (слагами), а сами объекты — один раз
+    в ключе included ответа.
+
+    Компактный вид строит только ValuesSerializer, поэтому с include
+    список сериализуется через него независимо от настройки FAST_LIST.
+
+    Для отдельного объекта ?include= принимает имена из
+    detail_include_fields: вьюсет сам добавляет их в ответ retrieve.
+    """
+
+    include_query_param = 'include'
+    side_load_fields = ()
+    detail_include_fields = ()
+
+    def get_side_loaded(self):
+        """Возвращает кортеж связей, вынесенных в included."""
+        if not hasattr(self, '_side_loaded'):
+            self._side_loaded = self.parse_side_loaded()
+        return self._side_loaded
+
+    def parse_side_loaded(self):
+        value = self.request.query_params.get(self.include_query_param)
+        available = {
+            'list': self.side_load_fields,
+            'retrieve': self.detail_include_fields,
+        }.get(self.action)
+        if available is None or not value:
+            return ()
+        names = tuple(dict.fromkeys(
+            name.strip() for name in value.split(',') if name.strip()
+        ))
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            raise ValidationError({
+                self.include_query_param:
+                    f'Неизвестные связи: {", ".join(unknown)}.'
+            })
+        return names
+
+    def get_values_serializer_kwargs(self):
+        kwargs = super().get_values_serializer_kwargs()
+        include = self.get_side_loaded()
+        if include:
+            kwargs['include'] = include
+        return kwargs
+
+    def get_values_serializer(self):
+        if self.get_side_loaded():
+            return self.values_serializer_class(
+                **self.get_values_serializer_kwargs()
+            )
+        return super().get_values_serializer()
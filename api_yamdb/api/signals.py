@@ -0,0 +1,59 @@
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_migrate,
+    post_save
+)
+from django.dispatch import receiver
+
+from api.authentication import forget_all_user_states, forget_user_state
+from api.cache import bump_model_version
+from reviews.models import Category, Genre, GenreTitle, Review, Title, User
+
+CACHED_MODELS = (Title, GenreTitle, Genre, Category, Review)
+# id произведений, затронутых записью, для журнала изменений версии.
+CHANGED_TITLE_IDS = {
+    Title: lambda instance: [instance.pk],
+    Review: lambda instance: [
+        instance.title_id, getattr(instance, '_counted_score', (None,))[0]
+    ],
+    GenreTitle: lambda instance: [instance.title_id],
+}
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_cached_responses(sender, instance, **kwargs):
+    """Увеличивает версию модели, от которой зависят кэшированные ответы."""
+    if sender in CACHED_MODELS:
+        get_ids = CHANGED_TITLE_IDS.get(sender)
+        bump_model_version(
+            sender, None if get_ids is None else get_ids(instance)
+        )
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def refresh_user_state(sender, instance, **kwargs):
+    """Смена роли или блокировка сразу применяется к выданным токенам."""
+    forget_user_state(instance.pk)
+
+
+@receiver(m2m_changed, sender=Title.genres.through)
+def invalidate_title_genres(sender, action, instance, model, pk_set,
+                            **kwargs):
+    """Связи жанров через title.genres.set() не вызывают post_save."""
+    if action.startswith('post_'):
+        if model is Genre:
+            ids = [instance.pk]
+        else:
+            ids = pk_set
+        bump_model_version(GenreTitle, ids)
+
+
+@receiver(post_migrate)
+def invalidate_after_migrate(sender, **kwargs):
+    """Миграции и flush меняют данные в обход сигналов моделей."""
+    for model in CACHED_MODELS:
+        bump_model_version(model)
+    forget_all_user_states()
@@ -0,0 +1,91 @@
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.serializers import ValidationError
+
+from api.pagination import get_cursor_ordering
+
+
+class SparseFieldsSerializerMixin:
+    """Аргумент fields оставляет в ответе только перечисленные поля."""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class SparseFieldsMixin:
+    """
+    Параметр ?fields=a,b на чтение ограничивает поля ответа
+    и колонки запроса.
+
+    Колонки полей берутся из field_columns сериализатора
+    values_serializer_class: queryset получает only() с ними,
+    а select_related и prefetch_related — только для связей
+    запрошенных полей (prefetch-связи перечислены в sparse_prefetch).
+    id и поля порядка курсорной пагинации загружаются всегда.
+    """
+
+    fields_query_param = 'fields'
+    sparse_prefetch = {}
+
+    def get_requested_fields(self):
+        """Возвращает список запрошенных полей или None для всех полей."""
+        if not hasattr(self, '_requested_fields'):
+            self._requested_fields = self.parse_requested_fields()
+        return self._requested_fields
+
+    def parse_requested_fields(self):
+        value = self.request.query_params.get(self.fields_query_param)
+        if self.request.method not in SAFE_METHODS or not value:
+            return None
+        fields = list(dict.fromkeys(
+            name.strip() for name in value.split(',') if name.strip()
+        ))
+        available = self.values_serializer_class.field_columns
+        unknown = [name for name in fields if name not in available]
+        if unknown:
+            raise ValidationError({
+                self.fields_query_param:
+                    f'Неизвестные поля: {", ".join(unknown)}.'
+            })
+        return fields
+
+    def get_required_columns(self):
+        return tuple(dict.fromkeys(('id', *(
+            field.lstrip('-')
+            for field in get_cursor_ordering(self) or ()
+        ))))
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.get_requested_fields()
+        if fields is None:
+            return queryset
+        field_columns = self.values_serializer_class.field_columns
+        columns = [*self.get_required_columns(), *(
+            column for name in fields for column in field_columns[name]
+        )]
+        relations = {
+            column.rsplit('__', 1)[0] for column in columns if '__' in column
+        }
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if relations:
+            queryset = queryset.select_related(*relations)
+        return queryset.prefetch_related(*(
+            lookup for name, lookup in self.sparse_prefetch.items()
+            if name in fields
+        )).only(*columns)
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_requested_fields()
+        if fields is not None:
+            kwargs['fields'] = fields
+        return super().get_serializer(*args, **kwargs)
+
+    def get_values_serializer_kwargs(self):
+        return {
+            **super().get_values_serializer_kwargs(),
+            'fields': self.get_requested_fields(),
+            'required': self.get_required_columns(),
+        }
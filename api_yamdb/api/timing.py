@@ -0,0 +1,72 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current_timing = ContextVar('request_timing', default=None)
+
+
+class RequestTiming:
+    """Накопитель длительностей фаз и SQL-запросов одного запроса."""
+
+    def __init__(self):
+        self.phases = defaultdict(float)
+        self.active = set()
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        """Обёртка выполнения SQL для connection.execute_wrapper."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.phases['db'] += duration
+            self.queries.append((
+                duration, sql, params, many, context['connection'].alias
+            ))
+
+    @contextmanager
+    def activate(self):
+        token = _current_timing.set(self)
+        try:
+            yield self
+        finally:
+            _current_timing.reset(token)
+
+
+@contextmanager
+def phase(name):
+    """
+    Засекает длительность фазы обработки текущего запроса.
+    Вложенные вызовы одной и той же фазы (например, вложенные
+    сериализаторы) учитываются один раз. Без активного
+    ServerTimingMiddleware ничего не делает.
+    """
+    timing = _current_timing.get()
+    if timing is None or name in timing.active:
+        yield
+        return
+    timing.active.add(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.phases[name] += time.perf_counter() - start
+        timing.active.discard(name)
+
+
+class TimedSerializerMixin:
+    """Учитывает преобразование объектов в фазе serialize."""
+
+    def to_representation(self, instance):
+        with phase('serialize'):
+            return super().to_representation(instance)
+
+
+class TimedViewMixin:
+    """Учитывает аутентификацию и проверку прав в фазе permissions."""
+
+    def initial(self, request, *args, **kwargs):
+        with phase('permissions'):
+            return super().initial(request, *args, **kwargs)
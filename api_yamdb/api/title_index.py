@@ -0,0 +1,363 @@
+import threading
+
+from django.core.exceptions import ImproperlyConfigured
+
+from api.cache import get_changed_ids, get_model_version
+from api.conf import get_settings
+from api.filters import TitleFilter
+from reviews.fields import normalize_search
+from reviews.models import Category, Genre, GenreTitle, Review, Title
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+WORD_BITS = 64
+NO_CATEGORY = -1
+# Колонки values_list() и массивы индекса в том же порядке.
+TITLE_COLUMNS = {
+    'id': 'ids',
+    'name': 'names',
+    'name_search': 'name_searches',
+    'year': 'years',
+    'category_id': 'categories',
+    'weighted_rating': 'weighted_ratings',
+    'score_count': 'score_counts',
+}
+TITLE_DTYPES = {
+    'ids': 'int64',
+    'names': 'object',
+    'name_searches': 'object',
+    'years': 'int64',
+    'categories': 'int64',
+    'weighted_ratings': 'float64',
+    'score_counts': 'int64',
+}
+# Поля order_by(), по которым индекс сортирует без базы данных.
+SORT_COLUMNS = {'id', 'name', 'year', 'weighted_rating', 'score_count'}
+
+
+TITLE_INDEX_DEFAULTS = {
+    'ENABLED': False,
+}
+
+
+def title_index_available():
+    if not get_settings('TITLE_INDEX', TITLE_INDEX_DEFAULTS)['ENABLED']:
+        return False
+    if np is None:
+        raise ImproperlyConfigured(
+            "TITLE_INDEX['ENABLED'] требует numpy: pip install numpy."
+        )
+    return True
+
+
+class TitleIndex:
+    """
+    Колоночный индекс произведений в памяти процесса на массивах NumPy.
+
+    Хранит id, название, год, категорию, взвешенный рейтинг, число
+    оценок и битовую маску жанров каждого произведения в порядке id.
+    Фильтрация по жанру, категории, году и названию и сортировка
+    по полям SORT_COLUMNS выполняются векторными операциями
+    без запросов к базе данных; перестановки сортировок
+    кэшируются до следующего изменения данных.
+
+    Индекс сверяет версии моделей из api.cache перед каждым поиском.
+    Изменения произведений, отзывов и связей жанров применяются
+    построчно: по журналу версий перечитываются только затронутые
+    произведения. Без полного журнала (массовые операции, вытеснение
+    из кэша) колонки загружаются заново. Изменение категорий
+    и жанров перечитывает колонку категорий или маски жанров.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.versions = {}
+        self.ids = None
+        self.orders = {}
+
+    def current_versions(self):
+        return {
+            model: get_model_version(model)
+            for model in (Title, GenreTitle, Genre, Category, Review)
+        }
+
+    def refresh(self):
+        """Применяет изменения моделей, версии которых изменились."""
+        versions = self.current_versions()
+        if versions == self.versions:
+            return
+        with self.lock:
+            changed = {
+                model for model, version in versions.items()
+                if self.versions.get(model) != version
+            }
+            title_ids = self.get_changes(versions, changed, (Title, Review))
+            genre_ids = self.get_changes(versions, changed, (GenreTitle,))
+            if Category in changed:
+                self.load_categories()
+            if Genre in changed:
+                self.load_genres()
+            if title_ids is None or genre_ids is None:
+                self.load_titles()
+                self.load_genre_bits()
+            else:
+                genre_ids |= self.apply_title_changes(title_ids)
+                if Category in changed:
+                    self.load_title_categories()
+                if Genre in changed:
+                    self.load_genre_bits()
+                else:
+                    self.apply_genre_changes(genre_ids)
+            self.orders = {}
+            self.versions = versions
+
+    def get_changes(self, versions, changed, models):
+        """id произведений, изменённых в models, или None без журнала."""
+        if self.ids is None:
+            return None
+        ids = set()
+        for model in changed.intersection(models):
+            changes = get_changed_ids(
+                model, self.versions[model], versions[model]
+            )
+            if changes is None:
+                return None
+            ids |= changes
+        return ids
+
+    def make_columns(self, rows):
+        values = list(zip(*rows)) or [()] * len(TITLE_COLUMNS)
+        columns = {}
+        for (column, name), items in zip(TITLE_COLUMNS.items(), values):
+            if column == 'category_id':
+                items = [NO_CATEGORY if item is None else item
+                         for item in items]
+            columns[name] = np.array(items, dtype=TITLE_DTYPES[name])
+        return columns
+
+    def load_titles(self):
+        self.__dict__.update(self.make_columns(
+            Title.objects.order_by('id').values_list(*TITLE_COLUMNS)
+        ))
+
+    def apply_title_changes(self, title_ids):
+        """
+        Перечитывает строки произведений title_ids: изменённые
+        обновляются, новые добавляются, удалённые исключаются.
+        Возвращает id новых произведений — их маски жанров пусты.
+        """
+        if not title_ids:
+            return set()
+        changed = np.isin(self.ids, list(title_ids))
+        old_masks = dict(zip(
+            self.ids[changed].tolist(), self.genre_masks[changed]
+        ))
+        fresh = self.make_columns(
+            Title.objects.filter(pk__in=title_ids).values_list(
+                *TITLE_COLUMNS
+            )
+        )
+        empty = np.zeros(self.genre_masks.shape[1], dtype=np.uint64)
+        fresh_masks = np.array([
+            old_masks.get(title_id, empty)
+            for title_id in fresh['ids'].tolist()
+        ], dtype=np.uint64).reshape(-1, self.genre_masks.shape[1])
+        columns = {
+            name: np.concatenate([getattr(self, name)[~changed], array])
+            for name, array in fresh.items()
+        }
+        masks = np.concatenate([self.genre_masks[~changed], fresh_masks])
+        order = np.argsort(columns['ids'], kind='stable')
+        self.__dict__.update(
+            {name: array[order] for name, array in columns.items()}
+        )
+        self.genre_masks = masks[order]
+        return set(fresh['ids'].tolist()) - set(old_masks)
+
+    def get_positions(self, title_ids):
+        """Позиции строк title_ids; отсутствующим соответствует -1."""
+        title_ids = np.asarray(title_ids, dtype=np.int64)
+        positions = np.searchsorted(self.ids, title_ids)
+        found = positions < len(self.ids)
+        found[found] = self.ids[positions[found]] == title_ids[found]
+        return np.where(found, positions, -1)
+
+    def load_categories(self):
+        self.category_slugs = {
+            slug: category_id for category_id, slug in
+            Category.objects.values_list('id', 'slug_search')
+        }
+
+    def load_title_categories(self):
+        """Удаление категории обнуляет её у произведений без сигналов."""
+        rows = list(Title.objects.values_list('id', 'category_id'))
+        positions = self.get_positions([row[0] for row in rows])
+        found = positions >= 0
+        values = np.array(
+            [NO_CATEGORY if row[1] is None else row[1] for row in rows],
+            dtype=np.int64
+        )
+        self.categories[positions[found]] = values[found]
+
+    def load_genres(self):
+        genres = Genre.objects.order_by('id').values_list(
+            'id', 'slug_search'
+        )
+        self.genre_bits = {
+            genre_id: bit for bit, (genre_id, _) in enumerate(genres)
+        }
+        self.genre_slugs = {
+            slug: genre_id for genre_id, slug in genres
+        }
+
+    def load_genre_bits(self):
+        words = max(1, -(-len(self.genre_bits) // WORD_BITS))
+        self.genre_masks = np.zeros((len(self.ids), words), dtype=np.uint64)
+        self.set_genre_bits(GenreTitle.objects.all())
+
+    def apply_genre_changes(self, title_ids):
+        """Перечитывает маски жанров произведений title_ids."""
+        if not title_ids:
+            return
+        positions = self.get_positions(sorted(title_ids))
+        self.genre_masks[positions[positions >= 0]] = 0
+        self.set_genre_bits(
+            GenreTitle.objects.filter(title_id__in=title_ids)
+        )
+
+    def set_genre_bits(self, links):
+        links = [
+            (title_id, self.genre_bits[genre_id])
+            for title_id, genre_id in links.values_list(
+                'title_id', 'genre_id'
+            ).iterator()
+            # Связи, появившиеся после загрузки колонок, попадут
+            # в индекс при следующем обновлении по версии.
+            if title_id is not None and genre_id in self.genre_bits
+        ]
+        if not links:
+            return
+        positions = self.get_positions([title_id for title_id, _ in links])
+        bits = np.array([bit for _, bit in links], dtype=np.int64)
+        found = positions >= 0
+        np.bitwise_or.at(
+            self.genre_masks,
+            (positions[found], bits[found] // WORD_BITS),
+            np.left_shift(
+                np.uint64(1), (bits[found] % WORD_BITS).astype(np.uint64)
+            )
+        )
+
+    def get_order(self, ordering):
+        """Перестановка строк в порядке полей ordering (как order_by)."""
+        if ordering not in self.orders:
+            keys = []
+            for field in reversed(ordering):
+                key = self.get_sort_key(field.lstrip('-'))
+                keys.append(-key if field.startswith('-') else key)
+            self.orders[ordering] = np.lexsort(keys)
+        return self.orders[ordering]
+
+    def get_sort_key(self, column):
+        if column != 'name':
+            return getattr(self, TITLE_COLUMNS[column])
+        # Строки сортируются по рангу: ранги можно обратить знаком.
+        if 'name' not in self.orders:
+            self.orders['name'] = np.unique(
+                self.names, return_inverse=True
+            )[1].reshape(-1).astype(np.int64)
+        return self.orders['name']
+
+    def search(self, genre=None, category=None, year=None, name=None,
+               ordering=('name', 'id')):
+        """
+        Возвращает массив id произведений, подходящих под фильтры,
+        в порядке ordering. Условия совпадают с TitleFilter.
+        """
+        with self.lock:
+            self.refresh()
+            mask = self.filter(genre, category, year, name)
+            order = self.get_order(tuple(ordering))
+            return self.ids[order[mask[order]]]
+
+    def filter(self, genre, category, year, name):
+        mask = np.ones(len(self.ids), dtype=bool)
+        if genre:
+            genre_id = self.genre_slugs.get(normalize_search(genre))
+            if genre_id is None:
+                return ~mask
+            bit = self.genre_bits[genre_id]
+            mask &= (
+                self.genre_masks[:, bit // WORD_BITS]
+                & np.uint64(1 << (bit % WORD_BITS))
+            ) != 0
+        if category:
+            category_id = self.category_slugs.get(normalize_search(category))
+            if category_id is None:
+                return ~mask
+            mask &= self.categories == category_id
+        if year is not None:
+            mask &= self.years == int(year)
+        if name:
+            mask &= self.name_searches == normalize_search(name)
+        return mask
+
+
+title_index = TitleIndex()
+
+
+class TitleIndexMixin:
+    """
+    Список произведений через колоночный индекс: фильтрация,
+    сортировка ?ordering= и пагинация выполняются в памяти,
+    из базы данных загружаются только произведения текущей страницы.
+    Запросы, которые индекс не поддерживает (курсорная пагинация,
+    неизвестные параметры, ошибки фильтра), обрабатываются обычным
+    путём через ORM. Страница сериализуется через ValuesSerializer
+    вьюсета (FastListMixin), если он включён.
+    """
+
+    title_index_params = {
+        'page', 'genre', 'category', 'year', 'name', 'fields', 'include',
+        'ordering'
+    }
+
+    def search_title_index(self, request):
+        params = request.query_params
+        if (
+            not title_index_available()
+            or not set(params) <= self.title_index_params
+        ):
+            return None
+        filterset = TitleFilter(params, queryset=Title.objects.none())
+        if not filterset.is_valid():
+            return None
+        ordering = self.get_ordering() or ('name', 'id')
+        if any(field.lstrip('-') not in SORT_COLUMNS for field in ordering):
+            return None
+        return title_index.search(ordering=ordering, **{
+            name: filterset.form.cleaned_data.get(name)
+            for name in ('genre', 'category', 'year', 'name')
+        })
+
+    def list(self, request, *args, **kwargs):
+        ids = self.search_title_index(request)
+        if ids is None:
+            return super().list(request, *args, **kwargs)
+        page = [int(title_id) for title_id in self.paginate_queryset(ids)]
+        queryset = self.get_queryset().filter(pk__in=page)
+        serializer = self.get_values_serializer()
+        if serializer is not None:
+            rows = {row['id']: row for row in serializer.get_rows(queryset)}
+            return self.get_values_response(serializer, [
+                rows[title_id] for title_id in page if title_id in rows
+            ])
+        titles = queryset.in_bulk()
+        serializer = self.get_serializer(
+            [titles[title_id] for title_id in page if title_id in titles],
+            many=True
+        )
+        return self.get_paginated_response(serializer.data)
@@ -5,6 +5,9 @@ from api.views import (
     CategoryViewSet,
     CommentViewSet,
     GenreViewSet,
+    LeaderboardViewSet,
+    ReviewFeedViewSet,
+    ReviewSearchViewSet,
     ReviewViewSet,
     TitleViewSet,
     UserViewSet,
@@ -29,6 +32,13 @@ router_v1.register(
     CommentViewSet,
     basename='comment'
 )
+router_v1.register(
+    'reviews/search', ReviewSearchViewSet, basename='review_search'
+)
+router_v1.register('reviews', ReviewFeedViewSet, basename='review_feed')
+router_v1.register(
+    'leaderboards', LeaderboardViewSet, basename='leaderboards'
+)
 router_v1.register('users', UserViewSet, basename='users')
 
 urlpatterns = [
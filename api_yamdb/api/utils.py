@@ -1,12 +1,15 @@
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage
+
+from api.mail_queue import mail_queue
 
 
 def send_confirmation_code(email, confirmation_code):
-    """Отправляет код подтверждения на email."""
+    """Ставит письмо с кодом подтверждения в очередь отправки."""
 
     subject = 'Код подтверждения YaMDb'
     message = f'Ваш код подтверждения YaMDb: {confirmation_code}'
 
-    send_mail(subject, message, settings.EMAIL_HOST_USER,
-              [email], fail_silently=False)
+    mail_queue.enqueue(EmailMessage(
+        subject, message, settings.EMAIL_HOST_USER, [email]
+    ))
@@ -1,10 +1,11 @@
+from collections import defaultdict
+
 from django.contrib.auth.tokens import default_token_generator
-from django.db.models import Avg
+from django.db.models import Exists, OuterRef
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status
 from rest_framework.decorators import action
-from rest_framework.filters import SearchFilter
 from rest_framework.generics import GenericAPIView
 from rest_framework.mixins import (
     CreateModelMixin,
@@ -17,7 +18,16 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet, ModelViewSet
 
-from api.filters import TitleFilter
+from api.authentication import RoleAccessToken, load_user
+from api.cache import CachedResponseMixin
+from api.conf import get_settings
+from api.constants import FEED_ORDERING, TITLES_BULK_LIMIT
+from api.fast_list import FAST_LIST_DEFAULTS, FastListMixin
+from api.ordering import OrderingMixin
+from api.pagination import KeysetPagination
+from api.side_load import SideLoadMixin
+from api.sparse_fields import SparseFieldsMixin
+from api.filters import CasefoldSearchFilter, ReviewFeedFilter, TitleFilter
 from api.permissions import (
     AdminOrModeratorOrAuthorOrReadOnly,
     AdminOrReadOnly,
@@ -25,17 +35,42 @@ from api.permissions import (
 )
 from api.serializers import (
     CategorySerializer,
+    CommentFeedSerializer,
+    CommentFeedValuesSerializer,
     CommentSerializer,
+    CommentValuesSerializer,
     GenreSerializer,
+    ReviewFeedSerializer,
+    ReviewFeedValuesSerializer,
+    ReviewSearchSerializer,
     ReviewSerializer,
+    ReviewValuesSerializer,
     TokenObtainSerializer,
     UserSerializer,
     SignUpSerializer,
+    TitleRatingsSerializer,
     TitleReadSerializer,
-    TitleWriteSerializer
+    TitleReadValuesSerializer,
+    TitleWriteSerializer,
+    get_slug_dictionary
 )
+from api.timing import TimedViewMixin
+from api.title_index import TitleIndexMixin
 from api.utils import send_confirmation_code
-from reviews.models import Category, Genre, Review, Title, User
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    GenreTitle,
+    LeaderboardEntry,
+    LeaderboardKind,
+    Review,
+    Title,
+    User
+)
+from reviews.fulltext import review_fulltext
+from reviews.leaderboards import LEADERBOARD_DEFAULTS
+from reviews.sqlite import retry_on_lock
 
 
 class ListCreateDestroyMixinSet(ListModelMixin,
@@ -53,107 +88,354 @@ class ListCreateDestroyMixinSet(ListModelMixin,
     pass
 
 
-class BaseViewSet(GenericViewSet):
+class RetryOnLockMixin:
+    """
+    Повторяет запись в базу данных при временной блокировке SQLite
+    для создания, изменения и удаления объектов.
+    """
+
+    def perform_create(self, serializer):
+        retry_on_lock(super().perform_create)(serializer)
+
+    def perform_update(self, serializer):
+        retry_on_lock(super().perform_update)(serializer)
+
+    def perform_destroy(self, instance):
+        retry_on_lock(super().perform_destroy)(instance)
+
+
+class NestedResourceMixin:
+    """
+    Вложенный ресурс: разрешает родительский объект из URL
+    не больше одного раза за запрос.
+
+    Дочерние объекты выбираются фильтром по родительским id из URL,
+    без отдельного запроса родителя; его существование проверяется,
+    только если страница списка оказалась пустой. Родитель,
+    полученный для создания объекта, передаётся сериализатору
+    в контексте под именем parent_context_name.
+    """
+
+    parent_model = None
+    parent_lookups = {}
+    parent_context_name = None
+    child_filters = {}
+
+    def get_parent_queryset(self):
+        return self.parent_model.objects.all()
+
+    def get_parent(self):
+        if not hasattr(self, '_parent'):
+            self._parent = get_object_or_404(
+                self.get_parent_queryset(),
+                **{field: self.kwargs.get(kwarg)
+                   for field, kwarg in self.parent_lookups.items()}
+            )
+        return self._parent
+
+    def get_queryset(self):
+        return super().get_queryset().filter(
+            **{field: self.kwargs.get(kwarg)
+               for field, kwarg in self.child_filters.items()}
+        )
+
+    def paginate_queryset(self, queryset, **kwargs):
+        page = super().paginate_queryset(queryset, **kwargs)
+        if not page:
+            self.get_parent()
+        return page
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request is not None and self.request.method == 'POST':
+            context[self.parent_context_name] = self.get_parent()
+        return context
+
+
+class BaseViewSet(TimedViewMixin, RetryOnLockMixin, GenericViewSet):
     """Базовый класс для вьюсетов: GenreViewSet и CategoryViewSet."""
 
     permission_classes = (AdminOrReadOnly,)
-    filter_backends = (SearchFilter,)
-    search_fields = ('name',)
+    filter_backends = (CasefoldSearchFilter,)
+    search_fields = ('name_search',)
     lookup_field = 'slug'
 
 
-class GenreViewSet(BaseViewSet, ListCreateDestroyMixinSet):
+class GenreViewSet(CachedResponseMixin, BaseViewSet,
+                   ListCreateDestroyMixinSet):
     """
     ViewSet для работы с жанрами.
     Эндпоинт: /api/v1/genres/
     """
 
     queryset = Genre.objects.all()
+    cache_models = (Genre,)
     serializer_class = GenreSerializer
 
 
-class CategoryViewSet(BaseViewSet, ListCreateDestroyMixinSet):
+class CategoryViewSet(CachedResponseMixin, BaseViewSet,
+                      ListCreateDestroyMixinSet):
     """
     ViewSet для работы с категориями.
     Эндпоинт: /api/v1/categories/
     """
 
     queryset = Category.objects.all()
+    cache_models = (Category,)
     serializer_class = CategorySerializer
 
 
-class TitleViewSet(ModelViewSet):
+class TitleViewSet(TimedViewMixin, CachedResponseMixin, TitleIndexMixin,
+                   SideLoadMixin, SparseFieldsMixin, OrderingMixin,
+                   FastListMixin, RetryOnLockMixin, ModelViewSet):
     """
     ViewSet для работы с произведениями.
     Эндпоинты:
     - /api/v1/titles/
     - /api/v1/titles/<titles_id>/
+    - /api/v1/titles/<titles_id>/ratings/
     """
 
-    queryset = Title.objects.annotate(rating=Avg('reviews__score')).all()
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genres')
+    values_serializer_class = TitleReadValuesSerializer
+    sparse_prefetch = {'genre': 'genres'}
+    side_load_fields = ('category', 'genre')
+    detail_include_fields = ('ratings',)
+    cursor_ordering = ('name', 'id')
+    # rating сортирует по байесовскому рейтингу: произведение
+    # с единственной высокой оценкой не обгоняет популярные.
+    ordering_fields = {
+        'rating': 'weighted_rating',
+        'year': 'year',
+        'name': 'name',
+        'review_count': 'score_count',
+    }
+    cache_models = (Title, GenreTitle, Genre, Category, Review)
     permission_classes = (AdminOrReadOnly,)
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
     http_method_names = ['get', 'post', 'patch', 'delete']
 
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            self.retrieve_title, request, *args, **kwargs
+        )
+
+    def retrieve_title(self, request, *args, **kwargs):
+        """С ?include=ratings ответ дополняется гистограммой оценок."""
+        instance = self.get_object()
+        data = self.get_serializer(instance).data
+        if 'ratings' in self.get_side_loaded():
+            data['ratings'] = TitleRatingsSerializer(
+                instance, fields=('count', 'scores')
+            ).data
+        return Response(data)
+
+    @action(detail=True, methods=['get'])
+    def ratings(self, request, pk=None):
+        """Распределение оценок произведения из счётчиков гистограммы."""
+        return self.cached_response(self.retrieve_ratings, request, pk=pk)
+
+    def retrieve_ratings(self, request, pk=None):
+        title = get_object_or_404(
+            Title.objects.only(*TitleRatingsSerializer.columns), pk=pk
+        )
+        return Response(TitleRatingsSerializer(title).data)
+
+    def get_required_columns(self):
+        """Гистограмма загружается вместе с произведением и при ?fields=."""
+        columns = super().get_required_columns()
+        if 'ratings' in self.get_side_loaded():
+            columns = (*columns, *TitleRatingsSerializer.columns)
+        return columns
+
+    def get_serializer(self, *args, **kwargs):
+        """Список в теле POST создаёт несколько произведений сразу."""
+        if isinstance(kwargs.get('data'), list):
+            if len(kwargs['data']) > TITLES_BULK_LIMIT:
+                raise ValidationError(
+                    f'За один запрос можно создать не больше '
+                    f'{TITLES_BULK_LIMIT} произведений.'
+                )
+            kwargs['many'] = True
+        return super().get_serializer(*args, **kwargs)
+
     def get_serializer_class(self):
         if self.request.method in ['POST', 'PATCH']:
             return TitleWriteSerializer
         return TitleReadSerializer
 
 
-class ReviewViewSet(ModelViewSet):
+class ReviewViewSet(TimedViewMixin, NestedResourceMixin, SparseFieldsMixin,
+                    FastListMixin, RetryOnLockMixin, ModelViewSet):
     """
     ViewSet для работы с отзывами.
     Эндпоинты:
     - /api/v1/titles/<title_id>/reviews/
     - /api/v1/titles/<title_id>/reviews/<review_id>/
     """
+    queryset = Review.objects.select_related('author')
     serializer_class = ReviewSerializer
+    values_serializer_class = ReviewValuesSerializer
+    cursor_ordering = ('-pub_date', 'id')
     permission_classes = [AdminOrModeratorOrAuthorOrReadOnly]
     http_method_names = ['get', 'post', 'patch', 'delete']
+    parent_model = Title
+    parent_lookups = {'pk': 'title_id'}
+    parent_context_name = 'title'
+    child_filters = {'title_id': 'title_id'}
+
+    def get_parent_queryset(self):
+        """
+        При создании отзыва вместе с произведением проверяется,
+        не оставлял ли автор отзыв на него раньше.
+        """
+        queryset = super().get_parent_queryset()
+        user = self.request.user
+        if self.request.method == 'POST' and user.is_authenticated:
+            queryset = queryset.annotate(author_has_review=Exists(
+                Review.objects.filter(
+                    title=OuterRef('pk'), author=user
+                )
+            ))
+        return queryset
 
     def get_title(self):
-        return get_object_or_404(Title, pk=self.kwargs.get('title_id'))
-
-    def get_queryset(self):
-        return self.get_title().reviews.all()
+        return self.get_parent()
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, title=self.get_title())
+        retry_on_lock(serializer.save)(
+            author=self.request.user, title=self.get_title()
+        )
+
+
+class ReviewFeedViewSet(TimedViewMixin, FastListMixin, ListModelMixin,
+                        GenericViewSet):
+    """
+    Лента последних отзывов всех произведений, от новых к старым.
+    Страницы выбираются только курсором по индексу (pub_date, id).
+    Эндпоинт: /api/v1/reviews/?author=<username>&category=<slug>&score=<n>
+    """
+    queryset = Review.objects.select_related('author', 'title')
+    serializer_class = ReviewFeedSerializer
+    values_serializer_class = ReviewFeedValuesSerializer
+    cursor_ordering = FEED_ORDERING
+    pagination_class = KeysetPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = ReviewFeedFilter
 
 
-class CommentViewSet(ModelViewSet):
+class ReviewSearchViewSet(TimedViewMixin, ListModelMixin, GenericViewSet):
+    """
+    Полнотекстовый поиск по отзывам всех произведений.
+    Результаты отсортированы по релевантности.
+    Эндпоинт: /api/v1/reviews/search/?q=<запрос>
+    """
+    queryset = Review.objects.select_related('author')
+    serializer_class = ReviewSearchSerializer
+    search_param = 'q'
+
+    def get_queryset(self):
+        query = self.request.query_params.get(self.search_param, '').strip()
+        if not query:
+            raise ValidationError(
+                {self.search_param: 'Укажите поисковый запрос.'}
+            )
+        return review_fulltext.search(super().get_queryset(), query)
+
+
+class CommentViewSet(TimedViewMixin, NestedResourceMixin, SparseFieldsMixin,
+                     FastListMixin, RetryOnLockMixin, ModelViewSet):
     """
     ViewSet для работы с комментариями к отзывам.
     Эндпоинты:
     - /api/v1/titles/<title_id>/reviews/<review_id>/comments/
     - /api/v1/titles/<title_id>/reviews/<review_id>/comments/<comment_id>/
     """
+    queryset = Comment.objects.select_related('author')
     serializer_class = CommentSerializer
+    values_serializer_class = CommentValuesSerializer
+    cursor_ordering = ('-pub_date', 'id')
     permission_classes = [AdminOrModeratorOrAuthorOrReadOnly]
     http_method_names = ['get', 'post', 'patch', 'delete']
+    parent_model = Review
+    parent_lookups = {'pk': 'review_id', 'title_id': 'title_id'}
+    parent_context_name = 'review'
+    child_filters = {
+        'review_id': 'review_id', 'review__title_id': 'title_id'
+    }
 
     def get_review(self):
-        return get_object_or_404(
-            Review,
-            pk=self.kwargs.get('review_id'),
-            title__pk=self.kwargs.get('title_id')
-        )
-
-    def get_queryset(self):
-        return self.get_review().comments.all()
+        return self.get_parent()
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, review=self.get_review())
+        retry_on_lock(serializer.save)(
+            author=self.request.user, review=self.get_review()
+        )
 
 
-class UserViewSet(ModelViewSet):
+class LeaderboardViewSet(TimedViewMixin, CachedResponseMixin,
+                         GenericViewSet):
+    """
+    Лучшие произведения категорий и жанров по взвешенному рейтингу
+    из материализованных таблиц лидеров: ответ читает SIZE строк
+    каждой таблицы одним запросом по индексу, без агрегирования отзывов.
+    Эндпоинт: /api/v1/leaderboards/?category=<slug>&genre=<slug>
+    """
+
+    cache_models = (LeaderboardEntry, Title, Category, Genre)
+    boards = (
+        ('categories', 'category', LeaderboardKind.CATEGORY, Category),
+        ('genres', 'genre', LeaderboardKind.GENRE, Genre),
+    )
+    title_fields = ('id', 'name', 'year', 'rating')
+
+    def list(self, request, *args, **kwargs):
+        # Очередь изменений разбирает фоновый поток: ответ не ждёт
+        # его и отдаёт сохранённые строки таблиц.
+        return self.cached_response(self.build_leaderboards, request)
+
+    def build_leaderboards(self, request):
+        size = get_settings('LEADERBOARDS', LEADERBOARD_DEFAULTS)['SIZE']
+        params = request.query_params
+        selected = any(params.get(param) for _, param, _, _ in self.boards)
+        groups = {}
+        entries = LeaderboardEntry.objects.none()
+        for key, param, kind, model in self.boards:
+            groups[kind] = {
+                pk: item for pk, item in get_slug_dictionary(model).items()
+                if not selected or item['slug'] == params.get(param)
+            }
+            entries |= LeaderboardEntry.objects.filter(
+                kind=kind, group_id__in=groups[kind]
+            )
+        titles = defaultdict(list)
+        for kind, group_id, *values in entries.order_by(
+            'kind', 'group_id', '-weighted_rating', '-title_id'
+        ).values_list('kind', 'group_id', *(
+            f'title__{field}' for field in self.title_fields
+        )):
+            board = titles[kind, group_id]
+            if len(board) < size:
+                board.append(dict(zip(self.title_fields, values)))
+        return Response({
+            key: [
+                {**item, 'titles': titles[kind, pk]}
+                for pk, item in groups[kind].items() if titles[kind, pk]
+            ]
+            for key, _, kind, _ in self.boards
+        })
+
+
+class UserViewSet(TimedViewMixin, RetryOnLockMixin, ModelViewSet):
     queryset = User.objects.all().order_by('username')
     serializer_class = UserSerializer
+    cursor_ordering = ('username',)
     permission_classes = [IsAuthenticated]
-    filter_backends = [SearchFilter]
-    search_fields = ['username']
+    filter_backends = [CasefoldSearchFilter]
+    search_fields = ['username_search']
     lookup_field = 'username'
     http_method_names = ['get', 'post', 'delete', 'patch']
 
@@ -175,7 +457,7 @@ class UserViewSet(ModelViewSet):
         permission_classes=[IsAuthenticated]
     )
     def me(self, request):
-        user = request.user
+        user = load_user(request.user)
         serializer = self.get_serializer(user)
 
         if request.method != 'GET':
@@ -195,15 +477,76 @@ class UserViewSet(ModelViewSet):
             serializer.save()
         return Response(serializer.data)
 
+    @action(
+        detail=False,
+        url_path='me/reviews',
+        permission_classes=[IsAuthenticated],
+        pagination_class=KeysetPagination,
+        cursor_ordering=FEED_ORDERING
+    )
+    def me_reviews(self, request):
+        return self.list_history(
+            Review.objects.select_related('author', 'title').filter(
+                author_id=request.user.id
+            ),
+            ReviewFeedSerializer, ReviewFeedValuesSerializer
+        )
+
+    @action(
+        detail=False,
+        url_path='me/comments',
+        permission_classes=[IsAuthenticated],
+        pagination_class=KeysetPagination,
+        cursor_ordering=FEED_ORDERING
+    )
+    def me_comments(self, request):
+        return self.list_history(
+            Comment.objects.select_related(
+                'author', 'review__title'
+            ).filter(author_id=request.user.id),
+            CommentFeedSerializer, CommentFeedValuesSerializer
+        )
 
-class SignUpViewSet(GenericAPIView):
+    @action(
+        detail=True,
+        permission_classes=[IsAdminByRole],
+        pagination_class=KeysetPagination,
+        cursor_ordering=FEED_ORDERING
+    )
+    def reviews(self, request, username=None):
+        author = get_object_or_404(User.objects.only('id'), username=username)
+        return self.list_history(
+            Review.objects.select_related('author', 'title').filter(
+                author=author
+            ),
+            ReviewFeedSerializer, ReviewFeedValuesSerializer
+        )
+
+    def list_history(self, queryset, serializer_class,
+                     values_serializer_class):
+        """
+        Отзывы или комментарии автора от новых к старым курсорными
+        страницами по индексу (author, -pub_date, -id); название
+        произведения присоединяется к строкам тем же запросом.
+        """
+        if get_settings('FAST_LIST', FAST_LIST_DEFAULTS)['ENABLED']:
+            serializer = values_serializer_class()
+            page = self.paginate_queryset(serializer.get_rows(queryset))
+            return self.get_paginated_response(serializer.serialize(page))
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(
+            serializer_class(page, many=True).data
+        )
+
+
+class SignUpViewSet(TimedViewMixin, GenericAPIView):
     queryset = User.objects.all().order_by('username')
     serializer_class = SignUpSerializer
 
     def post(self, request):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user = serializer.save()
+        user = retry_on_lock(serializer.save)()
         confirmation_code = default_token_generator.make_token(user)
         send_confirmation_code(
             email=user.email,
@@ -212,10 +555,11 @@ class SignUpViewSet(GenericAPIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class TokenObtainView(APIView):
+class TokenObtainView(TimedViewMixin, APIView):
     permission_classes = (AllowAny,)
 
     def post(self, request, *args, **kwargs):
         serializer = TokenObtainSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        token = RoleAccessToken.for_user(serializer.validated_data['user'])
+        return Response({'token': str(token)}, status=status.HTTP_200_OK)
@@ -31,6 +31,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.ServerTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -71,6 +72,118 @@ DATABASES = {
     }
 }
 
+# PRAGMA, применяемые к каждому новому соединению SQLite
+# (см. reviews.sqlite.configure_sqlite).
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -64000,
+    'mmap_size': 268435456,
+    'temp_store': 'MEMORY',
+    'busy_timeout': 5000,
+}
+
+# Повтор записи при ошибке «database is locked».
+SQLITE_LOCK_RETRY = {
+    'ATTEMPTS': 5,
+    'BASE_DELAY': 0.05,
+    'MAX_DELAY': 1.0,
+}
+
+
+# Cache
+
+# Версии моделей и журнал изменений в кэше 'api' должны быть общими
+# для всех процессов сервера: при нескольких процессах (gunicorn
+# --workers) задайте адрес memcached, например 127.0.0.1:11211,
+# в переменной окружения API_CACHE_LOCATION.
+API_CACHE_LOCATION = os.getenv('API_CACHE_LOCATION')
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'api': {
+        'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+        'LOCATION': API_CACHE_LOCATION,
+        'TIMEOUT': 300,
+    } if API_CACHE_LOCATION else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'api-responses',
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+            'CULL_FREQUENCY': 3,
+        },
+    },
+}
+
+API_RESPONSE_CACHE = {
+    'ENABLED': True,
+    'ALIAS': 'api',
+    'TIMEOUT': 300,
+    # Кэш в памяти процесса допустим только для сервера разработки,
+    # который работает в одном процессе; иначе запуск прерывается.
+    'SINGLE_PROCESS': DEBUG,
+}
+
+# Колоночный индекс произведений для GET /api/v1/titles/
+# (api.title_index). Требует установленного numpy.
+TITLE_INDEX = {
+    'ENABLED': False,
+}
+
+# Списки произведений, отзывов и комментариев сериализуются
+# по строкам values() без экземпляров моделей (api.fast_list).
+FAST_LIST = {
+    'ENABLED': True,
+}
+
+# Материализованные таблицы лидеров категорий и жанров
+# (reviews.leaderboards): SIZE мест в ответе, SLACK запасных,
+# изменения применяет фоновый поток через BATCH_WAIT секунд.
+LEADERBOARDS = {
+    'SIZE': 10,
+    'SLACK': 10,
+    'WORKER': True,
+    'BATCH_WAIT': 0.5,
+}
+
+
+# Request timing
+
+# Заголовок Server-Timing и лог фаз каждого запроса (api.middleware)
+# раскрывают устройство запросов: включаются только для профилирования.
+SERVER_TIMING = {
+    'ENABLED': False,
+    'SLOW_QUERY_MS': 100,
+    'SLOW_QUERY_LIMIT': 3,
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'api.timing': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+        'api.mail': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+        },
+        'reviews.leaderboards': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+        },
+    },
+}
+
 
 # Password validation
 
@@ -114,9 +227,9 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.AllowAny",
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.PrincipalJWTAuthentication',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.CursorOrPageNumberPagination',
     'PAGE_SIZE': 5,
 }
 
@@ -125,6 +238,14 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
+# Состояние пользователя (активность и роль) для проверки токенов
+# кэшируется на STATE_TTL секунд вместо запроса к базе на каждый запрос.
+# Кэш общий с API_RESPONSE_CACHE, чтобы блокировка и смена роли
+# действовали во всех процессах сервера.
+JWT_PRINCIPAL = {
+    'STATE_TTL': 30,
+}
+
 AUTH_USER_MODEL = 'reviews.User'
 
 EMAIL_BACKEND = "django.core.mail.backends.filebased.EmailBackend"
@@ -132,3 +253,17 @@ EMAIL_BACKEND = "django.core.mail.backends.filebased.EmailBackend"
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, "sent_emails")
 
 DEFAULT_FROM_EMAIL = "admin@yamdb.com"
+
+# Письма с кодом подтверждения отправляются фоновыми потоками пачками
+# через одно соединение; при ENABLED = False — сразу в запросе.
+EMAIL_QUEUE = {
+    'ENABLED': True,
+    'WORKERS': 2,
+    'MAX_SIZE': 10000,
+    'BATCH_SIZE': 50,
+    'BATCH_WAIT': 0.05,
+    'IDLE_TIMEOUT': 5,
+    'MAX_ATTEMPTS': 5,
+    'BASE_DELAY': 1.0,
+    'MAX_DELAY': 60.0,
+}
@@ -1,9 +1,20 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
+from .fields import normalize_search
+from .fulltext import review_fulltext
 from .models import Title, Category, Genre, GenreTitle, Review, User
 
 
+class CasefoldSearchMixin:
+    """Поиск по теневым колонкам SearchField без учёта регистра."""
+
+    def get_search_results(self, request, queryset, search_term):
+        return super().get_search_results(
+            request, queryset, normalize_search(search_term)
+        )
+
+
 class GenreTitleInline(admin.TabularInline):
     model = GenreTitle
     extra = 1
@@ -15,25 +26,25 @@ class ReviewInline(admin.TabularInline):
 
 
 @admin.register(Title)
-class TitleAdmin(admin.ModelAdmin):
+class TitleAdmin(CasefoldSearchMixin, admin.ModelAdmin):
     list_display = ('id', 'name', 'year', 'category')
-    search_fields = ('name',)
+    search_fields = ('name_search',)
     list_filter = ('year', 'category')
     inlines = [GenreTitleInline, ReviewInline]
     filter_horizontal = ('genres',)
 
 
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(CasefoldSearchMixin, admin.ModelAdmin):
     list_display = ('id', 'name', 'slug')
-    search_fields = ('name',)
+    search_fields = ('name_search',)
     prepopulated_fields = {'slug': ('name',)}
 
 
 @admin.register(Genre)
-class GenreAdmin(admin.ModelAdmin):
+class GenreAdmin(CasefoldSearchMixin, admin.ModelAdmin):
     list_display = ('id', 'name', 'slug')
-    search_fields = ('name',)
+    search_fields = ('name_search',)
     prepopulated_fields = {'slug': ('name',)}
 
 
@@ -43,6 +54,12 @@ class ReviewAdmin(admin.ModelAdmin):
     list_filter = ('score',)
     search_fields = ('text',)
 
+    def get_search_results(self, request, queryset, search_term):
+        """Поиск по тексту отзыва через полнотекстовый индекс."""
+        if not search_term:
+            return queryset, False
+        return review_fulltext.filter(queryset, search_term), False
+
 
 @admin.register(GenreTitle)
 class GenreTitleAdmin(admin.ModelAdmin):
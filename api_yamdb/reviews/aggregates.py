@@ -0,0 +1,174 @@
+from django.db import connection, transaction
+from django.db.models import (
+    Case,
+    Count,
+    ExpressionWrapper,
+    F,
+    FloatField,
+    IntegerField,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When
+)
+from django.db.models.functions import Coalesce
+
+from reviews.models import (
+    SCORE_COUNT_FIELDS,
+    SCORE_RANGE,
+    RatingPrior,
+    Review,
+    Title,
+    score_count_field
+)
+
+
+def get_rating_prior():
+    """
+    Возвращает пару (средняя оценка, вес) взвешенного рейтинга;
+    до первого пересчёта — значения по умолчанию RatingPrior.
+    """
+    prior = RatingPrior.objects.first() or RatingPrior()
+    return prior.mean, prior.weight
+
+
+def get_prior_expressions():
+    """
+    Средняя оценка и вес подзапросами к RatingPrior: запись
+    оценок не читает их отдельным запросом и не кэширует.
+    """
+    priors = RatingPrior.objects.order_by('pk')
+    defaults = RatingPrior()
+    return tuple(
+        Coalesce(
+            Subquery(priors.values(name)[:1]),
+            Value(getattr(defaults, name)),
+            output_field=RatingPrior._meta.get_field(name)
+        )
+        for name in ('mean', 'weight')
+    )
+
+
+def weighted_rating(score_sum, score_count, prior=None):
+    """
+    Байесовский рейтинг: средняя оценка произведения, к оценкам
+    которого добавлено weight оценок, равных средней по всем отзывам.
+    Аргументы могут быть числами или выражениями ORM; без prior
+    средняя и вес берутся подзапросами.
+    """
+    mean, weight = prior or get_prior_expressions()
+    value = (score_sum + mean * weight) / (score_count + weight)
+    if isinstance(value, float):
+        return value
+    return ExpressionWrapper(value, output_field=FloatField())
+
+
+def apply_score_change(title_id, added=None, removed=None):
+    """
+    Атомарно учитывает добавленную оценку added и снятую removed:
+    сумму и количество оценок, сохранённый и взвешенный рейтинги
+    и счётчики гистограммы изменяются одним UPDATE-запросом.
+    """
+    if title_id is None or added == removed:
+        return
+    score_delta = (added or 0) - (removed or 0)
+    count_delta = (added is not None) - (removed is not None)
+    histogram = {}
+    if added is not None:
+        field = score_count_field(added)
+        histogram[field] = F(field) + 1
+    if removed is not None:
+        field = score_count_field(removed)
+        histogram[field] = F(field) - 1
+    Title.objects.filter(pk=title_id).update(
+        score_sum=F('score_sum') + score_delta,
+        score_count=F('score_count') + count_delta,
+        rating=Case(
+            When(score_count__lte=-count_delta, then=Value(None)),
+            default=(
+                (F('score_sum') + score_delta)
+                / (F('score_count') + count_delta)
+            ),
+            output_field=IntegerField()
+        ),
+        weighted_rating=weighted_rating(
+            F('score_sum') + score_delta, F('score_count') + count_delta
+        ),
+        **histogram
+    )
+
+
+def rebuild_title_ratings(queryset=None):
+    """
+    Пересчитывает сумму, количество оценок, рейтинги и гистограмму
+    по таблице отзывов. Используется для восстановления данных
+    после массовых операций.
+
+    Отзывы читаются за один проход: GROUP BY по произведению
+    с условным подсчётом каждой оценки. Строки записываются
+    одним executemany: bulk_update строит CASE на каждое поле,
+    и на тысячах произведений он в десятки раз медленнее.
+    Возвращает количество произведений, у которых есть оценки.
+    """
+    reviews = Review.objects.order_by()
+    if queryset is None:
+        queryset = Title.objects.all()
+    else:
+        reviews = reviews.filter(title__in=queryset.values('pk'))
+    columns = ('score_sum', 'score_count', *SCORE_COUNT_FIELDS)
+    rows = reviews.filter(title__isnull=False).values('title_id').annotate(
+        score_sum=Sum('score'),
+        score_count=Count('id'),
+        **{
+            score_count_field(score): Count('id', filter=Q(score=score))
+            for score in SCORE_RANGE
+        }
+    ).values_list('title_id', *columns)
+    quote = connection.ops.quote_name
+    sql = 'UPDATE {} SET {} WHERE {} = %s'.format(
+        quote(Title._meta.db_table),
+        ', '.join(f'{quote(column)} = %s' for column in (
+            *columns, 'rating', 'weighted_rating'
+        )),
+        quote(Title._meta.pk.column),
+    )
+    prior = get_rating_prior()
+    params = [
+        (
+            *counts, counts[0] // counts[1],
+            weighted_rating(*counts[:2], prior), title_id
+        )
+        for title_id, *counts in rows
+    ]
+    with transaction.atomic():
+        queryset.update(
+            rating=None, score_sum=0, score_count=0,
+            weighted_rating=weighted_rating(0, 0, prior),
+            **{field: 0 for field in SCORE_COUNT_FIELDS}
+        )
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, params)
+    return len(params)
+
+
+def recompute_rating_prior(weight=None):
+    """
+    Пересчитывает среднюю оценку по всем отзывам (по сохранённым
+    суммам произведений, без чтения отзывов) и взвешенный рейтинг
+    всех произведений одним UPDATE. weight меняет вес априорных оценок.
+    """
+    totals = Title.objects.aggregate(
+        score_sum=Sum('score_sum'), score_count=Sum('score_count')
+    )
+    prior = RatingPrior.objects.first() or RatingPrior()
+    if totals['score_count']:
+        prior.mean = totals['score_sum'] / totals['score_count']
+    if weight is not None:
+        prior.weight = weight
+    with transaction.atomic():
+        prior.save()
+        Title.objects.update(weighted_rating=weighted_rating(
+            F('score_sum'), F('score_count'), (prior.mean, prior.weight)
+        ))
+    return prior
@@ -0,0 +1,64 @@
+import unicodedata
+
+from django.db import models
+
+
+def normalize_search(value):
+    """
+    Приводит строку к виду для регистронезависимого сравнения:
+    NFKC-нормализация и casefold, которые, в отличие от LIKE
+    в SQLite, учитывают регистр не только латиницы.
+    """
+    return unicodedata.normalize('NFKC', value or '').casefold()
+
+
+class SearchField(models.CharField):
+    """
+    Теневая колонка с нормализованной копией поля source.
+
+    Значение вычисляется в pre_save, поэтому обновляется при save()
+    и bulk_create(); update() и bulk_update() его не пересчитывают.
+    Поиск по колонке использует индекс для exact и prefix.
+    """
+
+    def __init__(self, *args, source=None, **kwargs):
+        self.source = source
+        kwargs.setdefault('editable', False)
+        kwargs.setdefault('db_index', True)
+        kwargs.setdefault('default', '')
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['source'] = self.source
+        # Значения по умолчанию задаёт __init__, в миграциях они не нужны.
+        for option, value in (
+            ('editable', False), ('db_index', True), ('default', '')
+        ):
+            if option in kwargs and kwargs[option] == value:
+                del kwargs[option]
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        value = normalize_search(getattr(model_instance, self.source))
+        setattr(model_instance, self.attname, value)
+        return value
+
+
+@SearchField.register_lookup
+class Prefix(models.Lookup):
+    """
+    Поиск по началу строки диапазоном значений:
+    в отличие от LIKE 'x%', такое условие использует индекс.
+    """
+
+    lookup_name = 'prefix'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return (
+            f'({lhs} >= {rhs} AND {lhs} < {rhs} || %s)',
+            lhs_params + rhs_params + lhs_params + rhs_params
+            + [chr(0x10FFFF)]
+        )
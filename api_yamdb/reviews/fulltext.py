@@ -0,0 +1,215 @@
+import logging
+import re
+from functools import reduce
+from operator import and_, or_
+
+from django.db import OperationalError, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+
+from reviews.models import Review, Title
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r'\w+')
+MAX_TOKENS = 16
+
+
+def build_match(text):
+    """
+    Строит выражение MATCH для FTS5 из пользовательской строки.
+
+    Все слова должны встретиться в документе; последнее слово
+    ищется по началу, как при наборе запроса. Префиксными делается
+    только оно: префиксный терм FTS5 читает списки документов
+    целиком, а точный — с пропусками по индексу.
+    Операторы FTS5 и кавычки из строки не попадают в запрос.
+    Возвращает None, если слов нет.
+    """
+    tokens = TOKEN_RE.findall(text or '')[:MAX_TOKENS]
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"' for token in tokens) + '*'
+
+
+class FullTextIndex:
+    """
+    Полнотекстовый индекс FTS5 по текстовым полям модели.
+
+    Индекс хранится во внешней FTS5-таблице <таблица модели>_fts
+    с content=<таблица модели>, поэтому текст не дублируется.
+    Синхронизацию выполняют триггеры SQLite, которые срабатывают
+    и при записи в обход ORM (bulk_create, generate_dataset).
+
+    Пересоздание таблицы модели миграцией в SQLite удаляет её триггеры,
+    поэтому после каждой миграции ensure() восстанавливает недостающие
+    объекты и перестраивает индекс. В других СУБД и без FTS5
+    поиск выполняется через icontains.
+    """
+
+    tokenizer = 'unicode61 remove_diacritics 0'
+
+    def __init__(self, model, columns, weights=None):
+        self.model = model
+        self.columns = columns
+        self.weights = weights or (1.0,) * len(columns)
+        self.ready = {}
+
+    @property
+    def source(self):
+        return self.model._meta.db_table
+
+    @property
+    def table(self):
+        return f'{self.source}_fts'
+
+    def triggers(self):
+        columns = ', '.join(self.columns)
+        new = ', '.join(f'new.{column}' for column in self.columns)
+        old = ', '.join(f'old.{column}' for column in self.columns)
+        insert = (
+            f'INSERT INTO {self.table}(rowid, {columns}) '
+            f'VALUES (new.id, {new});'
+        )
+        delete = (
+            f'INSERT INTO {self.table}({self.table}, rowid, {columns}) '
+            f"VALUES ('delete', old.id, {old});"
+        )
+        return {
+            f'{self.table}_ai': (
+                f'CREATE TRIGGER {self.table}_ai AFTER INSERT '
+                f'ON {self.source} BEGIN {insert} END'
+            ),
+            f'{self.table}_ad': (
+                f'CREATE TRIGGER {self.table}_ad AFTER DELETE '
+                f'ON {self.source} BEGIN {delete} END'
+            ),
+            # Изменение других колонок (например, рейтинга)
+            # не переиндексирует документ.
+            f'{self.table}_au': (
+                f'CREATE TRIGGER {self.table}_au AFTER UPDATE OF {columns} '
+                f'ON {self.source} BEGIN {delete} {insert} END'
+            ),
+        }
+
+    def ensure(self, connection):
+        """
+        Создаёт FTS5-таблицу и триггеры, если их нет, и перестраивает
+        индекс после их создания. Возвращает True, если индекс доступен.
+        """
+        if connection.vendor != 'sqlite':
+            return False
+        triggers = self.triggers()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE name IN (%s)"
+                % ', '.join(['%s'] * (len(triggers) + 1)),
+                [self.table, *triggers]
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            if existing != {self.table, *triggers}:
+                try:
+                    if self.table not in existing:
+                        cursor.execute(
+                            f'CREATE VIRTUAL TABLE {self.table} USING fts5('
+                            f'{", ".join(self.columns)}, '
+                            f"content='{self.source}', content_rowid='id', "
+                            f"tokenize='{self.tokenizer}', prefix='2 3')"
+                        )
+                except OperationalError as error:
+                    logger.warning(
+                        'Полнотекстовый поиск недоступен: %s', error
+                    )
+                    self.ready[connection.alias] = False
+                    return False
+                for name, sql in triggers.items():
+                    if name not in existing:
+                        cursor.execute(sql)
+                self.rebuild(connection)
+        self.ready[connection.alias] = True
+        return True
+
+    def rebuild(self, connection):
+        """Перестраивает индекс по текущему содержимому таблицы модели."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {self.table}({self.table}) VALUES ('rebuild')"
+            )
+
+    def available(self, queryset):
+        connection = connections[queryset.db]
+        if connection.alias not in self.ready:
+            if connection.vendor != 'sqlite':
+                self.ready[connection.alias] = False
+            else:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        'SELECT 1 FROM sqlite_master WHERE name = %s',
+                        [self.table]
+                    )
+                    self.ready[connection.alias] = (
+                        cursor.fetchone() is not None
+                    )
+        return self.ready[connection.alias]
+
+    def fallback(self, queryset, text):
+        return queryset.filter(reduce(and_, (
+            reduce(or_, (
+                Q(**{f'{column}__icontains': token})
+                for column in self.columns
+            ))
+            for token in TOKEN_RE.findall(text)[:MAX_TOKENS]
+        )))
+
+    def filter(self, queryset, text):
+        """
+        Оставляет в queryset объекты, подходящие под запрос,
+        не меняя порядок сортировки.
+        """
+        match = build_match(text)
+        if match is None:
+            return queryset.none()
+        if not self.available(queryset):
+            return self.fallback(queryset, text)
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s',
+            [match]
+        ))
+
+    def search(self, queryset, text):
+        """
+        Оставляет в queryset подходящие под запрос объекты
+        и сортирует их по релевантности (BM25 с весами колонок).
+        """
+        match = build_match(text)
+        if match is None:
+            return queryset.none()
+        if not self.available(queryset):
+            return self.fallback(queryset, text).order_by('pk')
+        weights = ', '.join(str(weight) for weight in self.weights)
+        return queryset.extra(
+            tables=[self.table],
+            where=[
+                f'{self.table}.rowid = {self.source}.id',
+                f'{self.table} MATCH %s',
+            ],
+            params=[match],
+            select={'search_rank': f'bm25({self.table}, {weights})'},
+            order_by=['search_rank', f'{self.source}.id'],
+        )
+
+
+title_fulltext = FullTextIndex(Title, ('name', 'description'), (10.0, 1.0))
+review_fulltext = FullTextIndex(Review, ('text',))
+FULLTEXT_INDEXES = (title_fulltext, review_fulltext)
+
+
+@receiver(post_migrate)
+def ensure_fulltext_indexes(sender, using='default', **kwargs):
+    """Восстанавливает полнотекстовые индексы после миграций."""
+    if sender.name != 'reviews':
+        return
+    for index in FULLTEXT_INDEXES:
+        index.ensure(connections[using])
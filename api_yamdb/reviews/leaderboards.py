@@ -0,0 +1,305 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from api.cache import bump_model_version
+from api.conf import get_settings
+from reviews.models import (
+    Category,
+    Genre,
+    GenreTitle,
+    LeaderboardEntry,
+    LeaderboardKind,
+    Title
+)
+from reviews.sqlite import retry_on_lock
+
+logger = logging.getLogger('reviews.leaderboards')
+
+
+LEADERBOARD_DEFAULTS = {
+    'SIZE': 10,
+    'SLACK': 10,
+    'WORKER': True,
+    'BATCH_WAIT': 0.5,
+}
+
+
+def get_capacity():
+    """
+    Сколько произведений хранится в таблице: SIZE показываемых
+    и SLACK запасных, которые занимают место выбывших без перестроения.
+    """
+    config = get_settings('LEADERBOARDS', LEADERBOARD_DEFAULTS)
+    return config['SIZE'] + config['SLACK']
+
+
+def get_group_titles(kind, group_id):
+    """Произведения с оценками из категории или жанра в порядке таблицы."""
+    titles = Title.objects.filter(score_count__gt=0)
+    if kind == LeaderboardKind.CATEGORY:
+        titles = titles.filter(category_id=group_id)
+    else:
+        titles = titles.filter(genres=group_id)
+    return titles.order_by('-weighted_rating', '-id')
+
+
+def refill_leaderboards(groups):
+    """Перестраивает таблицы groups — пар (kind, group_id) — по запросу."""
+    capacity = get_capacity()
+    if not groups:
+        return
+    LeaderboardEntry.objects.filter(get_groups_filter(groups)).delete()
+    LeaderboardEntry.objects.bulk_create(
+        LeaderboardEntry(
+            kind=kind, group_id=group_id,
+            title_id=title_id, weighted_rating=rating
+        )
+        for kind, group_id in groups
+        for title_id, rating in get_group_titles(
+            kind, group_id
+        ).values_list('id', 'weighted_rating')[:capacity]
+    )
+
+
+def get_groups_filter(groups):
+    by_kind = defaultdict(list)
+    for kind, group_id in groups:
+        by_kind[kind].append(group_id)
+    return reduce(or_, (
+        Q(kind=kind, group_id__in=group_ids)
+        for kind, group_ids in by_kind.items()
+    ))
+
+
+def rebuild_leaderboards():
+    """
+    Перестраивает все таблицы лидеров. Используется после
+    массовых операций и пересчёта взвешенного рейтинга.
+    """
+    groups = [
+        (LeaderboardKind.CATEGORY, pk)
+        for pk in Category.objects.values_list('pk', flat=True)
+    ] + [
+        (LeaderboardKind.GENRE, pk)
+        for pk in Genre.objects.values_list('pk', flat=True)
+    ]
+    with transaction.atomic():
+        LeaderboardEntry.objects.all().delete()
+        if groups:
+            refill_leaderboards(groups)
+    bump_model_version(LeaderboardEntry)
+    return len(groups)
+
+
+def load_titles(title_ids):
+    """
+    Возвращает рейтинги произведений и множества их групп —
+    пар (kind, group_id) категории и жанров.
+    """
+    titles = {
+        row['id']: row for row in Title.objects.filter(
+            pk__in=title_ids
+        ).values('id', 'category_id', 'score_count', 'weighted_rating')
+    }
+    memberships = defaultdict(set)
+    for title in titles.values():
+        if title['category_id'] is not None:
+            memberships[title['id']].add(
+                (LeaderboardKind.CATEGORY, title['category_id'])
+            )
+    for title_id, genre_id in GenreTitle.objects.filter(
+        title_id__in=titles, genre__isnull=False
+    ).values_list('title_id', 'genre_id'):
+        memberships[title_id].add((LeaderboardKind.GENRE, genre_id))
+    return titles, memberships
+
+
+def update_board(board, changes, capacity):
+    """
+    Учитывает в таблице board (title_id -> рейтинг) изменения changes:
+    title_id -> (рейтинг, id) или None, если произведения в группе нет.
+    """
+    for title_id in changes:
+        board.pop(title_id, None)
+    # Оставшиеся строки — точные первые места неизменившихся
+    # произведений: ниже последнего из них могут быть произведения
+    # вне таблицы.
+    cutoff = min(((rating, pk) for pk, rating in board.items()), default=None)
+    if cutoff is None:
+        return
+    for title_id, key in changes.items():
+        if key is not None and key > cutoff:
+            board[title_id] = key[0]
+    for rating, pk in sorted((
+        (rating, pk) for pk, rating in board.items()
+    ))[:max(len(board) - capacity, 0)]:
+        del board[pk]
+
+
+def save_boards(stored, boards):
+    """Записывает отличия boards от сохранённых строк stored."""
+    delete = []
+    create = []
+    for (kind, group_id), board in boards.items():
+        old = stored[kind, group_id]
+        delete.extend(
+            Q(kind=kind, group_id=group_id, title_id=pk)
+            for pk, rating in old.items() if board.get(pk) != rating
+        )
+        create.extend(
+            LeaderboardEntry(
+                kind=kind, group_id=group_id,
+                title_id=pk, weighted_rating=rating
+            )
+            for pk, rating in board.items() if old.get(pk) != rating
+        )
+    if delete:
+        LeaderboardEntry.objects.filter(reduce(or_, delete)).delete()
+    LeaderboardEntry.objects.bulk_create(create)
+
+
+def apply_leaderboard_updates(title_ids, refill=()):
+    """
+    Учитывает в таблицах лидеров изменившиеся произведения
+    и перестраивает таблицы групп refill.
+
+    Каждая таблица хранит точные первые k произведений своей
+    категории или жанра (k не больше SIZE + SLACK), поэтому
+    решение принимается по её строкам без сортировки группы:
+    - изменившиеся произведения убираются из таблицы, оставшиеся
+      строки — первые места неизменившихся произведений группы;
+    - изменившееся произведение выше последней оставшейся строки
+      возвращается в таблицу, лишние последние места выбывают;
+      ниже неё его могут обгонять произведения вне таблицы.
+    Кроме refill, запросом к своей группе перестраиваются
+    только таблицы, в которых осталось меньше SIZE строк.
+    """
+    titles, memberships = load_titles(title_ids)
+    groups = set(LeaderboardEntry.objects.filter(
+        title_id__in=title_ids
+    ).values_list('kind', 'group_id')).union(*memberships.values())
+    if not groups:
+        refill_leaderboards(list(refill))
+        return
+    stored = defaultdict(dict)
+    for kind, group_id, title_id, rating in LeaderboardEntry.objects.filter(
+        get_groups_filter(groups)
+    ).values_list('kind', 'group_id', 'title_id', 'weighted_rating'):
+        stored[kind, group_id][title_id] = rating
+    boards = {group: dict(stored[group]) for group in groups}
+
+    changes = defaultdict(dict)
+    for title_id in title_ids:
+        title = titles.get(title_id)
+        rated = title is not None and title['score_count'] > 0
+        for group in memberships[title_id] | {
+            group for group, board in stored.items() if title_id in board
+        }:
+            member = rated and group in memberships[title_id]
+            changes[group][title_id] = (
+                (title['weighted_rating'], title_id) if member else None
+            )
+    capacity = get_capacity()
+    for group, board in boards.items():
+        update_board(board, changes[group], capacity)
+    save_boards(stored, boards)
+    size = get_settings('LEADERBOARDS', LEADERBOARD_DEFAULTS)['SIZE']
+    refill_leaderboards(list(set(refill).union(
+        group for group, board in boards.items() if len(board) < size
+    )))
+
+
+class LeaderboardQueue:
+    """
+    Отложенное обновление таблиц лидеров.
+
+    Запись отзыва или произведения после фиксации транзакции только
+    добавляет id произведения (или группу для перестроения)
+    в множество ожидающих, не обращаясь к базе данных. Множество
+    разбирает фоновый поток через BATCH_WAIT после первого изменения —
+    повторные изменения одного произведения учитываются один раз.
+    Эндпоинт таблиц очередь не разбирает и отдаёт сохранённые строки.
+    При WORKER = False поток не запускается.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.apply_lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.pending = set()
+        self.pending_groups = set()
+        self.worker = None
+
+    def enqueue(self, title_ids=(), groups=()):
+        """
+        Ставит в очередь произведения и группы — пары (kind, group_id)
+        для перестроения — после фиксации транзакции.
+        """
+        title_ids = {pk for pk in title_ids if pk is not None}
+        groups = set(groups)
+        if title_ids or groups:
+            transaction.on_commit(lambda: self.add(title_ids, groups))
+
+    def add(self, title_ids, groups=()):
+        with self.lock:
+            self.pending.update(title_ids)
+            self.pending_groups.update(groups)
+        if get_settings('LEADERBOARDS', LEADERBOARD_DEFAULTS)['WORKER']:
+            self.start()
+            self.wakeup.set()
+
+    def start(self):
+        with self.lock:
+            if self.worker is None:
+                self.worker = threading.Thread(
+                    target=self.work, name='leaderboards', daemon=True
+                )
+                self.worker.start()
+
+    def take(self):
+        with self.lock:
+            title_ids, self.pending = self.pending, set()
+            groups, self.pending_groups = self.pending_groups, set()
+        return title_ids, groups
+
+    def process(self):
+        """
+        Применяет ожидающие изменения в текущем потоке.
+        Возвращает число учтённых произведений и групп.
+        """
+        with self.apply_lock:
+            title_ids, groups = self.take()
+            if not title_ids and not groups:
+                return 0
+            try:
+                retry_on_lock(apply_leaderboard_updates)(title_ids, groups)
+            except Exception:
+                with self.lock:
+                    self.pending.update(title_ids)
+                    self.pending_groups.update(groups)
+                raise
+        bump_model_version(LeaderboardEntry)
+        return len(title_ids) + len(groups)
+
+    def work(self):
+        while True:
+            self.wakeup.wait()
+            config = get_settings('LEADERBOARDS', LEADERBOARD_DEFAULTS)
+            time.sleep(config['BATCH_WAIT'])
+            self.wakeup.clear()
+            try:
+                self.process()
+            except Exception:
+                logger.exception('Не удалось обновить таблицы лидеров')
+            finally:
+                connection.close()
+
+
+leaderboard_queue = LeaderboardQueue()
@@ -0,0 +1,354 @@
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate, islice
+
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+
+from api.cache import bump_model_version
+from api.constants import REVIEW_SCORE_MAX, REVIEW_SCORE_MIN
+from reviews.aggregates import rebuild_title_ratings, recompute_rating_prior
+from reviews.fields import SearchField, normalize_search
+from reviews.leaderboards import rebuild_leaderboards
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    GenreTitle,
+    LeaderboardEntry,
+    Review,
+    Role,
+    Title,
+    User
+)
+
+EPOCH = datetime(2015, 1, 1, tzinfo=timezone.utc)
+PERIOD_SECONDS = 10 * 365 * 24 * 60 * 60
+UNUSABLE_PASSWORD = UNUSABLE_PASSWORD_PREFIX + 'generated'
+# Частоты оценок: большинство отзывов положительные, пик на 7–8.
+SCORE_WEIGHTS = (2, 1, 2, 3, 5, 8, 14, 17, 13, 9)
+# Таблицы, которые --clear очищает целиком; из пользователей
+# удаляются только созданные командой (generated_users).
+CONTENT_MODELS = (
+    Category, Genre, Title, GenreTitle, Review, Comment, LeaderboardEntry
+)
+GENERATED_MODELS = (User, *CONTENT_MODELS)
+
+
+def generated_users():
+    """Пользователи, созданные командой: user<N> с адресом @yamdb.fake."""
+    return User.objects.filter(
+        username__regex=r'^user[0-9]+$', email__endswith='@yamdb.fake'
+    )
+
+
+def zipf_weights(count, exponent):
+    """Веса распределения Ципфа для count элементов."""
+    return [1 / (rank ** exponent) for rank in range(1, count + 1)]
+
+
+def cumulative(weights):
+    """Накопленные веса: random.choices не пересчитывает их на каждый вызов."""
+    return list(accumulate(weights))
+
+
+def allocate(total, weights, cap):
+    """
+    Распределяет total единиц пропорционально весам так,
+    чтобы ни один элемент не получил больше cap.
+    """
+    weight_sum = sum(weights)
+    counts = [min(cap, int(total * weight / weight_sum))
+              for weight in weights]
+    remainder = total - sum(counts)
+    while remainder > 0:
+        progress = False
+        for index in range(len(counts)):
+            if remainder == 0:
+                break
+            if counts[index] < cap:
+                counts[index] += 1
+                remainder -= 1
+                progress = True
+        if not progress:
+            raise CommandError(
+                'Нельзя создать столько отзывов: на каждое произведение '
+                'пользователь может оставить только один отзыв.'
+            )
+    return counts
+
+
+class Command(BaseCommand):
+    help = (
+        'Генерирует воспроизводимый синтетический набор данных '
+        'для нагрузочного тестирования.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=5)
+        parser.add_argument('--genres', type=int, default=30)
+        parser.add_argument('--titles', type=int, default=10000)
+        parser.add_argument('--reviews', type=int, default=100000)
+        parser.add_argument('--comments', type=int, default=100000)
+        parser.add_argument(
+            '--seed', type=int, default=42,
+            help='Начальное значение генератора случайных чисел.'
+        )
+        parser.add_argument('--batch-size', type=int, default=10000)
+        parser.add_argument(
+            '--clear', action='store_true',
+            help='Удалить произведения, отзывы, комментарии, словари '
+                 'и созданных командой пользователей перед генерацией. '
+                 'Остальные пользователи (администраторы) сохраняются.'
+        )
+
+    def handle(self, *args, **options):
+        for name in ('users', 'categories', 'genres', 'titles'):
+            if options[name] < 1:
+                raise CommandError(f'--{name} должен быть положительным.')
+        self.options = options
+        self.batch_size = options['batch_size']
+        self.date_value = connection.ops.adapt_datetimefield_value
+
+        with transaction.atomic():
+            if options['clear']:
+                self.clear()
+            elif generated_users().exists() or any(
+                model.objects.exists() for model in CONTENT_MODELS
+            ):
+                raise CommandError(
+                    'База данных не пуста. Используйте --clear.'
+                )
+            # Сохранённые пользователи занимают младшие id.
+            self.user_offset = User.objects.aggregate(
+                last=Max('pk')
+            )['last'] or 0
+            rng = random.Random(options['seed'])
+            self.generate_users(rng)
+            self.generate_dictionary(Category, options['categories'])
+            self.generate_dictionary(Genre, options['genres'])
+            self.generate_titles(rng)
+            review_count = self.generate_reviews(rng)
+            self.generate_comments(rng, review_count)
+            self.reset_sequences()
+            rebuild_title_ratings()
+            recompute_rating_prior()
+            rebuild_leaderboards()
+        for model in GENERATED_MODELS:
+            bump_model_version(model)
+        self.stdout.write(self.style.SUCCESS('Набор данных сгенерирован.'))
+
+    def clear(self):
+        """
+        Удаляет данные прямыми DELETE без сигналов и каскадов ORM:
+        зависимые таблицы очищаются целиком раньше своих родителей,
+        рейтинги, таблицы лидеров и версии кэша пересчитываются
+        после генерации. Из пользователей удаляются только
+        созданные командой: их отзывы и комментарии к этому
+        моменту уже удалены.
+        """
+        quote = connection.ops.quote_name
+        users, params = generated_users().values('pk').query.sql_with_params()
+        with connection.cursor() as cursor:
+            for model in reversed(CONTENT_MODELS):
+                cursor.execute(f'DELETE FROM {quote(model._meta.db_table)}')
+            cursor.execute(
+                f'DELETE FROM {quote(User._meta.db_table)} '
+                f'WHERE {quote(User._meta.pk.column)} IN ({users})',
+                params
+            )
+
+    def insert(self, model, columns, rows):
+        """
+        Вставляет строки пакетами через executemany в обход ORM:
+        это самый быстрый путь записи, сигналы при этом не отправляются.
+        Теневые колонки SearchField вычисляются из своих полей,
+        остальные поля, не перечисленные в columns, получают значения
+        по умолчанию.
+        """
+        quote = connection.ops.quote_name
+        fields = [model._meta.get_field(column) for column in columns]
+        search_fields = [
+            field for field in model._meta.concrete_fields
+            if isinstance(field, SearchField) and field.source in columns
+        ]
+        sources = [columns.index(field.source) for field in search_fields]
+        defaults = [
+            field for field in model._meta.concrete_fields
+            if field not in fields + search_fields
+            and (field.has_default() or field.null)
+        ]
+        default_values = tuple(field.get_default() for field in defaults)
+        inserted = fields + search_fields + defaults
+        sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            quote(model._meta.db_table),
+            ', '.join(quote(field.column) for field in inserted),
+            ', '.join(['%s'] * len(inserted))
+        )
+        rows = (
+            row
+            + tuple(normalize_search(row[index]) for index in sources)
+            + default_values
+            for row in rows
+        )
+        start = time.perf_counter()
+        total = 0
+        with connection.cursor() as cursor:
+            while True:
+                batch = list(islice(rows, self.batch_size))
+                if not batch:
+                    break
+                cursor.executemany(sql, batch)
+                total += len(batch)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f'{model._meta.db_table}: {total} строк за {elapsed:.2f} с '
+            f'({total / elapsed if elapsed else total:.0f} строк/с)'
+        )
+        return total
+
+    def random_date(self, rng):
+        return self.date_value(
+            EPOCH + timedelta(seconds=rng.randrange(PERIOD_SECONDS))
+        )
+
+    def generate_users(self, rng):
+        joined = self.date_value(EPOCH)
+        roles = (Role.USER, Role.MODERATOR, Role.ADMIN)
+        role_weights = cumulative((97, 2, 1))
+
+        def rows():
+            for pk in range(
+                self.user_offset + 1,
+                self.user_offset + self.options['users'] + 1
+            ):
+                role = rng.choices(roles, cum_weights=role_weights)[0]
+                yield (
+                    pk, f'user{pk}', f'user{pk}@yamdb.fake', role, '',
+                    '', '', UNUSABLE_PASSWORD, False, False, True, joined
+                )
+
+        self.insert(User, (
+            'id', 'username', 'email', 'role', 'bio', 'first_name',
+            'last_name', 'password', 'is_superuser', 'is_staff',
+            'is_active', 'date_joined'
+        ), rows())
+
+    def generate_dictionary(self, model, count):
+        prefix = model._meta.model_name
+        self.insert(model, ('id', 'name', 'slug'), (
+            (pk, f'{model._meta.verbose_name} {pk}', f'{prefix}-{pk}')
+            for pk in range(1, count + 1)
+        ))
+
+    def generate_titles(self, rng):
+        options = self.options
+        category_weights = cumulative(
+            zipf_weights(options['categories'], 1.0)
+        )
+        category_ids = range(1, options['categories'] + 1)
+        genre_weights = cumulative(zipf_weights(options['genres'], 0.8))
+        genre_ids = range(1, options['genres'] + 1)
+        links = []
+
+        def rows():
+            for pk in range(1, options['titles'] + 1):
+                genres = set(rng.choices(
+                    genre_ids, cum_weights=genre_weights,
+                    k=rng.randint(1, 3)
+                ))
+                links.extend((pk, genre) for genre in sorted(genres))
+                yield (
+                    pk,
+                    f'Произведение {pk}',
+                    rng.randint(1900, EPOCH.year + 10),
+                    f'Описание произведения {pk}. ' * rng.randint(1, 20),
+                    rng.choices(
+                        category_ids, cum_weights=category_weights
+                    )[0],
+                )
+
+        self.insert(Title, (
+            'id', 'name', 'year', 'description', 'category'
+        ), rows())
+        self.insert(GenreTitle, ('id', 'title', 'genre'), (
+            (pk, title, genre)
+            for pk, (title, genre) in enumerate(links, 1)
+        ))
+
+    def pick_authors(self, rng, count):
+        """
+        Выбирает count разных авторов для одного произведения.
+        Активность пользователей смещена к меньшим id.
+        """
+        users = self.options['users']
+        first = self.user_offset + 1
+        if count * 2 > users:
+            start = rng.randrange(users)
+            return [
+                (start + offset) % users + first for offset in range(count)
+            ]
+        authors = set()
+        while len(authors) < count:
+            authors.add(int(users * rng.random() ** 2) + first)
+        return sorted(authors)
+
+    def generate_reviews(self, rng):
+        options = self.options
+        titles = list(range(1, options['titles'] + 1))
+        rng.shuffle(titles)
+        counts = allocate(
+            options['reviews'],
+            zipf_weights(len(titles), 0.9),
+            options['users']
+        )
+        scores = range(REVIEW_SCORE_MIN, REVIEW_SCORE_MAX + 1)
+        score_weights = cumulative(SCORE_WEIGHTS)
+
+        def rows():
+            pk = 0
+            for title, count in zip(titles, counts):
+                for author in self.pick_authors(rng, count):
+                    pk += 1
+                    yield (
+                        pk, title, author,
+                        rng.choices(scores, cum_weights=score_weights)[0],
+                        f'Отзыв {pk}. ' * rng.randint(1, 50),
+                        self.random_date(rng),
+                    )
+
+        return self.insert(Review, (
+            'id', 'title', 'author', 'score', 'text', 'pub_date'
+        ), rows())
+
+    def generate_comments(self, rng, review_count):
+        if not review_count:
+            return
+        users = self.options['users']
+
+        def rows():
+            for pk in range(1, self.options['comments'] + 1):
+                yield (
+                    pk,
+                    int(review_count * rng.random() ** 3) + 1,
+                    self.user_offset + rng.randint(1, users),
+                    f'Комментарий {pk}.',
+                    self.random_date(rng),
+                )
+
+        self.insert(Comment, (
+            'id', 'review', 'author', 'text', 'pub_date'
+        ), rows())
+
+    def reset_sequences(self):
+        statements = connection.ops.sequence_reset_sql(
+            no_style(), GENERATED_MODELS
+        )
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
@@ -0,0 +1,191 @@
+import csv
+import time
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import IntegrityError, connection, transaction
+
+from api.cache import bump_model_version
+from reviews.aggregates import rebuild_title_ratings, recompute_rating_prior
+from reviews.leaderboards import rebuild_leaderboards
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    GenreTitle,
+    Review,
+    Title,
+    User
+)
+
+DATA_DIR = settings.BASE_DIR / 'static' / 'data'
+
+
+def build_user(row):
+    return User(
+        id=row['id'],
+        username=row['username'],
+        email=row['email'],
+        role=row['role'],
+        bio=row['bio'],
+        first_name=row['first_name'],
+        last_name=row['last_name'],
+        password=make_password(None),
+    )
+
+
+def build_category(row):
+    return Category(id=row['id'], name=row['name'], slug=row['slug'])
+
+
+def build_genre(row):
+    return Genre(id=row['id'], name=row['name'], slug=row['slug'])
+
+
+def build_title(row):
+    return Title(
+        id=row['id'],
+        name=row['name'],
+        year=row['year'],
+        category_id=row['category'] or None,
+    )
+
+
+def build_genre_title(row):
+    return GenreTitle(
+        id=row['id'], title_id=row['title_id'], genre_id=row['genre_id']
+    )
+
+
+def build_review(row):
+    return Review(
+        id=row['id'],
+        title_id=row['title_id'],
+        text=row['text'],
+        author_id=row['author'],
+        score=row['score'],
+        pub_date=row['pub_date'],
+    )
+
+
+def build_comment(row):
+    return Comment(
+        id=row['id'],
+        review_id=row['review_id'],
+        text=row['text'],
+        author_id=row['author'],
+        pub_date=row['pub_date'],
+    )
+
+
+# Порядок загрузки учитывает внешние ключи между таблицами.
+IMPORT_ORDER = (
+    ('users.csv', User, build_user),
+    ('category.csv', Category, build_category),
+    ('genre.csv', Genre, build_genre),
+    ('titles.csv', Title, build_title),
+    ('genre_title.csv', GenreTitle, build_genre_title),
+    ('review.csv', Review, build_review),
+    ('comments.csv', Comment, build_comment),
+)
+
+
+@contextmanager
+def keep_pub_date(*models):
+    """
+    Отключает auto_now_add у поля pub_date, чтобы bulk_create
+    сохранил даты публикации из файла, а не текущее время.
+    """
+    fields = [model._meta.get_field('pub_date') for model in models]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает данные из CSV-файлов static/data в базу данных '
+        'пакетными вставками.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default=DATA_DIR,
+            help='Папка с CSV-файлами.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Количество строк в одной пакетной вставке.'
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size должен быть положительным.')
+        for filename, _, _ in IMPORT_ORDER:
+            if not (path / filename).exists():
+                raise CommandError(f'Файл {filename} не найден в {path}.')
+
+        imported = []
+        with keep_pub_date(Review, Comment):
+            for filename, model, build in IMPORT_ORDER:
+                try:
+                    rows, elapsed = self.import_file(
+                        path / filename, model, build, batch_size
+                    )
+                except IntegrityError as error:
+                    raise CommandError(
+                        f'Не удалось загрузить {filename}: {error}. '
+                        'Возможно, данные уже загружены.'
+                    )
+                imported.append(model)
+                self.stdout.write(
+                    f'{filename}: {rows} строк за {elapsed:.2f} с '
+                    f'({rows / elapsed if elapsed else rows:.0f} строк/с)'
+                )
+
+        self.reset_sequences(imported)
+        rebuild_title_ratings()
+        recompute_rating_prior()
+        rebuild_leaderboards()
+        for model in imported:
+            bump_model_version(model)
+        self.stdout.write(self.style.SUCCESS('Загрузка данных завершена.'))
+
+    def import_file(self, path, model, build, batch_size):
+        """
+        Построчно читает файл и вставляет объекты пакетами
+        внутри одной транзакции. bulk_create не отправляет
+        сигналы post_save, поэтому производные данные
+        пересчитываются один раз после загрузки.
+        """
+        start = time.perf_counter()
+        rows = 0
+        with open(path, newline='', encoding='utf-8') as csv_file, \
+                transaction.atomic():
+            objects = map(build, csv.DictReader(csv_file))
+            while True:
+                batch = list(islice(objects, batch_size))
+                if not batch:
+                    break
+                model.objects.bulk_create(batch, batch_size=batch_size)
+                rows += len(batch)
+        return rows, time.perf_counter() - start
+
+    def reset_sequences(self, models):
+        """Сдвигает счётчики первичных ключей после вставки явных id."""
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
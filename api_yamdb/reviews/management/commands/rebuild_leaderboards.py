@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.leaderboards import rebuild_leaderboards
+
+
+class Command(BaseCommand):
+    help = (
+        'Перестраивает таблицы лидеров всех категорий и жанров '
+        'по сохранённому взвешенному рейтингу произведений.'
+    )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        boards = rebuild_leaderboards()
+        self.stdout.write(self.style.SUCCESS(
+            f'Таблицы лидеров перестроены: {boards} '
+            f'за {time.perf_counter() - start:.2f} с.'
+        ))
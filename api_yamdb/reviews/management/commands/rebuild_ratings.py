@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.cache import bump_model_version
+from reviews.aggregates import rebuild_title_ratings
+from reviews.leaderboards import rebuild_leaderboards
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает рейтинги, гистограммы оценок и таблицы лидеров '
+        'всех произведений за один проход по таблице отзывов.'
+    )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        rated = rebuild_title_ratings()
+        bump_model_version(Title)
+        rebuild_leaderboards()
+        self.stdout.write(self.style.SUCCESS(
+            f'Рейтинги пересчитаны: {rated} произведений с оценками '
+            f'за {time.perf_counter() - start:.2f} с.'
+        ))
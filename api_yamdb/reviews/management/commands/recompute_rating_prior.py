@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.cache import bump_model_version
+from reviews.aggregates import recompute_rating_prior
+from reviews.leaderboards import rebuild_leaderboards
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает среднюю оценку по всем отзывам и взвешенный '
+        'рейтинг произведений. Предназначена для периодического запуска '
+        '(cron): между запусками взвешенный рейтинг обновляется '
+        'при каждом отзыве с последней рассчитанной средней.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--weight', type=int,
+            help='Вес средней оценки: число добавляемых к каждому '
+                 'произведению оценок, равных средней.'
+        )
+
+    def handle(self, *args, **options):
+        weight = options['weight']
+        if weight is not None and weight < 1:
+            raise CommandError('--weight должен быть положительным.')
+        prior = recompute_rating_prior(weight)
+        bump_model_version(Title)
+        rebuild_leaderboards()
+        self.stdout.write(self.style.SUCCESS(
+            f'Средняя оценка {prior.mean:.3f}, вес {prior.weight}.'
+        ))
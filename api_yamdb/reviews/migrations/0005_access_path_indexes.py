@@ -0,0 +1,44 @@
+# Generated by Django 3.2 on 2026-10-17 12:37
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_genre_links(apps, schema_editor):
+    GenreTitle = apps.get_model('reviews', 'GenreTitle')
+    duplicates = GenreTitle.objects.values('title', 'genre').annotate(
+        keep_id=Min('id'), total=Count('id')
+    ).filter(total__gt=1).order_by()
+    for duplicate in duplicates:
+        GenreTitle.objects.filter(
+            title=duplicate['title'], genre=duplicate['genre']
+        ).exclude(id=duplicate['keep_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='genretitle',
+            index=models.Index(fields=['genre', 'title'], name='genretitle_genre_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['year', 'name'], name='title_year_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', 'name'], name='title_category_name_idx'),
+        ),
+        migrations.RunPython(
+            remove_duplicate_genre_links, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name='genretitle',
+            constraint=models.UniqueConstraint(fields=('title', 'genre'), name='unique_genre_title'),
+        ),
+    ]
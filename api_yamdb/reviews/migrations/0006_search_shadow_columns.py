@@ -0,0 +1,71 @@
+# Generated by Django 3.2 on 2026-10-17 12:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+import reviews.fields
+from reviews.fields import normalize_search
+
+SHADOW_COLUMNS = {
+    'category': {'name_search': 'name', 'slug_search': 'slug'},
+    'genre': {'name_search': 'name', 'slug_search': 'slug'},
+    'title': {'name_search': 'name'},
+    'user': {'username_search': 'username'},
+}
+
+
+def fill_shadow_columns(apps, schema_editor):
+    for model_name, columns in SHADOW_COLUMNS.items():
+        model = apps.get_model('reviews', model_name)
+        objects = list(model.objects.only('pk', *columns.values()))
+        for obj in objects:
+            for column, source in columns.items():
+                setattr(obj, column, normalize_search(getattr(obj, source)))
+        model.objects.bulk_update(objects, list(columns), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='name_search',
+            field=reviews.fields.SearchField(max_length=256, source='name', verbose_name='Название для поиска'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='slug_search',
+            field=reviews.fields.SearchField(max_length=50, source='slug', verbose_name='Слаг для поиска'),
+        ),
+        migrations.AddField(
+            model_name='genre',
+            name='name_search',
+            field=reviews.fields.SearchField(max_length=256, source='name', verbose_name='Название для поиска'),
+        ),
+        migrations.AddField(
+            model_name='genre',
+            name='slug_search',
+            field=reviews.fields.SearchField(max_length=50, source='slug', verbose_name='Слаг для поиска'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='name_search',
+            field=reviews.fields.SearchField(max_length=256, source='name', verbose_name='Название для поиска'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='username_search',
+            field=reviews.fields.SearchField(max_length=150, source='username', verbose_name='Имя пользователя для поиска'),
+        ),
+        migrations.RunPython(
+            fill_shadow_columns, migrations.RunPython.noop
+        ),
+        migrations.AlterField(
+            model_name='title',
+            name='category',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='titles', to='reviews.category', verbose_name='Категория'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 3.2 on 2026-10-17 13:22
+
+import django.core.validators
+from django.db import migrations, models
+from django.db.models import F, FloatField, Sum
+from django.db.models.functions import Cast
+
+
+def fill_weighted_ratings(apps, schema_editor):
+    title_model = apps.get_model('reviews', 'Title')
+    prior_model = apps.get_model('reviews', 'RatingPrior')
+    totals = title_model.objects.aggregate(
+        score_sum=Sum('score_sum'), score_count=Sum('score_count')
+    )
+    prior = prior_model()
+    if totals['score_count']:
+        prior.mean = totals['score_sum'] / totals['score_count']
+    prior.save()
+    title_model.objects.update(weighted_rating=(
+        (Cast('score_sum', FloatField()) + prior.mean * prior.weight)
+        / (F('score_count') + prior.weight)
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_title_score_histogram'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RatingPrior',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mean', models.FloatField(default=5.5, verbose_name='Средняя оценка')),
+                ('weight', models.PositiveIntegerField(default=10, validators=[django.core.validators.MinValueValidator(1)], verbose_name='Вес')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Дата пересчёта')),
+            ],
+            options={
+                'verbose_name': 'Априорный рейтинг',
+                'verbose_name_plural': 'Априорный рейтинг',
+            },
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='weighted_rating',
+            field=models.FloatField(default=0, editable=False, verbose_name='Взвешенный рейтинг'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['weighted_rating', 'id'], name='title_weighted_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['score_count', 'id'], name='title_score_count_idx'),
+        ),
+        migrations.RunPython(
+            fill_weighted_ratings, migrations.RunPython.noop
+        ),
+    ]
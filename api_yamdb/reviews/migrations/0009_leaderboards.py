@@ -0,0 +1,70 @@
+# Generated by Django 3.2 on 2026-10-17 13:29
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+LEADERBOARD_CAPACITY = 20
+
+
+def fill_leaderboards(apps, schema_editor):
+    title_model = apps.get_model('reviews', 'Title')
+    entry_model = apps.get_model('reviews', 'LeaderboardEntry')
+    rated = title_model.objects.filter(score_count__gt=0).order_by(
+        '-weighted_rating', '-id'
+    )
+    groups = [
+        ('category', pk, {'category_id': pk})
+        for pk in apps.get_model('reviews', 'Category').objects.values_list(
+            'pk', flat=True
+        )
+    ] + [
+        ('genre', pk, {'genres': pk})
+        for pk in apps.get_model('reviews', 'Genre').objects.values_list(
+            'pk', flat=True
+        )
+    ]
+    entry_model.objects.bulk_create(
+        entry_model(
+            kind=kind, group_id=group_id,
+            title_id=title_id, weighted_rating=rating
+        )
+        for kind, group_id, lookup in groups
+        for title_id, rating in rated.filter(**lookup).values_list(
+            'id', 'weighted_rating'
+        )[:LEADERBOARD_CAPACITY]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_weighted_rating'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('category', 'Категория'), ('genre', 'Жанр')], max_length=8, verbose_name='Справочник')),
+                ('group_id', models.PositiveIntegerField(verbose_name='Категория или жанр')),
+                ('weighted_rating', models.FloatField(verbose_name='Взвешенный рейтинг')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Место в таблице лидеров',
+                'verbose_name_plural': 'Таблицы лидеров',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardentry',
+            index=models.Index(fields=['kind', 'group_id', '-weighted_rating', '-title'], name='leaderboard_rank_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(fields=('kind', 'group_id', 'title'), name='unique_leaderboard_title'),
+        ),
+        migrations.RunPython(
+            fill_leaderboards, migrations.RunPython.noop
+        ),
+    ]
@@ -1,6 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.db import models
+from django.db import models, transaction
 
 from api.constants import (
     LIMIT_EMAIL,
@@ -11,6 +11,7 @@ from api.constants import (
     REVIEW_SCORE_MIN,
 )
 from api.validators import title_year_validator, user_validator
+from reviews.fields import SearchField
 
 
 class Role(models.TextChoices):
@@ -27,6 +28,11 @@ class User(AbstractUser):
         unique=True,
         validators=[user_validator],
     )
+    username_search = SearchField(
+        'Имя пользователя для поиска',
+        max_length=LIMIT_USERNAME,
+        source='username',
+    )
     email = models.EmailField(
         verbose_name="Электронная почта",
         max_length=LIMIT_EMAIL,
@@ -82,6 +88,10 @@ class Basemodel(models.Model):
 
     name = models.CharField('Категория', max_length=NAME_LENGTH, unique=True)
     slug = models.SlugField('Слаг категории', unique=True)
+    name_search = SearchField(
+        'Название для поиска', max_length=NAME_LENGTH, source='name')
+    slug_search = SearchField(
+        'Слаг для поиска', max_length=50, source='slug')
 
     class Meta:
         abstract = True
@@ -115,6 +125,8 @@ class Title(models.Model):
     """Модель произведения."""
 
     name = models.CharField('Произведение', max_length=NAME_LENGTH)
+    name_search = SearchField(
+        'Название для поиска', max_length=NAME_LENGTH, source='name')
     year = models.SmallIntegerField(
         'Год выпуска', validators=[title_year_validator])
     description = models.TextField('Описание', null=True, blank=True)
@@ -123,6 +135,8 @@ class Title(models.Model):
         related_name='titles',
         on_delete=models.SET_NULL,
         null=True,
+        # Поиск по категории обслуживает title_category_name_idx.
+        db_index=False,
         verbose_name='Категория'
     )
     genres = models.ManyToManyField(
@@ -131,15 +145,160 @@ class Title(models.Model):
         related_name='titles',
         verbose_name='Жанр'
     )
+    score_sum = models.PositiveIntegerField(
+        'Сумма оценок', default=0, editable=False)
+    score_count = models.PositiveIntegerField(
+        'Количество оценок', default=0, editable=False)
+    rating = models.PositiveSmallIntegerField(
+        'Рейтинг', null=True, blank=True, editable=False)
+    # Байесовский рейтинг для сортировки: оценки произведения вместе
+    # с RatingPrior.weight оценками, равными средней по всем отзывам.
+    weighted_rating = models.FloatField(
+        'Взвешенный рейтинг', default=0, editable=False)
+    # Гистограмма оценок: счётчик на каждое значение от REVIEW_SCORE_MIN
+    # до REVIEW_SCORE_MAX (SCORE_COUNT_FIELDS), поддерживается сигналами
+    # отзывов вместе с score_sum и score_count.
+    score_1_count = models.PositiveIntegerField(
+        'Оценок 1', default=0, editable=False)
+    score_2_count = models.PositiveIntegerField(
+        'Оценок 2', default=0, editable=False)
+    score_3_count = models.PositiveIntegerField(
+        'Оценок 3', default=0, editable=False)
+    score_4_count = models.PositiveIntegerField(
+        'Оценок 4', default=0, editable=False)
+    score_5_count = models.PositiveIntegerField(
+        'Оценок 5', default=0, editable=False)
+    score_6_count = models.PositiveIntegerField(
+        'Оценок 6', default=0, editable=False)
+    score_7_count = models.PositiveIntegerField(
+        'Оценок 7', default=0, editable=False)
+    score_8_count = models.PositiveIntegerField(
+        'Оценок 8', default=0, editable=False)
+    score_9_count = models.PositiveIntegerField(
+        'Оценок 9', default=0, editable=False)
+    score_10_count = models.PositiveIntegerField(
+        'Оценок 10', default=0, editable=False)
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['name', 'id'], name='title_name_id_idx'),
+            models.Index(fields=['year', 'name'], name='title_year_name_idx'),
+            models.Index(
+                fields=['category', 'name'], name='title_category_name_idx'
+            ),
+            models.Index(
+                fields=['weighted_rating', 'id'],
+                name='title_weighted_rating_idx'
+            ),
+            models.Index(
+                fields=['score_count', 'id'], name='title_score_count_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        """
+        Оценки меняются атомарными UPDATE из reviews.aggregates,
+        поэтому сохранение загруженного произведения (PATCH, админка)
+        не перезаписывает их значениями, прочитанными до отзывов,
+        добавленных или удалённых за время запроса.
+        """
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in deferred
+                and field.name not in RATING_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+
+def score_count_field(score):
+    """Имя счётчика гистограммы оценок произведения для оценки score."""
+    return f'score_{score}_count'
+
+
+SCORE_RANGE = range(REVIEW_SCORE_MIN, REVIEW_SCORE_MAX + 1)
+SCORE_COUNT_FIELDS = tuple(score_count_field(score) for score in SCORE_RANGE)
+RATING_FIELDS = (
+    'score_sum', 'score_count', 'rating', 'weighted_rating',
+    *SCORE_COUNT_FIELDS
+)
+
+
+class RatingPrior(models.Model):
+    """
+    Априорные данные взвешенного рейтинга: средняя оценка
+    по всем отзывам и вес — сколько оценок, равных средней,
+    добавляется к оценкам каждого произведения.
+
+    Хранится одной строкой и пересчитывается командой
+    recompute_rating_prior; до первого пересчёта используются
+    значения по умолчанию.
+    """
+
+    mean = models.FloatField(
+        'Средняя оценка', default=(REVIEW_SCORE_MIN + REVIEW_SCORE_MAX) / 2)
+    weight = models.PositiveIntegerField(
+        'Вес', default=10, validators=[MinValueValidator(1)])
+    updated_at = models.DateTimeField('Дата пересчёта', auto_now=True)
+
+    class Meta:
+        verbose_name = 'Априорный рейтинг'
+        verbose_name_plural = 'Априорный рейтинг'
+
+    def __str__(self):
+        return f'{self.mean:.2f} × {self.weight}'
+
+
+class LeaderboardKind(models.TextChoices):
+    """Справочники, для значений которых ведутся таблицы лидеров."""
+    CATEGORY = 'category', 'Категория'
+    GENRE = 'genre', 'Жанр'
+
+
+class LeaderboardEntry(models.Model):
+    """
+    Строка материализованной таблицы лидеров: произведение
+    из лучших по взвешенному рейтингу в категории или жанре group_id.
+    Копия weighted_rating позволяет читать таблицу в порядке индекса.
+    """
+
+    kind = models.CharField(
+        'Справочник', max_length=8, choices=LeaderboardKind.choices)
+    group_id = models.PositiveIntegerField('Категория или жанр')
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='leaderboard_entries',
+        verbose_name='Произведение'
+    )
+    weighted_rating = models.FloatField('Взвешенный рейтинг')
+
+    class Meta:
+        verbose_name = 'Место в таблице лидеров'
+        verbose_name_plural = 'Таблицы лидеров'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['kind', 'group_id', 'title'],
+                name='unique_leaderboard_title'
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=['kind', 'group_id', '-weighted_rating', '-title'],
+                name='leaderboard_rank_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.kind} {self.group_id}: {self.title_id}'
+
 
 class GenreTitle(models.Model):
     """Вспомогательная модель для связи произведения и жанра."""
@@ -155,6 +314,19 @@ class GenreTitle(models.Model):
         null=True
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['title', 'genre'],
+                name='unique_genre_title'
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=['genre', 'title'], name='genretitle_genre_title_idx'
+            ),
+        ]
+
     def __str__(self):
         return f'{self.genre} {self.title}'
 
@@ -187,19 +359,49 @@ class Review(AbstractContentModel):
         ]
     )
 
-    class Meta:
+    class Meta(AbstractContentModel.Meta):
         constraints = [
             models.UniqueConstraint(
                 fields=['title', 'author'],
                 name='unique_review'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['title', '-pub_date', 'id'],
+                name='review_title_pub_date_idx'
+            ),
+            models.Index(
+                fields=['pub_date', 'id'], name='review_pub_date_idx'
+            ),
+            models.Index(
+                fields=['author', '-pub_date', '-id'],
+                name='review_author_pub_date_idx'
+            ),
+        ]
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
 
     def __str__(self):
         return f'Review by {self.author} on {self.title}'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_score()
+        return instance
+
+    def remember_score(self):
+        """Запоминает произведение и оценку, учтённые в рейтинге."""
+        self._counted_score = (
+            self.__dict__.get('title_id'), self.__dict__.get('score')
+        )
+
+    def save(self, *args, **kwargs):
+        """Сохраняет отзыв и пересчёт рейтинга в одной транзакции."""
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+
 
 class Comment(AbstractContentModel):
     """Комментарий к отзыву."""
@@ -209,7 +411,17 @@ class Comment(AbstractContentModel):
         related_name='comments'
     )
 
-    class Meta:
+    class Meta(AbstractContentModel.Meta):
+        indexes = [
+            models.Index(
+                fields=['review', '-pub_date', 'id'],
+                name='comment_review_pub_date_idx'
+            ),
+            models.Index(
+                fields=['author', '-pub_date', '-id'],
+                name='comment_author_pub_date_idx'
+            ),
+        ]
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
 
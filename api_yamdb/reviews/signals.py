@@ -0,0 +1,116 @@
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save
+)
+from django.dispatch import receiver
+
+from reviews.aggregates import (
+    apply_score_change,
+    rebuild_title_ratings,
+    weighted_rating
+)
+from reviews.leaderboards import leaderboard_queue
+from reviews.models import (
+    Category,
+    Genre,
+    GenreTitle,
+    LeaderboardEntry,
+    LeaderboardKind,
+    Review,
+    Title
+)
+
+
+@receiver(post_save, sender=Review)
+def count_review_score(sender, instance, created, raw=False, **kwargs):
+    """Учитывает оценку созданного или изменённого отзыва в рейтинге."""
+    if raw:
+        return
+    if created:
+        apply_score_change(instance.title_id, added=instance.score)
+    else:
+        old_title_id, old_score = getattr(
+            instance, '_counted_score', (None, None)
+        )
+        if old_score is None:
+            rebuild_title_ratings(Title.objects.filter(
+                pk__in=(old_title_id, instance.title_id)
+            ))
+        elif old_title_id == instance.title_id:
+            apply_score_change(
+                instance.title_id, added=instance.score, removed=old_score
+            )
+        else:
+            apply_score_change(old_title_id, removed=old_score)
+            apply_score_change(instance.title_id, added=instance.score)
+        leaderboard_queue.enqueue([old_title_id])
+    leaderboard_queue.enqueue([instance.title_id])
+    instance.remember_score()
+
+
+@receiver(post_delete, sender=Review)
+def discount_review_score(sender, instance, **kwargs):
+    """Исключает оценку удалённого отзыва из рейтинга произведения."""
+    title_id, score = getattr(
+        instance, '_counted_score', (instance.title_id, instance.score)
+    )
+    apply_score_change(title_id, removed=score)
+    leaderboard_queue.enqueue([title_id])
+
+
+@receiver(pre_save, sender=Title)
+def init_weighted_rating(sender, instance, raw=False, **kwargs):
+    """
+    Новое произведение получает взвешенный рейтинг, вычисленный
+    подзапросом прямо в INSERT, без отдельного чтения RatingPrior.
+    """
+    if instance._state.adding and not raw:
+        instance.weighted_rating = weighted_rating(
+            instance.score_sum, instance.score_count
+        )
+
+
+@receiver(post_save, sender=Title)
+def defer_weighted_rating(sender, instance, created, raw=False, **kwargs):
+    """
+    Значение из подзапроса не возвращается в экземпляр: поле
+    становится отложенным и загрузится при обращении, а повторный
+    save() его не перезапишет.
+    """
+    if created and not raw:
+        instance.__dict__.pop('weighted_rating', None)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def update_title_leaderboards(sender, instance, raw=False, **kwargs):
+    """Смена категории или жанров переносит произведение между таблицами."""
+    if not raw:
+        leaderboard_queue.enqueue([
+            instance.pk if sender is Title else instance.title_id
+        ])
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Genre)
+def delete_leaderboard(sender, instance, **kwargs):
+    """Таблица удалённой категории или жанра больше не нужна."""
+    LeaderboardEntry.objects.filter(
+        kind=(LeaderboardKind.CATEGORY if sender is Category
+              else LeaderboardKind.GENRE),
+        group_id=instance.pk
+    ).delete()
+
+
+@receiver(pre_delete, sender=Title)
+def refill_title_leaderboards(sender, instance, **kwargs):
+    """
+    Строки удаляемого произведения удаляются каскадом,
+    а его таблицы дополняются следующими произведениями группы.
+    """
+    leaderboard_queue.enqueue(groups=LeaderboardEntry.objects.filter(
+        title=instance
+    ).values_list('kind', 'group_id'))
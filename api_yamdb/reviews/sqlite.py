@@ -0,0 +1,65 @@
+import random
+import time
+from functools import wraps
+
+from django.db import OperationalError, connection, transaction
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from api.conf import get_settings
+
+
+LOCK_RETRY_DEFAULTS = {
+    'ATTEMPTS': 5,
+    'BASE_DELAY': 0.05,
+    'MAX_DELAY': 1.0,
+}
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """Применяет PRAGMA из настройки SQLITE_PRAGMAS к новому соединению."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in get_settings('SQLITE_PRAGMAS', {}).items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+LOCK_ERRORS = (
+    'database is locked', 'database is busy', 'database table is locked'
+)
+
+
+def is_lock_error(error):
+    message = str(error).lower()
+    return any(text in message for text in LOCK_ERRORS)
+
+
+def retry_on_lock(func):
+    """
+    Повторяет запись при временной блокировке базы данных SQLite.
+
+    Каждая попытка выполняется в отдельной транзакции, задержка между
+    попытками растёт экспоненциально со случайным разбросом.
+    Внутри внешней транзакции повтор невозможен, ошибка пробрасывается.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        config = get_settings('SQLITE_LOCK_RETRY', LOCK_RETRY_DEFAULTS)
+        for attempt in range(1, config['ATTEMPTS'] + 1):
+            try:
+                with transaction.atomic():
+                    return func(*args, **kwargs)
+            except OperationalError as error:
+                if (
+                    not is_lock_error(error)
+                    or attempt == config['ATTEMPTS']
+                    or connection.in_atomic_block
+                ):
+                    raise
+            delay = min(
+                config['MAX_DELAY'], config['BASE_DELAY'] * 2 ** attempt
+            )
+            time.sleep(delay * random.uniform(0.5, 1))
+    return wrapper
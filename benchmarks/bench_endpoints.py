@@ -0,0 +1,260 @@
+"""
+Замер эндпоинтов API на синтетическом наборе данных.
+
+Для каждого маршрута из api/urls.py записываются перцентили задержки
+p50/p95/p99, число SQL-запросов и размер ответа. Результаты сохраняются
+в JSON; режим --compare сравнивает два прогона и отмечает регрессии.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_endpoints --titles 5000 --output base.json
+    python -m benchmarks.bench_endpoints --compare base.json head.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from itertools import count
+
+from benchmarks.utils import percentile, setup_django
+
+DATASET_OPTIONS = (
+    'users', 'categories', 'genres', 'titles', 'reviews', 'comments', 'seed'
+)
+
+
+class QueryCounter:
+    """Обёртка выполнения SQL, подсчитывающая запросы."""
+
+    def __init__(self):
+        self.queries = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+
+def authorized_client(user):
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}'
+    )
+    return client
+
+
+def build_scenarios(iterations):
+    """
+    Готовит сценарии: имя, ожидаемый статус и функцию запроса.
+    Данные для запросов на запись создаются заранее,
+    чтобы не попадать в замер.
+    """
+    from django.contrib.auth.tokens import default_token_generator
+    from django.db.models import Count
+    from rest_framework.test import APIClient
+
+    from reviews.models import Category, Genre, Review, Title, User
+
+    anonymous = APIClient()
+    admin = User.objects.create_user(
+        username='bench-admin', email='bench-admin@yamdb.fake',
+        role='admin'
+    )
+    admin_client = authorized_client(admin)
+    title = Title.objects.order_by('-score_count', 'id').first()
+    review = Review.objects.annotate(
+        comment_total=Count('comments')
+    ).order_by('-comment_total', 'id').first()
+    genre = Genre.objects.order_by('id').first()
+    category = Category.objects.order_by('id').first()
+    reviews_url = f'/api/v1/titles/{title.pk}/reviews/'
+    comments_url = f'{reviews_url}{review.pk}/comments/'
+    writers = []
+    for idx in range(iterations):
+        writers.append(authorized_client(User.objects.create_user(
+            username=f'bench-writer-{idx}',
+            email=f'bench-writer-{idx}@yamdb.fake'
+        )))
+    writer_iter = iter(writers)
+    signup_numbers = count()
+    token_user = User.objects.create_user(
+        username='bench-token', email='bench-token@yamdb.fake'
+    )
+    token_data = {
+        'username': token_user.username,
+        'confirmation_code': default_token_generator.make_token(token_user)
+    }
+
+    def signup():
+        number = next(signup_numbers)
+        return anonymous.post('/api/v1/auth/signup/', data={
+            'username': f'bench-signup-{number}',
+            'email': f'bench-signup-{number}@yamdb.fake'
+        })
+
+    return [
+        ('titles_list', 200, lambda: anonymous.get('/api/v1/titles/')),
+        ('titles_filter_genre', 200, lambda: anonymous.get(
+            '/api/v1/titles/', {'genre': genre.slug})),
+        ('titles_filter_category', 200, lambda: anonymous.get(
+            '/api/v1/titles/', {'category': category.slug})),
+        ('titles_filter_name', 200, lambda: anonymous.get(
+            '/api/v1/titles/', {'name': title.name})),
+        ('titles_filter_year', 200, lambda: anonymous.get(
+            '/api/v1/titles/', {'year': title.year})),
+        ('title_detail', 200, lambda: anonymous.get(
+            f'/api/v1/titles/{title.pk}/')),
+        ('genres_list', 200, lambda: anonymous.get('/api/v1/genres/')),
+        ('categories_list', 200, lambda: anonymous.get(
+            '/api/v1/categories/')),
+        ('reviews_list', 200, lambda: anonymous.get(reviews_url)),
+        ('reviews_create', 201, lambda: next(writer_iter).post(
+            reviews_url, data={'text': 'Замер', 'score': 7})),
+        ('comments_list', 200, lambda: anonymous.get(comments_url)),
+        ('comments_create', 201, lambda: admin_client.post(
+            comments_url, data={'text': 'Замер'})),
+        ('users_search', 200, lambda: admin_client.get(
+            '/api/v1/users/', {'search': 'user1'})),
+        ('signup', 200, signup),
+        ('token', 200, lambda: anonymous.post(
+            '/api/v1/auth/token/', data=token_data)),
+    ]
+
+
+def run_scenario(request, expected_status, repeat, warmup):
+    from django.db import connection
+
+    for _ in range(warmup):
+        request()
+    timings, queries, sizes, errors = [], [], [], 0
+    for _ in range(repeat):
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            start = time.perf_counter()
+            response = request()
+            timings.append((time.perf_counter() - start) * 1000)
+        if response.status_code != expected_status:
+            errors += 1
+        queries.append(counter.queries)
+        sizes.append(len(response.content))
+    return {
+        'p50': percentile(timings, 50),
+        'p95': percentile(timings, 95),
+        'p99': percentile(timings, 99),
+        'mean': sum(timings) / len(timings),
+        'queries': sum(queries) / len(queries),
+        'bytes': sum(sizes) / len(sizes),
+        'requests': repeat,
+        'errors': errors,
+    }
+
+
+def run(args):
+    setup_django()
+
+    from django import get_version
+    from django.conf import settings
+    from django.core.management import call_command
+
+    settings.API_RESPONSE_CACHE = {
+        **getattr(settings, 'API_RESPONSE_CACHE', {}),
+        'ENABLED': args.with_cache,
+    }
+    dataset = {name: getattr(args, name) for name in DATASET_OPTIONS}
+    start = time.perf_counter()
+    call_command('generate_dataset', verbosity=0, stdout=sys.stderr,
+                 **dataset)
+    print(f'Набор данных создан за {time.perf_counter() - start:.1f} с',
+          file=sys.stderr)
+
+    results = {}
+    for name, expected_status, request in build_scenarios(
+        args.repeat + args.warmup
+    ):
+        if args.only and name not in args.only:
+            continue
+        results[name] = run_scenario(
+            request, expected_status, args.repeat, args.warmup
+        )
+        stats = results[name]
+        print(f'{name:<24} p50 {stats["p50"]:8.2f} p95 {stats["p95"]:8.2f} '
+              f'p99 {stats["p99"]:8.2f} ms  queries {stats["queries"]:5.1f}'
+              f'  bytes {stats["bytes"]:8.0f}  errors {stats["errors"]}')
+
+    report = {
+        'meta': {
+            'dataset': dataset,
+            'repeat': args.repeat,
+            'with_cache': args.with_cache,
+            'python': platform.python_version(),
+            'django': get_version(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as output:
+        json.dump(report, output, indent=2, ensure_ascii=False)
+    print(f'Результаты сохранены в {args.output}', file=sys.stderr)
+
+
+def compare(base_path, head_path, threshold):
+    """
+    Сравнивает два прогона. Регрессией считается рост p95
+    больше чем на threshold или увеличение числа SQL-запросов.
+    """
+    with open(base_path, encoding='utf-8') as base_file:
+        base = json.load(base_file)['results']
+    with open(head_path, encoding='utf-8') as head_file:
+        head = json.load(head_file)['results']
+    regressions = 0
+    print(f'{"route":<24} {"p95 base":>10} {"p95 head":>10} {"change":>8} '
+          f'{"queries":>13}')
+    for name in sorted(set(base) & set(head)):
+        old, new = base[name], head[name]
+        change = (new['p95'] - old['p95']) / old['p95'] if old['p95'] else 0
+        regressed = (
+            change > threshold or new['queries'] > old['queries']
+            or new['errors'] > old['errors']
+        )
+        regressions += regressed
+        print(f'{name:<24} {old["p95"]:10.2f} {new["p95"]:10.2f} '
+              f'{change:+8.1%} {old["queries"]:6.1f}->{new["queries"]:<6.1f}'
+              f'{"  REGRESSION" if regressed else ""}')
+    for name in sorted(set(base) ^ set(head)):
+        print(f'{name:<24} есть только в одном из прогонов')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--categories', type=int, default=5)
+    parser.add_argument('--genres', type=int, default=30)
+    parser.add_argument('--titles', type=int, default=5000)
+    parser.add_argument('--reviews', type=int, default=50000)
+    parser.add_argument('--comments', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=100)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--only', nargs='+',
+                        help='Замерить только указанные маршруты.')
+    parser.add_argument('--with-cache', action='store_true',
+                        help='Не отключать кэш ответов API.')
+    parser.add_argument('--output', default='bench_endpoints.json')
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'HEAD'))
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Допустимый рост p95, доля (0.1 = 10%%).')
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare, args.threshold) else 0)
+    run(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Замер поиска по тексту отзывов через LIKE (icontains, как поиск
+в админке до индекса) и через полнотекстовый индекс FTS5
+на наборах данных нескольких размеров.
+
+Номер отзыва встречается только в его тексте, а слово «Отзыв» —
+во всех отзывах. Время поиска FTS5 зависит от числа документов
+со словами запроса, а не от размера таблицы: редкое слово ищется
+за одно и то же время, частое дороже из-за подсчёта IDF для BM25.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_fulltext --reviews 10000 40000 160000
+"""
+import argparse
+import os
+
+from benchmarks.utils import measure, median, percentile, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--reviews', type=int, nargs='+', default=[10000, 40000, 160000]
+    )
+    parser.add_argument('--repeat', type=int, default=30)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.core.management import call_command
+    from rest_framework.test import APIClient
+
+    from reviews.fulltext import review_fulltext
+    from reviews.models import Review
+
+    client = APIClient()
+    print(f'{"reviews":>8} {"like p50":>9} {"rare p50":>9} '
+          f'{"rare p95":>9} {"common p50":>11} {"api p50":>8}  (ms)')
+    for reviews in args.reviews:
+        call_command(
+            'generate_dataset', users=1000, titles=max(1, reviews // 20),
+            reviews=reviews, comments=0, clear=True,
+            stdout=open(os.devnull, 'w')
+        )
+        rare = str(reviews // 2)
+        common = f'Отзыв {rare}'
+
+        def search(term):
+            return measure(lambda: list(review_fulltext.search(
+                Review.objects.all(), term
+            )[:10]), repeat=args.repeat)
+
+        like = measure(
+            lambda: list(Review.objects.filter(
+                text__icontains=f'Отзыв {rare}.'
+            )[:10]),
+            repeat=args.repeat
+        )
+        rare_timings, common_timings = search(rare), search(common)
+        api = measure(
+            lambda: client.get('/api/v1/reviews/search/', {'q': rare}),
+            repeat=args.repeat
+        )
+        print(f'{reviews:8d} {median(like):9.2f} '
+              f'{median(rare_timings):9.2f} '
+              f'{percentile(rare_timings, 95):9.2f} '
+              f'{median(common_timings):11.2f} {median(api):8.2f}')
+
+
+if __name__ == '__main__':
+    main()
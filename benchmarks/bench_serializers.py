@@ -0,0 +1,82 @@
+"""
+Пропускная способность сериализации списков (строк в секунду):
+сериализаторы DRF по экземплярам моделей против ValuesSerializer
+по строкам values(). Замеряется получение строк из базы данных
+вместе с преобразованием, как в действии list; совпадение
+JSON-ответов обоих путей проверяется перед замером.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_serializers --rows 1000 --repeat 20
+"""
+import argparse
+import os
+
+from benchmarks.utils import measure, median, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.core.management import call_command
+    from rest_framework.renderers import JSONRenderer
+
+    from api.serializers import (
+        CommentSerializer,
+        CommentValuesSerializer,
+        ReviewSerializer,
+        ReviewValuesSerializer,
+        TitleReadSerializer,
+        TitleReadValuesSerializer,
+    )
+    from reviews.models import Comment, Review, Title
+
+    call_command(
+        'generate_dataset', users=500, titles=args.rows, genres=30,
+        reviews=args.rows, comments=args.rows,
+        stdout=open(os.devnull, 'w')
+    )
+    cases = {
+        'titles': (
+            Title.objects.select_related('category').prefetch_related(
+                'genres'
+            ),
+            TitleReadSerializer, TitleReadValuesSerializer,
+        ),
+        'reviews': (
+            Review.objects.select_related('author'),
+            ReviewSerializer, ReviewValuesSerializer,
+        ),
+        'comments': (
+            Comment.objects.select_related('author'),
+            CommentSerializer, CommentValuesSerializer,
+        ),
+    }
+
+    renderer = JSONRenderer()
+    print(f'{"list":<10} {"drf rows/s":>12} {"values rows/s":>14} '
+          f'{"speedup":>8}')
+    for name, (queryset, drf_class, values_class) in cases.items():
+        queryset = queryset.order_by('id')[:args.rows]
+
+        def drf():
+            return drf_class(list(queryset.all()), many=True).data
+
+        def values():
+            serializer = values_class()
+            return serializer.serialize(serializer.get_rows(queryset))
+
+        assert renderer.render(drf()) == renderer.render(values()), name
+        drf_ms = median(measure(drf, repeat=args.repeat))
+        values_ms = median(measure(values, repeat=args.repeat))
+        print(f'{name:<10} {args.rows / drf_ms * 1000:12.0f} '
+              f'{args.rows / values_ms * 1000:14.0f} '
+              f'{drf_ms / values_ms:7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""
+Пропускная способность SQLite при конкурентной записи отзывов
+и комментариев с настройками соединения по умолчанию и с SQLITE_PRAGMAS.
+
+Каждый режим запускается в отдельном процессе на свежем файле базы:
+писатели создают комментарии и меняют оценки отзывов (что обновляет
+рейтинг произведения), читатели параллельно запрашивают отзывы.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_sqlite_writers --writers 8 --seconds 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.utils import median, percentile, setup_django
+
+MODES = ('default', 'tuned')
+
+
+def worker(stop, stats, lock, action):
+    from django.db import OperationalError, connection
+
+    done = errors = 0
+    timings = []
+    try:
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                action()
+                done += 1
+                timings.append((time.perf_counter() - start) * 1000)
+            except OperationalError:
+                errors += 1
+    finally:
+        connection.close()
+    with lock:
+        stats['done'] += done
+        stats['errors'] += errors
+        stats['timings'].extend(timings)
+
+
+def run_mode(args):
+    database = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+    overrides = {} if args.mode == 'tuned' else {
+        'SQLITE_PRAGMAS': {}, 'SQLITE_LOCK_RETRY': {'ATTEMPTS': 1}
+    }
+    setup_django(database, **overrides)
+
+    import random
+
+    from django.core.management import call_command
+    from django.db import connection
+
+    from reviews.models import Comment, Review
+    from reviews.sqlite import retry_on_lock
+
+    call_command('generate_dataset', users=200, titles=50, reviews=2000,
+                 comments=0, verbosity=0, stdout=open(os.devnull, 'w'))
+    review_ids = list(Review.objects.values_list('id', flat=True))
+    connection.close()
+
+    def write():
+        rng = random.Random()
+        review = Review.objects.get(pk=rng.choice(review_ids))
+        Comment.objects.create(review=review, author_id=review.author_id,
+                               text='Замер')
+        review.score = rng.randint(1, 10)
+        review.save()
+
+    def read():
+        list(Review.objects.filter(
+            title_id=random.randint(1, 50)
+        ).order_by('-pub_date', 'id')[:5])
+
+    write_stats = {'done': 0, 'errors': 0, 'timings': []}
+    read_stats = {'done': 0, 'errors': 0, 'timings': []}
+    lock, stop = threading.Lock(), threading.Event()
+    threads = [
+        threading.Thread(target=worker, args=(
+            stop, write_stats, lock, retry_on_lock(write)
+        )) for _ in range(args.writers)
+    ] + [
+        threading.Thread(target=worker, args=(stop, read_stats, lock, read))
+        for _ in range(args.readers)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    print(json.dumps({
+        'mode': args.mode,
+        'writes_per_sec': write_stats['done'] / args.seconds,
+        'write_errors': write_stats['errors'],
+        'write_p95_ms': percentile(write_stats['timings'] or [0], 95),
+        'reads_per_sec': read_stats['done'] / args.seconds,
+        'read_p50_ms': median(read_stats['timings'] or [0]),
+        'read_p95_ms': percentile(read_stats['timings'] or [0], 95),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--writers', type=int, default=8)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--mode', choices=MODES)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args)
+        return
+
+    print(f'{"mode":<8} {"writes/s":>9} {"errors":>7} {"write p95":>10} '
+          f'{"reads/s":>9} {"read p50":>9} {"read p95":>9}  (ms)')
+    for mode in MODES:
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_sqlite_writers',
+             '--mode', mode, '--writers', str(args.writers),
+             '--readers', str(args.readers), '--seconds', str(args.seconds)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f'{mode:<8} {result["writes_per_sec"]:9.1f} '
+              f'{result["write_errors"]:7d} {result["write_p95_ms"]:10.2f} '
+              f'{result["reads_per_sec"]:9.1f} {result["read_p50_ms"]:9.2f} '
+              f'{result["read_p95_ms"]:9.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Замер списка произведений с фильтрами через ORM и через
+колоночный индекс api.title_index (нужен numpy).
+
+Кэш ответов отключается, чтобы каждый запрос доходил до вьюхи.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_title_index --titles 20000 --genres 30
+"""
+import argparse
+import os
+
+from benchmarks.utils import measure, median, percentile, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=20000)
+    parser.add_argument('--genres', type=int, default=30)
+    parser.add_argument('--categories', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django(API_RESPONSE_CACHE={'ENABLED': False})
+
+    from django.conf import settings
+    from django.core.management import call_command
+    from rest_framework.test import APIClient
+
+    from api.title_index import np, title_index
+    from reviews.models import Category, Genre, Title
+
+    if np is None:
+        parser.exit(1, 'Для замера нужен numpy: pip install numpy\n')
+
+    call_command(
+        'generate_dataset', titles=args.titles, genres=args.genres,
+        categories=args.categories, users=100, reviews=args.titles,
+        comments=0, stdout=open(os.devnull, 'w')
+    )
+    genre = Genre.objects.order_by('id').first().slug
+    category = Category.objects.order_by('id').first().slug
+    year = Title.objects.order_by('id').first().year
+    queries = {
+        'all': {},
+        'all, page 50': {'page': 50},
+        'genre': {'genre': genre},
+        'category': {'category': category},
+        'genre+category+year': {
+            'genre': genre, 'category': category, 'year': year
+        },
+        'ordering=-rating': {'ordering': '-rating'},
+        'genre, -review_count': {
+            'genre': genre, 'ordering': '-review_count'
+        },
+    }
+
+    client = APIClient()
+    print(f'{"query":<22} {"orm p50":>9} {"orm p95":>9} '
+          f'{"index p50":>10} {"index p95":>10}  (ms)')
+    for name, query in queries.items():
+        results = []
+        for enabled in (False, True):
+            settings.TITLE_INDEX = {'ENABLED': enabled}
+            timings = measure(
+                lambda: client.get('/api/v1/titles/', query),
+                repeat=args.repeat
+            )
+            results.append((median(timings), percentile(timings, 95)))
+        (orm_p50, orm_p95), (index_p50, index_p95) = results
+        print(f'{name:<22} {orm_p50:9.2f} {orm_p95:9.2f} '
+              f'{index_p50:10.2f} {index_p95:10.2f}')
+    print(f'index: {len(title_index.ids)} titles, '
+          f'{title_index.genre_masks.shape[1]} genre mask word(s)')
+
+
+if __name__ == '__main__':
+    main()
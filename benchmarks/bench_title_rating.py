@@ -0,0 +1,89 @@
+"""
+Замер времени ответа списка произведений при росте числа отзывов.
+
+Сравнивает хранимый рейтинг (Title.rating) с агрегатом
+Avg('reviews__score'), который вычислялся на каждый запрос.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_title_rating --reviews 0 1000 10000 50000
+"""
+import argparse
+
+from benchmarks.utils import measure, median, percentile, setup_django
+
+
+def populate(target_reviews, titles, state):
+    from django.utils import timezone
+
+    from reviews.aggregates import rebuild_title_ratings
+    from reviews.models import Review, User
+
+    missing = target_reviews - state['reviews']
+    if missing <= 0:
+        return
+    authors_needed = -(-target_reviews // len(titles))
+    users = list(User.objects.order_by('id'))
+    User.objects.bulk_create(
+        User(username=f'bench{idx}', email=f'bench{idx}@yamdb.fake')
+        for idx in range(len(users), authors_needed)
+    )
+    users = list(User.objects.order_by('id'))
+    now = timezone.now()
+    batch = []
+    for position in range(state['reviews'], target_reviews):
+        title = titles[position % len(titles)]
+        author = users[position // len(titles)]
+        batch.append(Review(
+            title=title, author=author, text='Отзыв',
+            score=position % 10 + 1, pub_date=now
+        ))
+    Review.objects.bulk_create(batch, batch_size=1000)
+    rebuild_title_ratings()
+    state['reviews'] = target_reviews
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=50)
+    parser.add_argument('--reviews', type=int, nargs='+',
+                        default=[0, 1000, 10000, 50000])
+    parser.add_argument('--repeat', type=int, default=30)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.db.models import Avg
+    from rest_framework.test import APIClient
+
+    from reviews.models import Category, Title
+
+    category = Category.objects.create(name='Фильм', slug='movie')
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {idx}', year=2000, category=category)
+        for idx in range(args.titles)
+    )
+    titles = list(Title.objects.order_by('id'))
+    client = APIClient()
+    state = {'reviews': 0}
+
+    print(f'{"reviews":>10} {"api p50":>10} {"api p95":>10} '
+          f'{"stored":>10} {"aggregate":>10}  (ms)')
+    for target in sorted(args.reviews):
+        populate(target, titles, state)
+        api = measure(lambda: client.get('/api/v1/titles/'), args.repeat)
+        stored = measure(
+            lambda: list(Title.objects.values('id', 'rating')), args.repeat
+        )
+        aggregate = measure(
+            lambda: list(Title.objects.annotate(
+                avg=Avg('reviews__score')
+            ).values('id', 'avg')),
+            args.repeat
+        )
+        print(f'{target:>10} {median(api):>10.2f} '
+              f'{percentile(api, 95):>10.2f} {median(stored):>10.2f} '
+              f'{median(aggregate):>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
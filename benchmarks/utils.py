@@ -0,0 +1,60 @@
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'api_yamdb'
+
+
+def setup_django(database_name=None, **overrides):
+    """
+    Настраивает Django и создаёт пустую тестовую базу данных,
+    чтобы замеры не затрагивали рабочий db.sqlite3.
+    По умолчанию база создаётся в памяти, database_name задаёт файл.
+    Инструментирование запросов (Server-Timing) отключается,
+    чтобы не влиять на результаты; overrides заменяют другие настройки.
+    """
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+    import django
+    django.setup()
+
+    from django.conf import settings
+    settings.SERVER_TIMING = {
+        **getattr(settings, 'SERVER_TIMING', {}), 'ENABLED': False
+    }
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    if database_name:
+        settings.DATABASES['default']['TEST']['NAME'] = database_name
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+
+def measure(func, repeat=20, warmup=3):
+    """Возвращает список длительностей вызова func в миллисекундах."""
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def percentile(timings, value):
+    """Перцентиль по методу ближайшего ранга."""
+    ordered = sorted(timings)
+    index = max(0, min(len(ordered) - 1,
+                       round(value / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def median(timings):
+    return statistics.median(timings)
@@ -0,0 +1,25 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+DATASET = {
+    'users': 10, 'categories': 3, 'genres': 5, 'titles': 10,
+    'reviews': 40, 'comments': 0, 'seed': 1
+}
+
+
+@pytest.fixture
+def dataset(request, settings):
+    """
+    Данные generate_dataset при выключенном кэше ответов API.
+    Размеры задаются маркером модуля или класса:
+    @pytest.mark.dataset(titles=30, reviews=150, seed=5).
+    """
+    settings.API_RESPONSE_CACHE = {
+        **settings.API_RESPONSE_CACHE, 'ENABLED': False
+    }
+    marker = request.node.get_closest_marker('dataset')
+    options = {**DATASET, **(marker.kwargs if marker else {})}
+    call_command('generate_dataset', stdout=StringIO(), **options)
+    return options
@@ -0,0 +1,15 @@
+import pytest
+
+from reviews.leaderboards import leaderboard_queue
+
+
+@pytest.fixture(autouse=True)
+def synchronous_leaderboards(settings):
+    """
+    Таблицы лидеров обновляются без фонового потока: ожидающие
+    изменения применяются вызовом process().
+    """
+    settings.LEADERBOARDS = {**settings.LEADERBOARDS, 'WORKER': False}
+    leaderboard_queue.take()
+    yield
+    leaderboard_queue.take()
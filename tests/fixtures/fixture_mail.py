@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def synchronous_mail(settings):
+    """Письма отправляются сразу, чтобы тесты видели их в mail.outbox."""
+    settings.EMAIL_QUEUE = {**settings.EMAIL_QUEUE, 'ENABLED': False}
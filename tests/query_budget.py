@@ -0,0 +1,24 @@
+from http import HTTPStatus
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def check_query_budget(client, url, budget, method='get', data=None,
+                       **kwargs):
+    """
+    Выполняет запрос к эндпоинту и проверяет, что число SQL-запросов
+    к базе данных не превышает бюджет эндпоинта.
+    """
+    with CaptureQueriesContext(connection) as context:
+        response = getattr(client, method)(url, data=data, **kwargs)
+    assert response.status_code < HTTPStatus.BAD_REQUEST, (
+        f'Проверьте, что {method.upper()}-запрос к `{url}` выполняется '
+        'успешно.'
+    )
+    queries = '\n'.join(query['sql'] for query in context.captured_queries)
+    assert len(context) <= budget, (
+        f'{method.upper()}-запрос к `{url}` выполнил {len(context)} '
+        f'SQL-запросов при бюджете {budget}:\n{queries}'
+    )
+    return response, len(context)
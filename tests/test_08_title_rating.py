@@ -0,0 +1,120 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.serializers import TitleWriteSerializer
+from reviews.models import Review, Title
+from tests.utils import create_reviews, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_title(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json()
+
+    def test_01_rating_follows_review_changes(self, client, admin_client,
+                                              admin, user, user_client,
+                                              moderator, moderator_client):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        assert self.get_title(client, title_id)['rating'] == 5, (
+            'Проверьте, что рейтинг произведения пересчитывается '
+            'при создании отзыва.'
+        )
+
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            ),
+            data={'score': 10}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_title(client, title_id)['rating'] == 6, (
+            'Проверьте, что рейтинг произведения пересчитывается '
+            'при изменении оценки отзыва.'
+        )
+
+        response = moderator_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_title(client, title_id)['rating'] == 7, (
+            'Проверьте, что рейтинг произведения пересчитывается '
+            'при удалении отзыва.'
+        )
+
+    def test_02_rating_follows_author_deletion(self, client, admin_client,
+                                               user, user_client):
+        reviews, titles = create_reviews(admin_client, {user: user_client})
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'Шедевр', 9)
+        assert self.get_title(client, title_id)['rating'] == 7
+
+        user.delete()
+        assert self.get_title(client, title_id)['rating'] == 9, (
+            'Проверьте, что рейтинг произведения пересчитывается '
+            'при каскадном удалении отзывов вместе с автором.'
+        )
+
+        response = admin_client.delete('/api/v1/users/TestAdmin/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        title = self.get_title(client, title_id)
+        assert title['rating'] is None, (
+            'Если у произведения не осталось отзывов - значением поля '
+            '`rating` должено быть `None`.'
+        )
+
+    def test_03_title_save_keeps_concurrent_reviews(
+        self, monkeypatch, client, admin_client, admin, user, user_client
+    ):
+        reviews, titles = create_reviews(admin_client, {user: user_client})
+        title_id = titles[0]['id']
+        update = TitleWriteSerializer.update
+
+        def update_after_review(serializer, instance, validated_data):
+            # Отзыв появляется, пока запрос держит загруженное произведение.
+            Review.objects.create(
+                title_id=title_id, author=admin, text='Отзыв', score=10
+            )
+            return update(serializer, instance, validated_data)
+
+        monkeypatch.setattr(
+            TitleWriteSerializer, 'update', update_after_review
+        )
+        response = admin_client.patch(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id),
+            data={'name': 'Новое название'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        title = Title.objects.get(pk=title_id)
+        assert (title.score_count, title.rating) == (2, 7), (
+            'Проверьте, что изменение произведения не перезаписывает '
+            'счётчики оценок, изменившиеся во время запроса.'
+        )
+
+        stale = Title.objects.get(pk=title_id)
+        Review.objects.filter(title_id=title_id, author=admin).delete()
+        stale.description = 'Сохранение из админки'
+        stale.save()
+        title = Title.objects.get(pk=title_id)
+        assert (title.score_count, title.rating) == (1, 5), (
+            'Проверьте, что сохранение загруженного произведения '
+            'не возвращает удалённые оценки.'
+        )
@@ -0,0 +1,135 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from reviews.models import Review, Title, User
+from tests.utils import create_reviews, create_titles
+
+
+def collect_pages(client, url):
+    results = []
+    pages = 0
+    while url:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` в курсорном режиме '
+            'пагинации возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что в курсорном режиме пагинации ответ не содержит '
+            'ключ `count`: подсчёт всех объектов не выполняется.'
+        )
+        results.extend(data['results'])
+        url = data['next']
+        pages += 1
+    return results, pages
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09CursorPagination:
+
+    def test_01_titles_cursor(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        for idx in range(6):
+            admin_client.post('/api/v1/titles/', data={
+                'name': f'Произведение {idx}',
+                'year': 2000,
+                'genre': [],
+                'category': 'films'
+            })
+        results, pages = collect_pages(
+            client, '/api/v1/titles/?pagination=cursor'
+        )
+        names = [title['name'] for title in results]
+        assert len(names) == len(titles) + 6 and pages == 2, (
+            'Проверьте, что курсорная пагинация `/api/v1/titles/` '
+            'возвращает все произведения по 5 на странице.'
+        )
+        assert names == sorted(names), (
+            'Проверьте, что в курсорном режиме произведения упорядочены '
+            'по названию.'
+        )
+
+        response = client.get('/api/v1/titles/')
+        assert response.json()['count'] == len(titles) + 6, (
+            'Проверьте, что пагинация по номеру страницы продолжает '
+            'работать без параметра `pagination`.'
+        )
+
+    def test_02_reviews_cursor(self, client, admin_client, admin, user,
+                               user_client, moderator, moderator_client):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/?pagination=cursor'
+        )
+        results, _ = collect_pages(client, url)
+        assert [review['id'] for review in results] == [
+            review['id'] for review in reversed(reviews)
+        ], (
+            'Проверьте, что в курсорном режиме отзывы упорядочены '
+            'от новых к старым.'
+        )
+
+    def test_03_users_cursor(self, admin_client, admin, user, moderator):
+        results, _ = collect_pages(
+            admin_client, '/api/v1/users/?pagination=cursor'
+        )
+        usernames = [item['username'] for item in results]
+        assert usernames == sorted(
+            [admin.username, user.username, moderator.username]
+        ), (
+            'Проверьте, что курсорная пагинация `/api/v1/users/` '
+            'упорядочивает пользователей по `username`.'
+        )
+
+    def test_04_duplicate_leading_keys(self, client):
+        titles = [
+            Title.objects.create(name='Дубль', year=2000) for _ in range(30)
+        ]
+        authors = [
+            User.objects.create(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            for idx in range(12)
+        ]
+        Review.objects.bulk_create(
+            Review(title=titles[0], author=author, text='Отзыв', score=5)
+            for author in authors
+        )
+        Review.objects.update(pub_date=timezone.now())
+        for url, expected in (
+            ('/api/v1/titles/?pagination=cursor',
+             sorted(title.id for title in titles)),
+            (f'/api/v1/titles/{titles[0].id}/reviews/?pagination=cursor',
+             sorted(Review.objects.values_list('id', flat=True))),
+        ):
+            with CaptureQueriesContext(connection) as context:
+                results, pages = collect_pages(client, url)
+            assert [item['id'] for item in results] == expected, (
+                'Проверьте, что курсорная пагинация не пропускает '
+                'и не повторяет строки с одинаковыми первыми полями порядка.'
+            )
+            assert not any(
+                'OFFSET' in query['sql'] for query in context.captured_queries
+            ), (
+                'Проверьте, что курсор хранит все поля порядка и страница '
+                'выбирается без OFFSET.'
+            )
+
+            previous = client.get(url).json()['next']
+            while previous:
+                data = client.get(previous).json()
+                page, previous = data['results'], data['previous']
+            assert [item['id'] for item in page] == expected[:5], (
+                'Проверьте, что ссылки `previous` курсорной пагинации '
+                'возвращают к первой странице.'
+            )
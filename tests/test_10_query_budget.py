@@ -0,0 +1,76 @@
+import pytest
+
+from tests.query_budget import check_query_budget
+from tests.utils import create_comments, create_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10QueryBudget:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_title_list_and_detail(self, client, admin_client):
+        titles, _, genres = create_titles(admin_client)
+        _, few_titles_queries = check_query_budget(
+            client, self.TITLES_URL, 3
+        )
+        for idx in range(10):
+            admin_client.post(self.TITLES_URL, data={
+                'name': f'Произведение {idx}',
+                'year': 2000,
+                'genre': [genre['slug'] for genre in genres],
+                'category': 'films'
+            })
+        _, many_titles_queries = check_query_budget(
+            client, f'{self.TITLES_URL}?page=2', 3
+        )
+        assert few_titles_queries == many_titles_queries, (
+            f'Проверьте, что число SQL-запросов к `{self.TITLES_URL}` '
+            'не зависит от количества произведений на странице.'
+        )
+        check_query_budget(
+            client,
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            2
+        )
+
+    def test_02_nested_reviews(self, admin_client, user_client,
+                               moderator_client, user, moderator):
+        author_map = {user: user_client, moderator: moderator_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        admin_client.get(url)
+
+        _, list_queries = check_query_budget(admin_client, url, 2)
+        check_query_budget(admin_client, f'{url}{reviews[0]["id"]}/', 1)
+        # Произведение с проверкой повторного отзыва, BEGIN, INSERT
+        # и пересчёт рейтинга.
+        check_query_budget(
+            admin_client, url, 4, method='post',
+            data={'text': 'Отзыв', 'score': 5}
+        )
+        _, more_reviews_queries = check_query_budget(admin_client, url, 2)
+        assert list_queries == more_reviews_queries, (
+            f'Проверьте, что число SQL-запросов к `{url}` не зависит '
+            'от количества авторов отзывов на странице.'
+        )
+
+    def test_03_nested_comments(self, admin_client, user_client,
+                                moderator_client, user, moderator):
+        author_map = {user: user_client, moderator: moderator_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        admin_client.get(url)
+
+        check_query_budget(admin_client, url, 2)
+        check_query_budget(admin_client, f'{url}{comments[0]["id"]}/', 1)
+        check_query_budget(
+            admin_client, url, 3, method='post', data={'text': 'Комментарий'}
+        )
@@ -0,0 +1,111 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+
+from api.cache import check_shared_cache, get_cache_stats, get_model_version
+from reviews.models import Genre
+from tests.utils import create_genre, create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ResponseCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    GENRES_URL = '/api/v1/genres/'
+
+    def test_01_genre_list_cached(self, client, admin_client):
+        create_genre(admin_client)
+        stats_before = get_cache_stats()
+        assert client.get(self.GENRES_URL)['X-Cache'] == 'MISS'
+        response = client.get(self.GENRES_URL)
+        stats_after = get_cache_stats()
+        assert (
+            stats_after['hits'] - stats_before['hits'],
+            stats_after['misses'] - stats_before['misses']
+        ) == (1, 1), 'Проверьте счётчики попаданий и промахов кэша.'
+        assert response['X-Cache'] == 'HIT', (
+            f'Проверьте, что повторный GET-запрос к `{self.GENRES_URL}` '
+            'обслуживается из кэша.'
+        )
+        assert response.json()['count'] == 3
+
+        admin_client.post(
+            self.GENRES_URL, data={'name': 'Вестерн', 'slug': 'western'}
+        )
+        response = client.get(self.GENRES_URL)
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что создание жанра делает кэш списка жанров '
+            'устаревшим.'
+        )
+        assert response.json()['count'] == 4
+
+    def test_02_query_string_normalized(self, client, admin_client):
+        create_titles(admin_client)
+        client.get(f'{self.TITLES_URL}?year=1984&category=films')
+        response = client.get(
+            f'{self.TITLES_URL}?category=films&genre=&year=1984'
+        )
+        assert response['X-Cache'] == 'HIT', (
+            'Проверьте, что ключ кэша не зависит от порядка параметров '
+            'и пустых значений фильтров.'
+        )
+        assert response.json()['count'] == 1
+
+    def test_03_review_invalidates_title(self, client, admin_client,
+                                         user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        assert client.get(url).json()['rating'] is None
+        assert client.get(url)['X-Cache'] == 'HIT'
+
+        create_single_review(user_client, titles[0]['id'], 'Отлично', 8)
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['rating'] == 8, (
+            'Проверьте, что новый отзыв делает кэш произведения '
+            'устаревшим, так как меняется рейтинг.'
+        )
+
+    def test_04_genre_links_invalidate_title(self, client, admin_client):
+        titles, _, genres = create_titles(admin_client)
+        url = f'{self.TITLES_URL}{titles[1]["id"]}/'
+        client.get(url)
+        admin_client.patch(url, data={'genre': [genres[0]['slug']]})
+        response = client.get(url)
+        assert [genre['slug'] for genre in response.json()['genre']] == [
+            genres[0]['slug']
+        ], (
+            'Проверьте, что изменение жанров произведения делает кэш '
+            'произведения устаревшим.'
+        )
+
+    def test_05_version_bumped_after_commit(self, client):
+        with transaction.atomic():
+            Genre.objects.create(name='Драма', slug='drama')
+            version = get_model_version(Genre)
+            # Ответ, собранный до фиксации, получает ключ новой версии.
+            client.get(self.GENRES_URL)
+        assert get_model_version(Genre) != version, (
+            'Проверьте, что версия модели увеличивается после фиксации '
+            'транзакции.'
+        )
+        response = client.get(self.GENRES_URL)
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что ответ, закэшированный до фиксации транзакции, '
+            'не используется после неё.'
+        )
+
+    def test_06_process_local_cache_refused(self, settings, tmp_path):
+        settings.API_RESPONSE_CACHE = {
+            **settings.API_RESPONSE_CACHE, 'SINGLE_PROCESS': False
+        }
+        with pytest.raises(ImproperlyConfigured):
+            check_shared_cache()
+        settings.API_RESPONSE_CACHE = {
+            **settings.API_RESPONSE_CACHE, 'ALIAS': 'shared'
+        }
+        settings.CACHES = {**settings.CACHES, 'shared': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path),
+        }}
+        check_shared_cache()
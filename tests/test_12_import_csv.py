@@ -0,0 +1,51 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Avg
+
+from reviews.aggregates import get_rating_prior
+from reviews.models import Comment, GenreTitle, Review, Title, User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ImportCsv:
+
+    def test_01_import_static_data(self, client):
+        output = StringIO()
+        call_command('import_csv', batch_size=7, stdout=output)
+        assert 'строк/с' in output.getvalue(), (
+            'Проверьте, что команда `import_csv` сообщает скорость '
+            'загрузки каждого файла.'
+        )
+        assert (
+            User.objects.count(), Title.objects.count(),
+            GenreTitle.objects.count(), Review.objects.count(),
+            Comment.objects.count()
+        ) == (5, 32, 42, 72, 3), (
+            'Проверьте, что команда `import_csv` загружает все строки '
+            'из файлов static/data.'
+        )
+
+        review = Review.objects.get(pk=1)
+        assert review.text.startswith('Ставлю десять звёзд!\n'), (
+            'Проверьте, что многострочные тексты отзывов загружаются '
+            'полностью.'
+        )
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что дата публикации берётся из файла.'
+        )
+
+        title = Title.objects.get(pk=1)
+        assert title.score_count == title.reviews.count()
+        response = client.get(f'/api/v1/titles/{title.pk}/')
+        assert response.json()['rating'] == 10, (
+            'Проверьте, что после загрузки рейтинги произведений '
+            'пересчитываются.'
+        )
+
+        mean = Review.objects.aggregate(mean=Avg('score'))['mean']
+        assert get_rating_prior()[0] == pytest.approx(mean), (
+            'Проверьте, что после загрузки средняя оценка RatingPrior '
+            'пересчитывается.'
+        )
@@ -0,0 +1,79 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Avg
+
+from reviews.aggregates import get_rating_prior
+from reviews.models import Comment, Review, Title, User
+
+DATASET = {
+    'users': 20, 'categories': 3, 'genres': 5, 'titles': 15,
+    'reviews': 120, 'comments': 40, 'seed': 7
+}
+
+
+def snapshot():
+    return (
+        list(Review.objects.order_by('id').values_list(
+            'title_id', 'author_id', 'score', 'pub_date'
+        )),
+        list(Title.objects.order_by('id').values_list(
+            'category_id', 'year', 'rating'
+        )),
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13GenerateDataset:
+
+    def test_01_dataset_is_reproducible(self):
+        call_command('generate_dataset', stdout=StringIO(), **DATASET)
+        assert Review.objects.count() == DATASET['reviews']
+        assert Comment.objects.count() == DATASET['comments']
+        first = snapshot()
+
+        call_command(
+            'generate_dataset', clear=True, stdout=StringIO(), **DATASET
+        )
+        assert snapshot() == first, (
+            'Проверьте, что команда `generate_dataset` с одинаковым '
+            '`--seed` создаёт одинаковые данные.'
+        )
+
+    def test_02_dataset_respects_unique_review(self):
+        call_command(
+            'generate_dataset', stdout=StringIO(),
+            **{**DATASET, 'reviews': 290}
+        )
+        pairs = set(Review.objects.values_list('title_id', 'author_id'))
+        assert len(pairs) == 290
+        title = Title.objects.order_by('-score_count').first()
+        assert title.score_count == title.reviews.count(), (
+            'Проверьте, что после генерации рейтинги произведений '
+            'пересчитываются.'
+        )
+
+        mean = Review.objects.aggregate(mean=Avg('score'))['mean']
+        assert get_rating_prior()[0] == pytest.approx(mean), (
+            'Проверьте, что после генерации средняя оценка RatingPrior '
+            'пересчитывается.'
+        )
+
+    def test_03_clear_keeps_other_users(self, admin, user_superuser):
+        call_command('generate_dataset', stdout=StringIO(), **DATASET)
+        call_command(
+            'generate_dataset', clear=True, stdout=StringIO(), **DATASET
+        )
+        assert set(User.objects.exclude(
+            username__startswith='user'
+        ).values_list('username', flat=True)) == {
+            admin.username, user_superuser.username
+        }, (
+            'Проверьте, что `generate_dataset --clear` не удаляет '
+            'пользователей, созданных не командой.'
+        )
+        assert User.objects.count() == DATASET['users'] + 2
+        assert not Review.objects.filter(
+            author__in=[admin, user_superuser]
+        ).exists(), 'Проверьте, что отзывы пишут созданные пользователи.'
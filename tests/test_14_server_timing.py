@@ -0,0 +1,67 @@
+import json
+import logging
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.fixture
+def server_timing(settings):
+    settings.SERVER_TIMING = {**settings.SERVER_TIMING, 'ENABLED': True}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ServerTiming:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_server_timing_header(self, server_timing, client,
+                                     admin_client):
+        create_titles(admin_client)
+        response = client.get(self.TITLES_URL)
+        phases = {
+            entry.split(';')[0]: entry
+            for entry in response['Server-Timing'].split(', ')
+        }
+        for name in ('db', 'permissions', 'view', 'serialize', 'render',
+                     'total'):
+            assert name in phases, (
+                f'Проверьте, что заголовок `Server-Timing` ответа на '
+                f'GET-запрос к `{self.TITLES_URL}` содержит фазу `{name}`.'
+            )
+        assert 'desc="3 queries"' in phases['db']
+
+    def test_02_slow_query_plan_logged(self, client, admin_client, settings,
+                                       caplog):
+        settings.SERVER_TIMING = {
+            'ENABLED': True, 'SLOW_QUERY_MS': 0, 'SLOW_QUERY_LIMIT': 1
+        }
+        create_titles(admin_client)
+        with caplog.at_level(logging.INFO, logger='api.timing'):
+            client.get(self.TITLES_URL)
+        records = [json.loads(record.getMessage())
+                   for record in caplog.records
+                   if record.name == 'api.timing']
+        records = [
+            record for record in records
+            if record['method'] == 'GET'
+        ]
+        assert records[0]['path'] == self.TITLES_URL
+        assert records[0]['queries'] == 3
+        slow = [record for record in records if 'slow_query_ms' in record]
+        assert len(slow) == 1 and slow[0]['plan'], (
+            'Проверьте, что медленные SQL-запросы логируются вместе '
+            'с планом выполнения.'
+        )
+
+    def test_03_disabled_by_default(self, client, caplog):
+        with caplog.at_level(logging.INFO, logger='api.timing'):
+            response = client.get(self.TITLES_URL)
+        assert 'Server-Timing' not in response, (
+            'Проверьте, что заголовок `Server-Timing` не добавляется '
+            'без явного включения SERVER_TIMING.'
+        )
+        assert not [
+            record for record in caplog.records if record.name == 'api.timing'
+        ]
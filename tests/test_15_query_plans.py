@@ -0,0 +1,155 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from api.filters import CasefoldSearchFilter, TitleFilter
+from api.pagination import KeysetCursorPagination
+from reviews.models import Comment, Genre, Review, Title, User
+
+
+def check_uses_index(queryset, description, allow_sort=False):
+    plan = queryset.explain()
+    for line in plan.splitlines():
+        if ' SCAN ' in f' {line}':
+            assert 'INDEX' in line, (
+                f'{description}: запрос выполняет полный просмотр таблицы '
+                f'вместо поиска по индексу.\n{plan}'
+            )
+    if not allow_sort:
+        assert 'TEMP B-TREE' not in plan, (
+            f'{description}: запрос сортирует строки во временном дереве '
+            f'вместо чтения в порядке индекса.\n{plan}'
+        )
+    return plan
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='EXPLAIN QUERY PLAN есть в SQLite'
+)
+@pytest.mark.django_db
+class Test15QueryPlans:
+
+    @pytest.fixture(autouse=True)
+    def dataset(self):
+        call_command(
+            'generate_dataset', titles=300, reviews=3000, comments=300,
+            users=100, stdout=StringIO()
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def test_01_reviews_of_title(self):
+        plan = check_uses_index(
+            Review.objects.filter(title_id=1).order_by('-pub_date', 'id')[:5],
+            'Список отзывов произведения'
+        )
+        assert 'review_title_pub_date_idx' in plan
+
+    def test_02_comments_of_review(self):
+        plan = check_uses_index(
+            Comment.objects.filter(review_id=1).order_by(
+                '-pub_date', 'id'
+            )[:5],
+            'Список комментариев к отзыву'
+        )
+        assert 'comment_review_pub_date_idx' in plan
+
+    def test_03_review_of_author(self):
+        check_uses_index(
+            Review.objects.filter(title_id=1, author_id=1),
+            'Проверка повторного отзыва'
+        )
+
+    def test_04_title_filters(self):
+        def filtered(**params):
+            return TitleFilter(params, queryset=Title.objects.all()).qs[:5]
+
+        check_uses_index(Title.objects.all()[:5], 'Список произведений')
+        check_uses_index(filtered(year=1994), 'Фильтр по году')
+        check_uses_index(
+            filtered(name='Побег из Шоушенка'), 'Фильтр по названию',
+            allow_sort=True
+        )
+        # Категория и жанр находятся по индексу slug_search, после чего
+        # SQLite сортирует только их произведения.
+        check_uses_index(
+            filtered(category='Category-1'), 'Фильтр по категории',
+            allow_sort=True
+        )
+        check_uses_index(
+            filtered(genre='GENRE-1'), 'Фильтр по жанру', allow_sort=True
+        )
+
+    def test_05_casefold_search(self):
+        search = CasefoldSearchFilter()
+        plan = check_uses_index(
+            User.objects.filter(**{
+                search.construct_search('^username_search'): 'user1'
+            }).order_by('username')[:5],
+            'Поиск пользователей по началу имени', allow_sort=True
+        )
+        assert 'username_search' in plan
+        check_uses_index(
+            Genre.objects.filter(**{
+                search.construct_search('=name_search'): 'жанр 1'
+            }),
+            'Поиск жанра по названию', allow_sort=True
+        )
+
+    def test_06_title_ordering(self):
+        for ordering, index in (
+            (('-weighted_rating', '-id'), 'title_weighted_rating_idx'),
+            (('weighted_rating', 'id'), 'title_weighted_rating_idx'),
+            (('-score_count', '-id'), 'title_score_count_idx'),
+        ):
+            plan = check_uses_index(
+                Title.objects.select_related('category').order_by(
+                    *ordering
+                )[:5],
+                f'Сортировка произведений {ordering}'
+            )
+            assert index in plan
+
+    def test_07_review_feed(self):
+        plan = check_uses_index(
+            Review.objects.select_related('author', 'title').order_by(
+                '-pub_date', '-id'
+            )[:5],
+            'Лента отзывов'
+        )
+        assert 'review_pub_date_idx' in plan
+
+    def test_08_author_history(self):
+        for model, index in (
+            (Review, 'review_author_pub_date_idx'),
+            (Comment, 'comment_author_pub_date_idx'),
+        ):
+            plan = check_uses_index(
+                model.objects.filter(author_id=1).order_by(
+                    '-pub_date', '-id'
+                )[:5],
+                f'История {model.__name__} пользователя'
+            )
+            assert index in plan
+
+    def test_09_keyset_page(self):
+        paginator = KeysetCursorPagination()
+        review = Review.objects.filter(title_id=1).first()
+        for queryset, ordering, position, index in (
+            (Title.objects.all(), ('name', 'id'), ['Title-150', 150],
+             'title_name_id_idx'),
+            (Review.objects.filter(title_id=1), ('-pub_date', 'id'),
+             [review.pub_date, review.id], 'review_title_pub_date_idx'),
+        ):
+            plan = check_uses_index(
+                queryset.order_by(*ordering).filter(
+                    paginator.get_position_filter(ordering, position)
+                )[:6],
+                f'Курсорная страница {ordering}'
+            )
+            assert 'SEARCH' in plan and index in plan, (
+                'Проверьте, что курсорная страница начинается поиском '
+                f'по индексу, а не просмотром с начала.\n{plan}'
+            )
@@ -0,0 +1,68 @@
+import pytest
+from django.db import OperationalError, connection
+
+from reviews.sqlite import retry_on_lock
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16SQLite:
+
+    def test_01_pragmas_applied(self, settings):
+        expected = {'synchronous': 1, 'temp_store': 2, 'busy_timeout': 5000}
+        connection.close()
+        with connection.cursor() as cursor:
+            for name, value in expected.items():
+                cursor.execute(f'PRAGMA {name}')
+                assert cursor.fetchone()[0] == value, (
+                    f'Проверьте, что при открытии соединения с SQLite '
+                    f'применяется `PRAGMA {name}` из SQLITE_PRAGMAS.'
+                )
+
+    def test_02_retry_on_lock(self, settings):
+        settings.SQLITE_LOCK_RETRY = {'ATTEMPTS': 3, 'BASE_DELAY': 0}
+        calls = []
+
+        @retry_on_lock
+        def write():
+            calls.append(1)
+            if len(calls) == 1:
+                raise OperationalError('database is locked')
+            if len(calls) == 2:
+                raise OperationalError(
+                    'database table is locked: reviews_title'
+                )
+            return 'ok'
+
+        assert write() == 'ok' and len(calls) == 3, (
+            'Проверьте, что `retry_on_lock` повторяет запись, '
+            'пока база данных заблокирована.'
+        )
+
+        calls.clear()
+
+        @retry_on_lock
+        def broken_write():
+            calls.append(1)
+            raise OperationalError('no such table: missing')
+
+        with pytest.raises(OperationalError):
+            broken_write()
+        assert len(calls) == 1, (
+            'Проверьте, что `retry_on_lock` не повторяет запись '
+            'при ошибках, не связанных с блокировкой.'
+        )
+
+    def test_03_retry_gives_up(self, settings):
+        settings.SQLITE_LOCK_RETRY = {'ATTEMPTS': 2, 'BASE_DELAY': 0}
+        calls = []
+
+        @retry_on_lock
+        def write():
+            calls.append(1)
+            raise OperationalError('database is locked')
+
+        with pytest.raises(OperationalError):
+            write()
+        assert len(calls) == 2, (
+            'Проверьте, что `retry_on_lock` делает не больше ATTEMPTS попыток.'
+        )
@@ -0,0 +1,127 @@
+import pytest
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.mail.backends.locmem import EmailBackend
+
+from api import utils
+from api.mail_queue import MailQueue
+
+
+class FlakyBackend(EmailBackend):
+    """Почтовый бэкенд, у которого первые отправки завершаются ошибкой."""
+
+    failures = 0
+
+    def send_messages(self, messages):
+        if FlakyBackend.failures:
+            FlakyBackend.failures -= 1
+            raise ConnectionError('SMTP недоступен')
+        return super().send_messages(messages)
+
+
+class RejectingBackend(EmailBackend):
+    """Почтовый бэкенд, который не принимает письма для bad@yamdb.fake."""
+
+    def send_messages(self, messages):
+        if any('bad@yamdb.fake' in message.to for message in messages):
+            raise ConnectionError('Адрес отклонён')
+        return super().send_messages(messages)
+
+
+def make_queue(**config):
+    return MailQueue(ENABLED=True, IDLE_TIMEOUT=0.1, BASE_DELAY=0.01,
+                     **config)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17MailQueue:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def test_01_signup_enqueues_email(self, client, settings, tmp_path,
+                                      monkeypatch):
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.filebased.EmailBackend'
+        )
+        settings.EMAIL_FILE_PATH = str(tmp_path)
+        queue = make_queue()
+        monkeypatch.setattr(utils, 'mail_queue', queue)
+
+        response = client.post(self.URL_SIGNUP, data={
+            'email': 'queued@yamdb.fake', 'username': 'queued'
+        })
+        assert response.status_code == 200
+        assert queue.flush(timeout=5), (
+            'Проверьте, что письма из очереди отправляются фоновыми потоками.'
+        )
+        sent = ''.join(path.read_text() for path in tmp_path.iterdir())
+        assert 'queued@yamdb.fake' in sent, (
+            'Проверьте, что письмо отправляется на `email` из запроса.'
+        )
+        assert 'Ваш код подтверждения' in sent, (
+            f'Проверьте, что при POST-запросе к `{self.URL_SIGNUP}` '
+            'письмо с кодом подтверждения ставится в очередь отправки.'
+        )
+        stats = queue.get_stats()
+        assert stats['sent'] == 1 and stats['depth'] == 0
+        assert stats['latency_p95_ms'] is not None
+
+    def test_02_batches_share_connection(self, settings, tmp_path):
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.filebased.EmailBackend'
+        )
+        settings.EMAIL_FILE_PATH = str(tmp_path)
+        queue = make_queue(WORKERS=1, BATCH_WAIT=0.2)
+        for number in range(20):
+            queue.enqueue(EmailMessage(
+                'Тема', 'Текст', None, [f'user{number}@yamdb.fake']
+            ))
+        assert queue.flush(timeout=5)
+
+        stats = queue.get_stats()
+        assert stats['sent'] == 20
+        assert stats['batches'] < 20, (
+            'Проверьте, что письма из очереди отправляются пачками.'
+        )
+        assert len(list(tmp_path.iterdir())) == 1, (
+            'Проверьте, что пачки писем отправляются через одно '
+            'соединение с почтовым бэкендом.'
+        )
+
+    def test_03_retry_with_backoff(self, settings):
+        settings.EMAIL_BACKEND = 'tests.test_17_mail_queue.FlakyBackend'
+        outbox_before = len(mail.outbox)
+        FlakyBackend.failures = 2
+        queue = make_queue(MAX_ATTEMPTS=3)
+        queue.enqueue(EmailMessage('Тема', 'Текст', None, ['a@yamdb.fake']))
+        assert queue.flush(timeout=5)
+
+        stats = queue.get_stats()
+        assert stats['retried'] == 2 and stats['sent'] == 1, (
+            'Проверьте, что неудачная отправка письма повторяется.'
+        )
+        assert len(mail.outbox) == outbox_before + 1
+
+        FlakyBackend.failures = 3
+        queue.enqueue(EmailMessage('Тема', 'Текст', None, ['b@yamdb.fake']))
+        assert queue.flush(timeout=5)
+        assert queue.get_stats()['failed'] == 1, (
+            'Проверьте, что после MAX_ATTEMPTS попыток письмо отбрасывается.'
+        )
+
+    def test_04_partial_batch_failure(self, settings):
+        settings.EMAIL_BACKEND = 'tests.test_17_mail_queue.RejectingBackend'
+        outbox_before = len(mail.outbox)
+        queue = make_queue(WORKERS=1, BATCH_WAIT=0.2, MAX_ATTEMPTS=2)
+        recipients = ['a@yamdb.fake', 'bad@yamdb.fake', 'c@yamdb.fake']
+        for recipient in recipients:
+            queue.enqueue(EmailMessage('Тема', 'Текст', None, [recipient]))
+        assert queue.flush(timeout=5)
+
+        delivered = [message.to[0] for message in mail.outbox[outbox_before:]]
+        assert sorted(delivered) == ['a@yamdb.fake', 'c@yamdb.fake'], (
+            'Проверьте, что при ошибке внутри пачки повторяются только '
+            'неотправленные письма и адресаты не получают дубликатов.'
+        )
+        stats = queue.get_stats()
+        assert (stats['sent'], stats['failed']) == (2, 1)
@@ -0,0 +1,111 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import caches
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.authentication import STATE_KEY, RoleAccessToken, get_generation
+from tests.query_budget import check_query_budget
+from tests.utils import create_reviews
+
+
+def make_client(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18JWTPrincipal:
+
+    URL_TOKEN = '/api/v1/auth/token/'
+    URL_GENRES = '/api/v1/genres/'
+    URL_ME = '/api/v1/users/me/'
+
+    def test_01_token_contains_role_claims(self, client, moderator):
+        response = client.post(self.URL_TOKEN, data={
+            'username': moderator.username,
+            'confirmation_code': default_token_generator.make_token(
+                moderator
+            ),
+        })
+        assert response.status_code == HTTPStatus.OK
+        assert 'token' in response.json(), (
+            f'Проверьте, что POST-запрос к `{self.URL_TOKEN}` с корректным '
+            'кодом подтверждения возвращает токен в поле `token`.'
+        )
+        token = AccessToken(response.json()['token'])
+        assert (token['role'], token['is_staff'], token['is_superuser']) == (
+            'moderator', False, False
+        ), 'Проверьте, что токен содержит роль и флаги администратора.'
+
+    def test_02_no_user_query_on_read(self, client, admin_client, user):
+        user_client = make_client(RoleAccessToken.for_user(user))
+        _, titles = create_reviews(admin_client, {user: user_client})
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        user_client.get(url)
+
+        _, anonymous_queries = check_query_budget(client, url, 5)
+        _, user_queries = check_query_budget(user_client, url, 5)
+        assert user_queries == anonymous_queries, (
+            'Проверьте, что аутентификация по токену не запрашивает '
+            'пользователя из базы данных на каждый запрос.'
+        )
+
+    def test_03_demoted_admin_loses_rights(self, admin):
+        client = make_client(RoleAccessToken.for_user(admin))
+        legacy_client = make_client(AccessToken.for_user(admin))
+        data = {'name': 'Жанр', 'slug': 'genre'}
+        response = client.post(self.URL_GENRES, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+
+        admin.role = 'user'
+        admin.save()
+        response = client.post(self.URL_GENRES, data=data)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что токен, выданный до смены роли, '
+            'перестаёт приниматься.'
+        )
+        response = legacy_client.post(self.URL_GENRES, data=data)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что права пользователя определяются '
+            'его текущей ролью.'
+        )
+
+    def test_04_inactive_user_rejected(self, user):
+        client = make_client(RoleAccessToken.for_user(user))
+        assert client.get(self.URL_ME).status_code == HTTPStatus.OK
+        user.is_active = False
+        user.save()
+        assert client.get(self.URL_ME).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), 'Проверьте, что заблокированный пользователь теряет доступ.'
+
+    def test_05_me_loads_full_profile(self, user):
+        client = make_client(RoleAccessToken.for_user(user))
+        response = client.get(self.URL_ME)
+        assert response.json()['email'] == user.email
+        assert response.json()['bio'] == user.bio
+        response = client.patch(self.URL_ME, data={'bio': 'Новая биография'})
+        assert response.status_code == HTTPStatus.OK
+        email = user.email
+        user.refresh_from_db()
+        assert (user.bio, user.email) == ('Новая биография', email), (
+            f'Проверьте, что PATCH-запрос к `{self.URL_ME}` сохраняет '
+            'профиль пользователя, не затирая остальные поля.'
+        )
+
+    def test_06_state_in_shared_cache(self, settings, user):
+        cache = caches[settings.API_RESPONSE_CACHE['ALIAS']]
+        key = STATE_KEY.format(user.pk)
+        client = make_client(RoleAccessToken.for_user(user))
+        assert client.get(self.URL_ME).status_code == HTTPStatus.OK
+        assert cache.get(key, version=get_generation()), (
+            'Проверьте, что состояние пользователя хранится в общем '
+            'для процессов кэше ответов API.'
+        )
+        user.role = 'moderator'
+        user.save()
+        assert cache.get(key, version=get_generation()) is None
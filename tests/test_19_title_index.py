@@ -0,0 +1,133 @@
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api import title_index as title_index_module
+from reviews.models import Genre, GenreTitle, Review, Title, User
+from tests.query_budget import check_query_budget
+
+pytest.importorskip('numpy')
+
+
+@pytest.fixture
+def title_index(settings, dataset):
+    settings.TITLE_INDEX = {'ENABLED': True}
+    return settings
+
+
+@pytest.mark.dataset(
+    users=20, genres=70, titles=40, reviews=200, seed=3
+)
+@pytest.mark.django_db(transaction=True)
+class Test19TitleIndex:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def get_both(self, client, settings, query):
+        settings.TITLE_INDEX = {'ENABLED': False}
+        expected = client.get(self.TITLES_URL, query).json()
+        settings.TITLE_INDEX = {'ENABLED': True}
+        return client.get(self.TITLES_URL, query).json(), expected
+
+    def test_01_same_results_as_orm(self, client, title_index):
+        title = Title.objects.filter(genres__isnull=False).last()
+        genre = Genre.objects.order_by('id').last()
+        queries = [
+            {},
+            {'page': 3},
+            {'genre': title.genres.first().slug.upper()},
+            {'genre': genre.slug},
+            {'category': title.category.slug},
+            {'year': title.year, 'category': title.category.slug},
+            {'name': title.name},
+            {'genre': 'missing'},
+            {'genre': title.genres.first().slug,
+             'category': title.category.slug, 'page': 2},
+            {'ordering': '-rating'},
+            {'ordering': 'rating', 'page': 2},
+            {'ordering': 'year,-name', 'category': title.category.slug},
+            {'ordering': '-review_count,name', 'page': 3},
+            {'ordering': '-name'},
+        ]
+        for query in queries:
+            actual, expected = self.get_both(client, title_index, query)
+            assert actual == expected, (
+                'Проверьте, что список произведений через колоночный индекс '
+                f'совпадает с результатом ORM для параметров {query}.'
+            )
+
+    def test_02_refresh_by_version(self, client, title_index, admin_client):
+        title = Title.objects.filter(rating__isnull=False).first()
+        genre = Genre.objects.exclude(titles=title).first()
+        client.get(self.TITLES_URL)
+
+        admin_client.patch(f'{self.TITLES_URL}{title.id}/', data={
+            'genre': [genre.slug]
+        })
+        actual, expected = self.get_both(
+            client, title_index, {'genre': genre.slug}
+        )
+        assert actual == expected, (
+            'Проверьте, что колоночный индекс обновляется '
+            'после изменения жанров произведения.'
+        )
+
+        admin_client.post(f'{self.TITLES_URL}{title.id}/reviews/', data={
+            'text': 'Отзыв', 'score': 1
+        })
+        actual, expected = self.get_both(client, title_index, {})
+        assert actual == expected
+
+    def test_03_page_hydration_queries(self, client, title_index):
+        genre = Genre.objects.filter(titles__isnull=False).first()
+        client.get(self.TITLES_URL)
+        # Страница произведений и их жанры; фильтрация и подсчёт
+        # выполняются в памяти.
+        check_query_budget(
+            client, f'{self.TITLES_URL}?genre={genre.slug}&page=1', 2
+        )
+
+    def test_04_row_deltas(self, client, title_index):
+        title = Title.objects.filter(genres__isnull=False).first()
+        genre = Genre.objects.exclude(titles=title).first()
+        user = User.objects.first()
+        client.get(self.TITLES_URL)
+        changes = (
+            lambda: Review.objects.exclude(author=user).filter(
+                title=title
+            ).first().delete(),
+            lambda: Review.objects.create(
+                title=Title.objects.exclude(reviews__author=user).first(),
+                author=user, text='Отзыв', score=10
+            ),
+            lambda: GenreTitle.objects.create(title=title, genre=genre),
+            lambda: Title.objects.filter(pk=title.pk).first().save(),
+            lambda: Title.objects.create(name='Аааа', year=2001),
+            lambda: Title.objects.order_by('-id').first().delete(),
+        )
+        for change in changes:
+            change()
+            with CaptureQueriesContext(connection) as context:
+                client.get(self.TITLES_URL, {'ordering': '-rating'})
+            scans = [
+                query['sql'] for query in context.captured_queries
+                if 'FROM "reviews_title"' in query['sql']
+                and 'WHERE' not in query['sql']
+            ]
+            assert not scans, (
+                'Проверьте, что колоночный индекс перечитывает только '
+                f'изменившиеся произведения:\n{scans}'
+            )
+            for query in ({'ordering': '-rating'}, {'genre': genre.slug}):
+                actual, expected = self.get_both(client, title_index, query)
+                assert actual == expected, (
+                    'Проверьте, что построчное обновление индекса '
+                    f'совпадает с ORM для параметров {query}.'
+                )
+
+    def test_05_numpy_required(self, client, title_index, monkeypatch):
+        monkeypatch.setattr(title_index_module, 'np', None)
+        with pytest.raises(ImproperlyConfigured):
+            client.get(self.TITLES_URL)
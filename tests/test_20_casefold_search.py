@@ -0,0 +1,84 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.fields import normalize_search
+from reviews.models import Genre, Title, User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20CasefoldSearch:
+
+    GENRES_URL = '/api/v1/genres/'
+    TITLES_URL = '/api/v1/titles/'
+    USERS_URL = '/api/v1/users/'
+
+    def test_01_cyrillic_search(self, admin_client):
+        for name, slug in (('Драма', 'drama'), ('Комедия', 'comedy')):
+            admin_client.post(self.GENRES_URL, data={
+                'name': name, 'slug': slug
+            })
+        for term in ('драма', 'ДРАМ', 'рама'):
+            response = admin_client.get(self.GENRES_URL, {'search': term})
+            slugs = [genre['slug'] for genre in response.json()['results']]
+            assert slugs == ['drama'], (
+                f'Проверьте, что поиск жанров по `{term}` не зависит '
+                'от регистра кириллических букв.'
+            )
+
+    def test_02_title_filters(self, admin_client):
+        admin_client.post(self.GENRES_URL, data={
+            'name': 'Ужасы', 'slug': 'horror'
+        })
+        admin_client.post('/api/v1/categories/', data={
+            'name': 'Фильм', 'slug': 'films'
+        })
+        admin_client.post(self.TITLES_URL, data={
+            'name': 'Сияние', 'year': 1980,
+            'genre': ['horror'], 'category': 'films'
+        })
+        for query in (
+            {'name': 'СИЯНИЕ'}, {'genre': 'Horror'}, {'category': 'FILMS'}
+        ):
+            response = admin_client.get(self.TITLES_URL, query)
+            assert response.json()['count'] == 1, (
+                f'Проверьте, что фильтр произведений {query} '
+                'не зависит от регистра.'
+            )
+
+    def test_03_user_search(self, admin_client, admin):
+        User.objects.create_user(username='Ёжик', email='hedgehog@yamdb.fake')
+        for term in ('ёж', 'ЖИК'):
+            response = admin_client.get(self.USERS_URL, {'search': term})
+            usernames = [
+                user['username'] for user in response.json()['results']
+            ]
+            assert usernames == ['Ёжик'], (
+                'Проверьте, что поиск пользователей находит подстроку '
+                f'имени `{term}` без учёта регистра.'
+            )
+        response = admin_client.get(
+            self.USERS_URL, {'search': admin.username.upper()}
+        )
+        assert response.json()['count'] == 1
+
+    def test_04_shadow_columns_maintained(self):
+        genre = Genre.objects.create(name='Научная Фантастика', slug='SciFi')
+        assert (genre.name_search, genre.slug_search) == (
+            'научная фантастика', 'scifi'
+        )
+        genre.name = 'ФЭНТЕЗИ'
+        genre.save()
+        assert Genre.objects.filter(name_search='фэнтези').exists(), (
+            'Проверьте, что теневая колонка обновляется при сохранении.'
+        )
+
+        call_command(
+            'generate_dataset', users=5, categories=2, genres=2, titles=5,
+            reviews=5, comments=0, clear=True, stdout=StringIO()
+        )
+        for title in Title.objects.all():
+            assert title.name_search == normalize_search(title.name), (
+                'Проверьте, что generate_dataset заполняет теневые колонки.'
+            )
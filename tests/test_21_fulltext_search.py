@@ -0,0 +1,117 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from reviews.fulltext import build_match, review_fulltext
+from reviews.models import Review, Title
+from tests.utils import create_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21FullTextSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+    SEARCH_URL = '/api/v1/reviews/search/'
+
+    def test_01_build_match(self):
+        assert build_match('Сияние "OR" NEAR(') == (
+            '"Сияние" "OR" "NEAR"*'
+        ), (
+            'Проверьте, что операторы и кавычки FTS5 из запроса '
+            'не попадают в выражение MATCH.'
+        )
+        assert build_match(' ,.- ') is None
+
+    def test_02_title_q(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        Title.objects.filter(pk=titles[0]['id']).update(
+            description='Фильм о сиянии северного неба'
+        )
+        Title.objects.filter(pk=titles[1]['id']).update(
+            name='Северное сияние'
+        )
+        response = admin_client.get(self.TITLES_URL, {'q': 'СИЯН'})
+        assert response.status_code == 200
+        names = [title['name'] for title in response.json()['results']]
+        assert names == ['Северное сияние', titles[0]['name']], (
+            'Проверьте, что `?q=` находит произведения по началу слова '
+            'в названии и описании и ставит совпадения в названии выше.'
+        )
+        response = admin_client.get(self.TITLES_URL, {'q': 'северное сиян'})
+        assert response.json()['count'] == 1, (
+            'Проверьте, что `?q=` требует совпадения всех слов запроса.'
+        )
+        response = admin_client.get(self.TITLES_URL, {
+            'q': 'сияние', 'year': titles[1]['year']
+        })
+        assert response.json()['count'] == 1, (
+            'Проверьте, что `?q=` сочетается с другими фильтрами.'
+        )
+
+    def test_03_review_search(self, client, admin_client, admin,
+                              user_client, user):
+        reviews, _ = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        review = Review.objects.get(pk=reviews[0]['id'])
+        review.text = 'Отличная экранизация, экранизация года'
+        review.save()
+        Review.objects.filter(pk=reviews[1]['id']).update(
+            text='Неплохая экранизация'
+        )
+
+        response = client.get(self.SEARCH_URL, {'q': 'экранизация'})
+        assert response.status_code == 200
+        data = response.json()
+        assert data['count'] == 2
+        assert [item['id'] for item in data['results']] == [
+            reviews[0]['id'], reviews[1]['id']
+        ], 'Проверьте, что результаты поиска отсортированы по релевантности.'
+        assert data['results'][0]['title'] == review.title_id
+
+        review.delete()
+        response = client.get(self.SEARCH_URL, {'q': 'отличная'})
+        assert response.json()['count'] == 0, (
+            'Проверьте, что удалённый отзыв исчезает из индекса.'
+        )
+        response = client.get(self.SEARCH_URL)
+        assert response.status_code == 400, (
+            'Проверьте, что поиск без параметра `q` возвращает ошибку 400.'
+        )
+
+    def test_04_raw_inserts_and_admin(self, client, django_user_model):
+        call_command(
+            'generate_dataset', users=5, categories=2, genres=2, titles=5,
+            reviews=20, comments=0, clear=True, stdout=StringIO()
+        )
+        review = Review.objects.order_by('id').last()
+        assert list(review_fulltext.filter(
+            Review.objects.all(), f'Отзыв {review.id}'
+        ).values_list('id', flat=True)) == [review.id], (
+            'Проверьте, что записи в обход ORM попадают в индекс.'
+        )
+        client.force_login(django_user_model.objects.create_superuser(
+            username='root', email='root@yamdb.fake', password='1234567'
+        ))
+        response = client.get(
+            '/admin/reviews/review/', {'q': f'отзыв {review.id}'}
+        )
+        assert response.status_code == 200
+        assert response.context['cl'].result_count == 1, (
+            'Проверьте, что поиск отзывов в админке использует индекс.'
+        )
+
+    def test_05_survives_table_rebuild(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        with connection.schema_editor() as editor:
+            # SQLite пересоздаёт таблицу вместе с удалением триггеров.
+            editor._remake_table(Title)
+        call_command('migrate', verbosity=0)
+        Title.objects.filter(pk=titles[0]['id']).update(name='Переименовано')
+        response = admin_client.get(self.TITLES_URL, {'q': 'переименовано'})
+        assert response.json()['count'] == 1, (
+            'Проверьте, что триггеры индекса восстанавливаются '
+            'после миграций.'
+        )
@@ -0,0 +1,111 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.constants import TITLES_BULK_LIMIT
+from reviews.models import GenreTitle, Title
+from tests.query_budget import check_query_budget
+
+
+@pytest.fixture
+def genres(admin_client):
+    admin_client.post('/api/v1/categories/', data={
+        'name': 'Фильм', 'slug': 'films'
+    })
+    slugs = [f'genre-{idx}' for idx in range(10)]
+    for slug in slugs:
+        admin_client.post('/api/v1/genres/', data={
+            'name': slug, 'slug': slug
+        })
+    return slugs
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22TitleBulkWrite:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_create_and_update_budget(self, admin_client, genres):
+        # Категория, жанры, BEGIN, INSERT произведения и INSERT связей.
+        response, _ = check_query_budget(
+            admin_client, self.TITLES_URL, 5, method='post', data={
+                'name': 'Сияние', 'year': 1980,
+                'genre': genres, 'category': 'films'
+            }
+        )
+        assert response.json()['genre'] == genres
+        title_id = response.json()['id']
+
+        # Произведение, его жанры, новые жанры, BEGIN, UPDATE,
+        # удаление лишних связей (SELECT и DELETE), INSERT новых
+        # и жанры для ответа.
+        response, _ = check_query_budget(
+            admin_client, f'{self.TITLES_URL}{title_id}/', 9,
+            method='patch', data={'genre': genres[5:] + ['genre-0']}
+        )
+        assert response.json()['genre'] == sorted(genres[5:] + ['genre-0'])
+        assert set(GenreTitle.objects.filter(
+            title_id=title_id
+        ).values_list('genre__slug', flat=True)) == set(
+            genres[5:] + ['genre-0']
+        ), 'Проверьте, что PATCH заменяет жанры произведения.'
+
+        response = admin_client.get(f'{self.TITLES_URL}{title_id}/')
+        assert [genre['slug'] for genre in response.json()['genre']] == (
+            sorted(genres[5:] + ['genre-0'])
+        ), 'Проверьте, что изменение жанров сбрасывает кэш ответов.'
+
+    def test_02_unknown_slugs(self, admin_client, genres):
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Сияние', 'year': 1980,
+            'genre': [genres[0], 'missing', 'absent'], 'category': 'films'
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        message = response.json()['genre'][0]
+        assert 'missing' in message and 'absent' in message, (
+            'Проверьте, что ошибка перечисляет все неизвестные жанры.'
+        )
+        assert not Title.objects.exists()
+
+    def test_03_bulk_create(self, admin_client, genres):
+        admin_client.get(self.TITLES_URL)
+        payload = [
+            {'name': f'Произведение {idx}', 'year': 2000 + idx,
+             'genre': genres[idx:idx + 3], 'category': 'films'}
+            for idx in range(4)
+        ]
+        # Категория, жанры, BEGIN, четыре INSERT произведений
+        # и один INSERT связей.
+        response, _ = check_query_budget(
+            admin_client, self.TITLES_URL, 8, method='post', data=payload,
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert [title['genre'] for title in response.json()] == [
+            item['genre'] for item in payload
+        ]
+        assert GenreTitle.objects.count() == 12
+        response = admin_client.get(self.TITLES_URL)
+        assert response.json()['count'] == 4, (
+            'Проверьте, что массовое создание сбрасывает кэш списка.'
+        )
+
+    def test_04_bulk_create_is_atomic(self, admin_client, genres):
+        response = admin_client.post(self.TITLES_URL, data=[
+            {'name': 'Первое', 'year': 2000,
+             'genre': genres[:2], 'category': 'films'},
+            {'name': 'Второе', 'year': 2000,
+             'genre': ['missing'], 'category': 'films'},
+        ], format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'missing' in response.json()[1]['genre'][0]
+        assert not Title.objects.exists(), (
+            'Проверьте, что ошибка в одном элементе списка '
+            'отменяет создание всех произведений.'
+        )
+
+        response = admin_client.post(self.TITLES_URL, data=[
+            {'name': 'Произведение', 'year': 2000, 'category': 'films',
+             'genre': genres[:1]}
+        ] * (TITLES_BULK_LIMIT + 1), format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,97 @@
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Review, Title
+from tests.query_budget import check_query_budget
+
+
+@pytest.fixture(autouse=True)
+def bare_title(dataset):
+    """Первое произведение без категории, описания и жанров."""
+    title = Title.objects.order_by('id').first()
+    title.category = None
+    title.description = None
+    title.save()
+    title.genres.clear()
+
+
+@pytest.mark.dataset(
+    users=20, genres=8, titles=30, reviews=150, comments=150, seed=5
+)
+@pytest.mark.django_db(transaction=True)
+class Test23FastList:
+
+    def get_both(self, client, settings, url, query=None):
+        settings.FAST_LIST = {'ENABLED': False}
+        expected = client.get(url, query)
+        settings.FAST_LIST = {'ENABLED': True}
+        actual = client.get(url, query)
+        assert actual.status_code == expected.status_code == 200
+        return actual.content, expected.content
+
+    def test_01_byte_identical_output(self, client, settings):
+        review = Review.objects.filter(
+            comments__isnull=False
+        ).order_by('id').first()
+        title = Title.objects.order_by('id').first()
+        cases = [
+            ('/api/v1/titles/', None),
+            ('/api/v1/titles/', {'page': 2}),
+            ('/api/v1/titles/', {'pagination': 'cursor'}),
+            ('/api/v1/titles/', {'name': title.name}),
+            ('/api/v1/titles/', {'q': title.name.split()[0]}),
+            (f'/api/v1/titles/{review.title_id}/reviews/', None),
+            (f'/api/v1/titles/{review.title_id}/reviews/',
+             {'pagination': 'cursor'}),
+            (f'/api/v1/titles/{review.title_id}/reviews/'
+             f'{review.id}/comments/', None),
+        ]
+        for url, query in cases:
+            actual, expected = self.get_both(client, settings, url, query)
+            assert actual == expected, (
+                f'Проверьте, что быстрая сериализация `{url}` с параметрами '
+                f'{query} даёт тот же ответ, что и сериализаторы DRF.'
+            )
+
+    def test_02_title_index_page(self, client, settings):
+        pytest.importorskip('numpy')
+        settings.TITLE_INDEX = {'ENABLED': True}
+        actual, expected = self.get_both(
+            client, settings, '/api/v1/titles/', {'page': 3}
+        )
+        assert actual == expected
+
+    def test_03_query_budget(self, client):
+        review = Review.objects.order_by('id').first()
+        comment = Comment.objects.order_by('id').first()
+        # COUNT, страница произведений с категориями и их жанры.
+        check_query_budget(client, '/api/v1/titles/', 3)
+        # COUNT и страница отзывов с авторами.
+        check_query_budget(
+            client, f'/api/v1/titles/{review.title_id}/reviews/', 2
+        )
+        check_query_budget(
+            client,
+            f'/api/v1/titles/{comment.review.title_id}/reviews/'
+            f'{comment.review_id}/comments/',
+            2
+        )
+
+    def test_04_count_without_joins(self, client):
+        review = Review.objects.order_by('id').first()
+        for url in (
+            '/api/v1/titles/', f'/api/v1/titles/{review.title_id}/reviews/'
+        ):
+            with CaptureQueriesContext(connection) as context:
+                assert client.get(url).status_code == 200
+            counts = [
+                query['sql'] for query in context.captured_queries
+                if 'COUNT(' in query['sql']
+            ]
+            assert len(counts) == 1
+            assert 'JOIN' not in counts[0], (
+                f'Проверьте, что `{url}` считает строки исходного queryset, '
+                'без JOIN колонок связанных моделей.'
+            )
@@ -0,0 +1,97 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment
+
+
+@pytest.fixture
+def urls(dataset):
+    comment = Comment.objects.select_related('review').first()
+    return {
+        'titles': '/api/v1/titles/',
+        'title': f'/api/v1/titles/{comment.review.title_id}/',
+        'reviews': f'/api/v1/titles/{comment.review.title_id}/reviews/',
+        'review': (f'/api/v1/titles/{comment.review.title_id}/reviews/'
+                   f'{comment.review_id}/'),
+        'comments': (f'/api/v1/titles/{comment.review.title_id}/reviews/'
+                     f'{comment.review_id}/comments/'),
+    }
+
+
+def get_with_queries(client, url, query):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, query)
+    return response, ' '.join(
+        query['sql'] for query in context.captured_queries
+    )
+
+
+@pytest.mark.dataset(comments=40, seed=7)
+@pytest.mark.django_db(transaction=True)
+class Test24SparseFields:
+
+    def test_01_title_cards(self, client, urls, settings):
+        for fast in (True, False):
+            settings.FAST_LIST = {'ENABLED': fast}
+            response, sql = get_with_queries(
+                client, urls['titles'], {'fields': 'id,name,year'}
+            )
+            assert response.status_code == HTTPStatus.OK
+            for title in response.json()['results']:
+                assert list(title) == ['id', 'name', 'year'], (
+                    'Проверьте, что `?fields=` оставляет в ответе '
+                    'только запрошенные поля в исходном порядке.'
+                )
+            for column in ('description', 'rating', 'reviews_genre',
+                           'reviews_category'):
+                assert column not in sql, (
+                    f'Проверьте, что без запрошенного поля `{column}` '
+                    'не попадает в SQL-запросы.'
+                )
+
+    def test_02_same_output_on_both_paths(self, client, urls, settings):
+        cases = [
+            ('titles', 'name,genre'),
+            ('titles', 'category,rating'),
+            ('title', 'genre,description'),
+            ('reviews', 'author,score'),
+            ('review', 'score'),
+            ('comments', 'pub_date,author'),
+        ]
+        for name, fields in cases:
+            responses = []
+            for fast in (True, False):
+                settings.FAST_LIST = {'ENABLED': fast}
+                responses.append(client.get(urls[name], {
+                    'fields': fields
+                }).content)
+            assert responses[0] == responses[1], (
+                f'Проверьте, что `?fields={fields}` для `{urls[name]}` '
+                'даёт одинаковый ответ при любой сериализации.'
+            )
+
+    def test_03_review_text_deferred(self, client, urls):
+        for name in ('reviews', 'comments'):
+            response, sql = get_with_queries(
+                client, urls[name], {'fields': 'id,author'}
+            )
+            assert set(response.json()['results'][0]) == {'id', 'author'}
+            assert '"text"' not in sql, (
+                'Проверьте, что текст не загружается, '
+                'если поле `text` не запрошено.'
+            )
+        response = client.get(urls['reviews'], {
+            'fields': 'score', 'pagination': 'cursor'
+        })
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['next'], (
+            'Проверьте, что курсорная пагинация работает с `?fields=`.'
+        )
+
+    def test_04_unknown_fields(self, client, urls):
+        response = client.get(urls['titles'], {'fields': 'name,secret'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'secret' in response.json()['fields']
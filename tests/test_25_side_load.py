@@ -0,0 +1,89 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def expand(title, included):
+    """Подставляет объекты из included вместо слагов."""
+    category = title['category']
+    return {
+        **title,
+        'category': category and included['categories'][category],
+        'genre': [included['genres'][slug] for slug in title['genre']],
+    }
+
+
+@pytest.mark.dataset(
+    users=5, genres=6, titles=30, reviews=30, seed=11
+)
+@pytest.mark.django_db(transaction=True)
+class Test25SideLoad:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_compact_matches_embedded(self, client, dataset, settings):
+        for fast in (True, False):
+            settings.FAST_LIST = {'ENABLED': fast}
+            for page in (1, 2):
+                embedded = client.get(self.TITLES_URL, {'page': page})
+                compact = client.get(self.TITLES_URL, {
+                    'page': page, 'include': 'category,genre'
+                })
+                assert compact.status_code == HTTPStatus.OK
+                data = compact.json()
+                assert [
+                    expand(title, data['included'])
+                    for title in data['results']
+                ] == embedded.json()['results'], (
+                    'Проверьте, что `?include=` выводит слаги связей, '
+                    'а объекты из `included` совпадают со встроенными.'
+                )
+                used = {
+                    slug for title in data['results']
+                    for slug in title['genre']
+                }
+                assert set(data['included']['genres']) == used, (
+                    'Проверьте, что `included` содержит только жанры '
+                    'произведений страницы, без повторов.'
+                )
+
+    def test_02_dictionaries_cached(self, client, dataset, admin_client,
+                                    settings):
+        settings.API_RESPONSE_CACHE = {
+            **settings.API_RESPONSE_CACHE, 'ENABLED': True
+        }
+        client.get(self.TITLES_URL, {'include': 'category,genre'})
+        with CaptureQueriesContext(connection) as context:
+            client.get(self.TITLES_URL, {
+                'include': 'category,genre', 'page': 2
+            })
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        assert 'FROM "reviews_genre"' not in sql, (
+            'Проверьте, что справочник жанров кэшируется между запросами.'
+        )
+        assert 'reviews_category' not in sql
+
+        admin_client.post('/api/v1/genres/', data={
+            'name': 'Новый жанр', 'slug': 'new-genre'
+        })
+        title = client.get(self.TITLES_URL).json()['results'][0]
+        admin_client.patch(f'{self.TITLES_URL}{title["id"]}/', data={
+            'genre': ['new-genre']
+        })
+        data = client.get(self.TITLES_URL, {'include': 'genre'}).json()
+        assert data['included']['genres']['new-genre'] == {
+            'name': 'Новый жанр', 'slug': 'new-genre'
+        }, 'Проверьте, что справочник обновляется при изменении жанров.'
+
+    def test_03_with_fields_and_errors(self, client, dataset):
+        data = client.get(self.TITLES_URL, {
+            'include': 'genre', 'fields': 'name,genre'
+        }).json()
+        assert list(data['included']) == ['genres']
+        assert all(
+            list(title) == ['name', 'genre'] for title in data['results']
+        )
+        response = client.get(self.TITLES_URL, {'include': 'reviews'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,145 @@
+from collections import Counter
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import SCORE_COUNT_FIELDS, SCORE_RANGE, Review, Title, User
+
+
+def stored_histograms():
+    return {
+        title['id']: [title[field] for field in SCORE_COUNT_FIELDS]
+        for title in Title.objects.values('id', *SCORE_COUNT_FIELDS)
+    }
+
+
+def expected_histograms():
+    counts = Counter(Review.objects.values_list('title_id', 'score'))
+    return {
+        title_id: [counts[title_id, score] for score in SCORE_RANGE]
+        for title_id in Title.objects.values_list('id', flat=True)
+    }
+
+
+@pytest.mark.dataset(
+    users=6, categories=2, genres=3, titles=8, reviews=30, seed=21
+)
+@pytest.mark.django_db(transaction=True)
+class Test26RatingHistogram:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_incremental_counters(self, dataset):
+        assert stored_histograms() == expected_histograms(), (
+            'Проверьте, что generate_dataset заполняет гистограммы оценок.'
+        )
+        first, second = Title.objects.order_by('id')[:2]
+        author = User.objects.exclude(reviews__title=first).first()
+        review = Review.objects.create(
+            title=first, author=author, text='Отзыв', score=3
+        )
+        assert stored_histograms() == expected_histograms(), (
+            'Проверьте, что создание отзыва увеличивает счётчик его оценки.'
+        )
+        review.score = 9
+        review.save()
+        assert stored_histograms() == expected_histograms(), (
+            'Проверьте, что изменение оценки переносит её '
+            'между счётчиками гистограммы.'
+        )
+        Review.objects.filter(title=second, author=author).delete()
+        review.title = second
+        review.score = 1
+        review.save()
+        assert stored_histograms() == expected_histograms(), (
+            'Проверьте перенос отзыва на другое произведение.'
+        )
+        review.delete()
+        assert stored_histograms() == expected_histograms(), (
+            'Проверьте, что удаление отзыва уменьшает счётчик его оценки.'
+        )
+
+    def test_02_ratings_endpoint(self, dataset, client, user_client):
+        title = Title.objects.filter(score_count__gt=0).first()
+        url = f'{self.TITLES_URL}{title.id}/ratings/'
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что `{url}` доступен без авторизации.'
+        )
+        data = response.json()
+        assert data['id'] == title.id
+        assert data['rating'] == title.rating
+        assert data['count'] == title.score_count
+        assert data['scores'] == [
+            {'score': score, 'count': count} for score, count in zip(
+                SCORE_RANGE, expected_histograms()[title.id]
+            )
+        ], 'Проверьте, что `scores` содержит счётчик каждой оценки.'
+        assert sum(item['count'] for item in data['scores']) == data['count']
+
+        with CaptureQueriesContext(connection) as context:
+            client.get(url)
+        assert not any(
+            'FROM "reviews_review"' in query['sql']
+            for query in context.captured_queries
+        ), 'Проверьте, что гистограмма не считается по таблице отзывов.'
+
+        user_client.post(f'{self.TITLES_URL}{title.id}/reviews/', data={
+            'text': 'Отзыв', 'score': 10
+        })
+        data = client.get(url).json()
+        assert data['count'] == title.score_count + 1, (
+            'Проверьте, что новый отзыв сбрасывает кэш гистограммы.'
+        )
+        assert data['scores'][-1]['count'] == (
+            expected_histograms()[title.id][-1]
+        )
+        assert client.get(
+            f'{self.TITLES_URL}0/ratings/'
+        ).status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_embedded_in_detail(self, dataset, client):
+        title = Title.objects.filter(score_count__gt=0).first()
+        url = f'{self.TITLES_URL}{title.id}/'
+        ratings = client.get(f'{url}ratings/').json()
+        assert 'ratings' not in client.get(url).json()
+        for params in ({}, {'fields': 'name'}):
+            data = client.get(url, {**params, 'include': 'ratings'}).json()
+            assert data['ratings'] == {
+                'count': ratings['count'], 'scores': ratings['scores']
+            }, 'Проверьте, что `?include=ratings` встраивает гистограмму.'
+        assert set(data) == {'name', 'ratings'}
+        response = client.get(url, {'include': 'reviews'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_rebuild_command(self, dataset):
+        expected = expected_histograms()
+        Title.objects.update(
+            score_1_count=7, score_10_count=0, score_count=0, rating=None
+        )
+        with CaptureQueriesContext(connection) as context:
+            call_command('rebuild_ratings', stdout=StringIO())
+        assert stored_histograms() == expected, (
+            'Проверьте, что `rebuild_ratings` восстанавливает гистограммы.'
+        )
+        assert len([
+            query for query in context.captured_queries
+            if 'FROM "reviews_review"' in query['sql']
+        ]) == 1, (
+            'Проверьте, что гистограммы пересчитываются '
+            'за один проход по таблице отзывов.'
+        )
+        for title in Title.objects.all():
+            counts = [getattr(title, field) for field in SCORE_COUNT_FIELDS]
+            assert title.score_count == sum(counts)
+            assert title.score_sum == sum(
+                score * count for score, count in zip(SCORE_RANGE, counts)
+            )
+            assert title.rating == (
+                title.score_sum // title.score_count
+                if title.score_count else None
+            )
@@ -0,0 +1,182 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.cache import bump_model_version
+from reviews.aggregates import get_rating_prior, weighted_rating
+from reviews.models import Category, Review, Title, User
+from tests.test_09_cursor_pagination import collect_pages
+
+TITLES_URL = '/api/v1/titles/'
+
+
+@pytest.fixture
+def rated_titles():
+    """
+    Одна оценка 10, двадцать оценок 9, двадцать оценок 2
+    и произведение без оценок.
+    """
+    category = Category.objects.create(name='Фильм', slug='films')
+    titles = {
+        key: Title.objects.create(name=name, year=year, category=category)
+        for key, name, year in (
+            ('single', 'Единственная десятка', 2001),
+            ('popular', 'Популярное', 1999),
+            ('unrated', 'Без оценок', 2010),
+            ('poor', 'Слабое', 1985),
+        )
+    }
+    User.objects.bulk_create(
+        User(username=f'critic{idx}', email=f'critic{idx}@yamdb.fake')
+        for idx in range(20)
+    )
+    critics = list(User.objects.filter(username__startswith='critic'))
+    Review.objects.create(
+        title=titles['single'], author=critics[0], text='Отзыв', score=10
+    )
+    for critic in critics:
+        Review.objects.create(
+            title=titles['popular'], author=critic, text='Отзыв', score=9
+        )
+        Review.objects.create(
+            title=titles['poor'], author=critic, text='Отзыв', score=2
+        )
+    call_command('recompute_rating_prior', stdout=StringIO())
+    return titles
+
+
+def names(response):
+    assert response.status_code == HTTPStatus.OK
+    return [title['name'] for title in response.json()['results']]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27TitleOrdering:
+
+    def test_01_weighted_rating(self, client, rated_titles):
+        response = client.get(TITLES_URL, {'ordering': '-rating'})
+        assert names(response) == [
+            'Популярное', 'Единственная десятка', 'Без оценок', 'Слабое'
+        ], (
+            'Проверьте, что `?ordering=-rating` сортирует по взвешенному '
+            'рейтингу: одна оценка 10 не обгоняет двадцать оценок 9.'
+        )
+        response = client.get(TITLES_URL, {'ordering': 'rating'})
+        assert names(response) == [
+            'Слабое', 'Без оценок', 'Единственная десятка', 'Популярное'
+        ]
+
+    def test_02_other_orderings(self, client, rated_titles):
+        titles = list(Title.objects.all())
+        for param, key in (
+            ('year', lambda title: (title.year, title.id)),
+            ('name', lambda title: (title.name, title.id)),
+            ('review_count', lambda title: (title.score_count, title.id)),
+        ):
+            expected = [title.name for title in sorted(titles, key=key)]
+            assert names(client.get(TITLES_URL, {'ordering': param})) == (
+                expected
+            ), f'Проверьте сортировку `?ordering={param}`.'
+            assert names(client.get(TITLES_URL, {
+                'ordering': f'-{param}'
+            })) == expected[::-1], f'Проверьте сортировку `-{param}`.'
+        response = client.get(TITLES_URL, {'ordering': 'score_sum'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что неизвестное поле сортировки возвращает 400.'
+        )
+
+    def test_03_cursor_and_fields(self, client, rated_titles):
+        # Одинаковый рейтинг у нескольких произведений на границах страниц.
+        Title.objects.bulk_create(
+            Title(name=f'Ничья {idx}', year=2000, weighted_rating=5.0)
+            for idx in range(9)
+        )
+        bump_model_version(Title)
+        expected = [
+            title.name for title in Title.objects.order_by(
+                '-weighted_rating', '-id'
+            )
+        ]
+        results = []
+        url = f'{TITLES_URL}?ordering=-rating&pagination=cursor&fields=name'
+        while url:
+            data = client.get(url).json()
+            results.extend(title['name'] for title in data['results'])
+            url = data['next']
+        assert results == expected, (
+            'Проверьте, что курсорная пагинация следует `?ordering=`.'
+        )
+
+    def test_04_incremental_update(self, client, rated_titles, user_client):
+        title = rated_titles['unrated']
+        prior = get_rating_prior()
+        title.refresh_from_db()
+        assert title.weighted_rating == pytest.approx(prior[0])
+        user_client.post(f'{TITLES_URL}{title.id}/reviews/', data={
+            'text': 'Отзыв', 'score': 10
+        })
+        title.refresh_from_db()
+        assert title.weighted_rating == pytest.approx(
+            weighted_rating(10, 1, prior)
+        ), 'Проверьте, что отзыв сразу обновляет взвешенный рейтинг.'
+        assert names(client.get(TITLES_URL, {'ordering': '-rating'}))[1] == (
+            'Без оценок'
+        ), 'Проверьте, что новый отзыв сбрасывает кэш сортировки.'
+
+        stale = Title.objects.get(pk=rated_titles['poor'].pk)
+        Review.objects.filter(title=stale).delete()
+        stale.name = 'Слабое, переименованное'
+        stale.save()
+        stale.refresh_from_db()
+        assert stale.score_count == 0 and stale.weighted_rating == (
+            pytest.approx(prior[0])
+        ), 'Проверьте, что сохранение произведения не затирает оценки.'
+
+    def test_05_new_title_and_prior(self, admin_client, rated_titles):
+        response = admin_client.post(TITLES_URL, data={
+            'name': 'Новинка', 'year': 2020, 'genre': [], 'category': 'films'
+        })
+        title = Title.objects.get(pk=response.json()['id'])
+        assert title.weighted_rating == pytest.approx(get_rating_prior()[0]), (
+            'Проверьте, что новое произведение получает среднюю оценку.'
+        )
+
+        call_command('recompute_rating_prior', weight=1, stdout=StringIO())
+        mean, weight = get_rating_prior()
+        assert weight == 1
+        assert mean == pytest.approx((10 + 9 * 20 + 2 * 20) / 41)
+        single = Title.objects.get(pk=rated_titles['single'].pk)
+        assert single.weighted_rating == pytest.approx((10 + mean) / 2), (
+            'Проверьте, что `recompute_rating_prior` пересчитывает '
+            'взвешенный рейтинг всех произведений.'
+        )
+
+    def test_06_cursor_over_unrated_tail(self, client, rated_titles):
+        # У произведений без оценок одинаковые weighted_rating
+        # (средняя оценка) и score_count = 0.
+        for idx in range(25):
+            Title.objects.create(name=f'Новинка {idx}', year=2020)
+        for ordering, columns in (
+            ('-rating', ('-weighted_rating', '-id')),
+            ('rating', ('weighted_rating', 'id')),
+            ('review_count', ('score_count', 'id')),
+            ('-review_count', ('-score_count', '-id')),
+        ):
+            with CaptureQueriesContext(connection) as context:
+                results, _ = collect_pages(
+                    client,
+                    f'{TITLES_URL}?ordering={ordering}&pagination=cursor'
+                )
+            assert [title['id'] for title in results] == list(
+                Title.objects.order_by(*columns).values_list('id', flat=True)
+            ), f'Проверьте курсорную пагинацию `?ordering={ordering}`.'
+            assert not any(
+                'OFFSET' in query['sql'] for query in context.captured_queries
+            ), (
+                f'Проверьте, что курсор `?ordering={ordering}` учитывает id '
+                'и страницы выбираются без OFFSET.'
+            )
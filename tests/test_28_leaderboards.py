@@ -0,0 +1,220 @@
+import random
+import time
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from reviews.leaderboards import get_group_titles, leaderboard_queue
+from reviews.models import (
+    Category,
+    Genre,
+    GenreTitle,
+    LeaderboardEntry,
+    LeaderboardKind,
+    Review,
+    Title,
+    User
+)
+
+URL = '/api/v1/leaderboards/'
+
+
+@pytest.fixture(autouse=True)
+def small_leaderboards(settings):
+    """Маленькие таблицы, которые чаще перестраиваются в тестах."""
+    settings.LEADERBOARDS = {
+        **settings.LEADERBOARDS, 'SIZE': 4, 'SLACK': 3
+    }
+
+
+def all_groups():
+    return [
+        (LeaderboardKind.CATEGORY, pk)
+        for pk in Category.objects.values_list('pk', flat=True)
+    ] + [
+        (LeaderboardKind.GENRE, pk)
+        for pk in Genre.objects.values_list('pk', flat=True)
+    ]
+
+
+def check_boards(size):
+    for kind, group_id in all_groups():
+        expected = list(get_group_titles(kind, group_id).values_list(
+            'id', flat=True
+        ))
+        stored = list(LeaderboardEntry.objects.filter(
+            kind=kind, group_id=group_id
+        ).order_by('-weighted_rating', '-title_id').values_list(
+            'title_id', flat=True
+        ))
+        assert stored == expected[:len(stored)], (
+            'Проверьте, что таблица лидеров хранит первые произведения '
+            f'группы {kind} {group_id} в порядке взвешенного рейтинга.'
+        )
+        assert len(stored) >= min(size, len(expected)), (
+            f'Проверьте, что таблица {kind} {group_id} дополняется '
+            'до SIZE произведений.'
+        )
+
+
+@pytest.mark.dataset(
+    users=40, genres=4, titles=60, reviews=400, seed=23
+)
+@pytest.mark.django_db(transaction=True)
+class Test28Leaderboards:
+
+    def test_01_incremental_updates(self, dataset):
+        check_boards(4)
+        rng = random.Random(5)
+        users = list(User.objects.all())
+        categories = list(Category.objects.all())
+        genres = list(Genre.objects.all())
+        title_ids = list(Title.objects.values_list('id', flat=True))
+        for step in range(120):
+            action = rng.random()
+            if action < 0.4:
+                title_id = rng.choice(title_ids)
+                author = rng.choice(users)
+                if not Review.objects.filter(
+                    title_id=title_id, author=author
+                ).exists():
+                    Review.objects.create(
+                        title_id=title_id, author=author, text='Отзыв',
+                        score=rng.randint(1, 10)
+                    )
+            elif action < 0.7:
+                review = rng.choice(list(Review.objects.all()))
+                review.score = rng.randint(1, 10)
+                review.save()
+            elif action < 0.85:
+                rng.choice(list(Review.objects.all())).delete()
+            elif action < 0.95:
+                title = Title.objects.get(pk=rng.choice(title_ids))
+                title.category = rng.choice(categories)
+                title.save()
+                GenreTitle.objects.filter(title=title).delete()
+                GenreTitle.objects.create(
+                    title=title, genre=rng.choice(genres)
+                )
+            else:
+                title_id = rng.choice(title_ids)
+                title_ids.remove(title_id)
+                Title.objects.filter(pk=title_id).delete()
+            if step % 7 == 0:
+                leaderboard_queue.process()
+                check_boards(4)
+        leaderboard_queue.process()
+        check_boards(4)
+
+    def test_02_endpoint(self, client, dataset):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(URL)
+        assert response.status_code == HTTPStatus.OK
+        assert not any(
+            'reviews_review' in query['sql']
+            for query in context.captured_queries
+        ), 'Проверьте, что таблицы лидеров не агрегируют отзывы.'
+        data = response.json()
+        assert set(data) == {'categories', 'genres'}
+        for key, kind, model in (
+            ('categories', LeaderboardKind.CATEGORY, Category),
+            ('genres', LeaderboardKind.GENRE, Genre),
+        ):
+            assert data[key], f'Проверьте, что `{key}` не пуст.'
+            for board in data[key]:
+                group = model.objects.get(slug=board['slug'])
+                assert board['name'] == group.name
+                expected = list(get_group_titles(kind, group.pk).values(
+                    'id', 'name', 'year', 'rating'
+                )[:4])
+                assert board['titles'] == expected, (
+                    'Проверьте, что таблица содержит SIZE лучших '
+                    'произведений группы по взвешенному рейтингу.'
+                )
+
+        category = Category.objects.first()
+        data = client.get(URL, {'category': category.slug}).json()
+        assert [board['slug'] for board in data['categories']] == [
+            category.slug
+        ]
+        assert data['genres'] == [], (
+            'Проверьте, что `?category=` оставляет только таблицу категории.'
+        )
+
+    def test_03_review_updates_endpoint(self, client, dataset):
+        category = Category.objects.first()
+        board = client.get(URL, {'category': category.slug}).json()
+        last = board['categories'][0]['titles'][-1]
+        title = Title.objects.filter(category=category).exclude(
+            pk__in=[item['id'] for item in board['categories'][0]['titles']]
+        ).first()
+        for _ in range(15):
+            user = User.objects.create(
+                username=f'fan{_}', email=f'fan{_}@yamdb.fake'
+            )
+            Review.objects.create(
+                title=title, author=user, text='Отзыв', score=10
+            )
+        assert LeaderboardEntry.objects.filter(title=title).count() == 0, (
+            'Проверьте, что запись отзыва не обновляет таблицы лидеров '
+            'синхронно.'
+        )
+        with CaptureQueriesContext(connection) as context:
+            stale = client.get(URL, {'category': category.slug}).json()
+        assert stale == board, (
+            'Проверьте, что эндпоинт отдаёт сохранённые строки таблиц, '
+            'не применяя очередь изменений.'
+        )
+        assert not any(
+            'INSERT' in query['sql'] or 'DELETE' in query['sql']
+            for query in context.captured_queries
+        ), 'Проверьте, что чтение таблиц лидеров не пишет в базу данных.'
+        assert leaderboard_queue.pending == {title.id}
+
+        leaderboard_queue.process()
+        titles = client.get(URL, {'category': category.slug}).json()[
+            'categories'
+        ][0]['titles']
+        assert titles[0]['id'] == title.id, (
+            'Проверьте, что разбор очереди учитывает изменения рейтинга '
+            'в таблицах лидеров.'
+        )
+        assert last['id'] not in [item['id'] for item in titles]
+
+    def test_04_background_worker(self, settings, dataset):
+        title = Title.objects.create(
+            name='Новинка', year=2000, category=Category.objects.first()
+        )
+        with transaction.atomic():
+            for idx in range(10):
+                user = User.objects.create(
+                    username=f'fan{idx}', email=f'fan{idx}@yamdb.fake'
+                )
+                Review.objects.create(
+                    title=title, author=user, text='Отзыв', score=10
+                )
+        # Общая база данных в памяти блокирует таблицы целиком,
+        # поэтому поток запускается после записи, а до конца разбора
+        # очереди база не читается.
+        settings.LEADERBOARDS = {
+            **settings.LEADERBOARDS, 'WORKER': True, 'BATCH_WAIT': 0.01
+        }
+        leaderboard_queue.add(set())
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and (
+            leaderboard_queue.pending
+            or leaderboard_queue.apply_lock.locked()
+        ):
+            time.sleep(0.05)
+        assert LeaderboardEntry.objects.filter(title=title).exists(), (
+            'Проверьте, что фоновый поток применяет изменения очереди.'
+        )
+
+    def test_05_rebuild_command(self, dataset):
+        LeaderboardEntry.objects.all().delete()
+        call_command('rebuild_leaderboards', stdout=StringIO())
+        check_boards(4)
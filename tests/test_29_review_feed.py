@@ -0,0 +1,78 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Category, Review
+from tests.query_budget import check_query_budget
+from tests.test_09_cursor_pagination import collect_pages
+
+URL = '/api/v1/reviews/'
+
+
+def expected_ids(**filters):
+    return list(Review.objects.filter(**filters).order_by(
+        '-pub_date', '-id'
+    ).values_list('id', flat=True))
+
+
+@pytest.mark.dataset(
+    users=20, genres=30, titles=30, reviews=120, seed=24
+)
+@pytest.mark.django_db(transaction=True)
+class Test29ReviewFeed:
+
+    def test_01_feed_order(self, client, dataset):
+        results, pages = collect_pages(client, URL)
+        assert [review['id'] for review in results] == expected_ids(), (
+            'Проверьте, что `/api/v1/reviews/` возвращает отзывы всех '
+            'произведений от новых к старым без пропусков и повторов.'
+        )
+        assert pages == 24
+        review = Review.objects.select_related('author', 'title').get(
+            pk=results[0]['id']
+        )
+        assert results[0]['title'] == review.title_id
+        assert results[0]['title_name'] == review.title.name
+        assert results[0]['author'] == review.author.username
+
+    def test_02_filters(self, client, dataset):
+        review = Review.objects.select_related('author').first()
+        category = Category.objects.first()
+        for params, filters in (
+            ({'author': review.author.username}, {'author': review.author}),
+            ({'category': category.slug.upper()},
+             {'title__category': category}),
+            ({'score': 7}, {'score': 7}),
+            ({'score': 7, 'category': category.slug},
+             {'score': 7, 'title__category': category}),
+        ):
+            query = '&'.join(f'{key}={value}' for key, value in params.items())
+            results, _ = collect_pages(client, f'{URL}?{query}')
+            assert [item['id'] for item in results] == expected_ids(
+                **filters
+            ), f'Проверьте фильтр ленты отзывов `{query}`.'
+
+    def test_03_fast_list_matches_serializer(self, client, settings,
+                                             dataset):
+        fast = client.get(URL).json()
+        settings.FAST_LIST = {'ENABLED': False}
+        assert client.get(URL).json() == fast, (
+            'Проверьте, что быстрая сериализация ленты совпадает '
+            'с ReviewFeedSerializer.'
+        )
+
+    def test_04_query_budget(self, client, dataset):
+        response, _ = check_query_budget(client, URL, 1)
+        check_query_budget(client, response.json()['next'], 1)
+        check_query_budget(client, f'{URL}?category=category-1&score=5', 1)
+
+    def test_05_read_only(self, client, dataset, user_client):
+        response = user_client.post(URL, data={'text': 'Отзыв', 'score': 5})
+        assert response.status_code == HTTPStatus.METHOD_NOT_ALLOWED, (
+            'Проверьте, что лента отзывов доступна только для чтения.'
+        )
+        response = client.get(f'{URL}search/?q=отзыв')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что поиск `/api/v1/reviews/search/` '
+            'не перехватывается лентой отзывов.'
+        )
@@ -0,0 +1,113 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Comment, Review, Title
+from tests.query_budget import check_query_budget
+from tests.test_09_cursor_pagination import collect_pages
+
+
+@pytest.fixture
+def history(dataset, user):
+    titles = list(Title.objects.order_by('id')[:12])
+    for idx, title in enumerate(titles):
+        Review.objects.create(
+            title=title, author=user, text=f'Отзыв {idx}', score=idx % 10 + 1
+        )
+    for idx, review in enumerate(Review.objects.exclude(author=user)[:8]):
+        Comment.objects.create(
+            review=review, author=user, text=f'Комментарий {idx}'
+        )
+
+
+def expected_ids(model, author):
+    return list(model.objects.filter(author=author).order_by(
+        '-pub_date', '-id'
+    ).values_list('id', flat=True))
+
+
+@pytest.mark.dataset(
+    users=20, categories=5, genres=30, titles=30, reviews=150,
+    comments=150, seed=25
+)
+@pytest.mark.django_db(transaction=True)
+class Test30UserHistory:
+
+    def test_01_my_reviews(self, history, user, user_client):
+        results, pages = collect_pages(
+            user_client, '/api/v1/users/me/reviews/'
+        )
+        assert [item['id'] for item in results] == expected_ids(
+            Review, user
+        ), (
+            'Проверьте, что `/api/v1/users/me/reviews/` возвращает все '
+            'отзывы пользователя от новых к старым.'
+        )
+        assert pages == 3
+        review = Review.objects.select_related('title').get(
+            pk=results[0]['id']
+        )
+        assert results[0]['title'] == review.title_id
+        assert results[0]['title_name'] == review.title.name, (
+            'Проверьте, что отзыв в истории содержит название произведения.'
+        )
+        assert {item['author'] for item in results} == {user.username}
+
+    def test_02_my_comments(self, history, user, user_client):
+        results, _ = collect_pages(user_client, '/api/v1/users/me/comments/')
+        assert [item['id'] for item in results] == expected_ids(
+            Comment, user
+        ), (
+            'Проверьте, что `/api/v1/users/me/comments/` возвращает все '
+            'комментарии пользователя от новых к старым.'
+        )
+        comment = Comment.objects.select_related('review__title').get(
+            pk=results[0]['id']
+        )
+        assert results[0]['review'] == comment.review_id
+        assert results[0]['title'] == comment.review.title_id
+        assert results[0]['title_name'] == comment.review.title.name
+
+    def test_03_permissions(self, client, history, user, user_client, admin,
+                            admin_client):
+        for url in ('/api/v1/users/me/reviews/',
+                    '/api/v1/users/me/comments/'):
+            assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED, (
+                f'Проверьте, что `{url}` недоступен анонимному пользователю.'
+            )
+        url = f'/api/v1/users/{user.username}/reviews/'
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что отзывы другого пользователя доступны '
+            'только администратору.'
+        )
+        results, _ = collect_pages(admin_client, url)
+        assert [item['id'] for item in results] == expected_ids(
+            Review, user
+        )
+        response = admin_client.get('/api/v1/users/nobody/reviews/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_fast_list_matches_serializer(self, settings, history,
+                                             user_client):
+        for url in ('/api/v1/users/me/reviews/',
+                    '/api/v1/users/me/comments/'):
+            fast = user_client.get(url).json()
+            settings.FAST_LIST = {'ENABLED': False}
+            assert user_client.get(url).json() == fast, (
+                f'Проверьте, что быстрая сериализация `{url}` совпадает '
+                'с сериализатором DRF.'
+            )
+            settings.FAST_LIST = {'ENABLED': True}
+
+    def test_05_query_budget(self, history, user, user_client, admin,
+                             admin_client):
+        user_client.get('/api/v1/users/me/')
+        admin_client.get('/api/v1/users/me/')
+        response, _ = check_query_budget(
+            user_client, '/api/v1/users/me/reviews/', 1
+        )
+        check_query_budget(user_client, response.json()['next'], 1)
+        check_query_budget(user_client, '/api/v1/users/me/comments/', 1)
+        check_query_budget(
+            admin_client, f'/api/v1/users/{user.username}/reviews/', 2
+        )